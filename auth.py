@@ -1,67 +1,29 @@
 """
 Authentifizierungs-Modul für Budget-Tracker
-Enthält alle Funktionen für Passwort-Hashing, Login und Passwortänderung
+Enthält die Funktionen für Login und Passwortänderung
+(Hashing und bcrypt-Kosten siehe credentials.py)
 """
 
-import base64
 import os
-import sys
-
-try:
-    import bcrypt
-except ImportError:
-    print("\n\033[31mFehler: Das Paket 'bcrypt' ist erforderlich, "
-          "aber nicht installiert.\033[0m")
-    print("\n\033[32mInstalliere es mit: pip install bcrypt\033[0m")
-    sys.exit(1)
-
-
-def hash_passwort(passwort):
-    """
-    Hasht ein Passwort mit bcrypt für sichere Speicherung.
-
-    Args:
-        passwort (str): Das zu hashende Passwort
-
-    Returns:
-        str: Der gehashte Passwort-String
-        (base64-kodiert für JSON-Kompatibilität)
-    """
-    salt = bcrypt.gensalt(rounds=12)
-    hashed = bcrypt.hashpw(passwort.encode('utf-8'), salt)
-    return base64.b64encode(hashed).decode('utf-8')
-
-
-def verifiziere_passwort(passwort, hashed_passwort):
-    """
-    Vergleicht ein eingegebenes Passwort mit einem gehashten Passwort.
-
-    Args:
-        passwort (str): Das zu verifizierende Passwort
-        hashed_passwort (str): Der gehashte Passwort-String (base64-kodiert)
-
-    Returns:
-        bool: True wenn Passwort korrekt ist, False sonst
-    """
-    try:
-        hashed_bytes = base64.b64decode(hashed_passwort.encode('utf-8'))
-        return bcrypt.checkpw(passwort.encode('utf-8'), hashed_bytes)
-    except Exception:
-        return False
+from journal import protokollierte_änderung, metadaten_markieren
+from credentials import (passwort_felder, verifiziere_passwort,
+                         standard_passwort_hash, neu_hashen_nötig)
 
 
 def passwort_login(benutzer_passwort, daten_speichern_func):
     """
     Führt den Login-Prozess durch.
     Nach 3 fehlgeschlagenen Versuchen wird das Programm beendet.
+    Wurde der Hash mit anderen als den konfigurierten bcrypt-Kosten
+    erstellt, wird er nach erfolgreichem Login neu erstellt.
 
     Args:
         benutzer_passwort (dict): Dictionary mit gehashtem
         Passwort daten_speichern_func (callable):
         Funktion zum Speichern der Daten
     """
-    hashed_passwort = benutzer_passwort.get("passwort",
-                                            hash_passwort("Test1234!"))
+    hashed_passwort = (benutzer_passwort.get("passwort")
+                       or standard_passwort_hash())
     anmeldeversuche = 0
     passwort_input = input("\n\033[34mBitte gebe dein Passwort ein:\033[0m")
 
@@ -75,9 +37,44 @@ def passwort_login(benutzer_passwort, daten_speichern_func):
                 "\n\033[31mFehlerhaftes Passwort! "
                 "Versuche es bitte nochmals:\033[0m")
 
+    if _hash_aktualisieren(benutzer_passwort, passwort_input, hashed_passwort):
+        daten_speichern_func()
+
     print("\n\033[32mErfolgreich eingeloggt!\033[0m\n")
 
 
+def passwort_prüfen(benutzer_passwort, passwort):
+    """
+    Prüft ein Passwort ohne Eingabeaufforderung (z.B. im Batch-Modus).
+    Ein Hash mit veralteten bcrypt-Kosten wird wie beim Login neu
+    erstellt; gespeichert wird durch den Aufrufer.
+
+    Args:
+        benutzer_passwort (dict): Dictionary mit gehashtem Passwort
+        passwort (str): Das zu prüfende Passwort
+
+    Returns:
+        bool: True wenn das Passwort korrekt ist
+    """
+    hashed_passwort = (benutzer_passwort.get("passwort")
+                       or standard_passwort_hash())
+    if not verifiziere_passwort(passwort, hashed_passwort):
+        return False
+    _hash_aktualisieren(benutzer_passwort, passwort, hashed_passwort)
+    return True
+
+
+def _hash_aktualisieren(benutzer_passwort, passwort, hashed_passwort):
+    """Erstellt den Hash mit den konfigurierten Kosten neu, falls nötig."""
+    if not neu_hashen_nötig(hashed_passwort, benutzer_passwort):
+        return False
+    felder = passwort_felder(passwort, benutzer_passwort)
+    with protokollierte_änderung("passwort_setzen", **felder):
+        benutzer_passwort.update(felder)
+        metadaten_markieren()
+    return True
+
+
 def passwort_ändern(benutzer_passwort, timed_input, daten_speichern_func):
     """
     Ermöglicht das Ändern des Passworts.
@@ -91,8 +88,8 @@ def passwort_ändern(benutzer_passwort, timed_input, daten_speichern_func):
     Returns:
         dict: Aktualisiertes benutzer_passwort Dictionary
     """
-    hashed_passwort = benutzer_passwort.get("passwort",
-                                            hash_passwort("Test1234!"))
+    hashed_passwort = (benutzer_passwort.get("passwort")
+                       or standard_passwort_hash())
 
     änderung_input = timed_input(
         "\n\033[34mBitte geben Sie Ihr aktuelles Passwort ein:\033[0m")
@@ -145,7 +142,10 @@ def passwort_ändern(benutzer_passwort, timed_input, daten_speichern_func):
             passwort_neu2 = timed_input(
                 "\033[34mGeben Sie Ihr neues Passwort erneut ein:\033[0m")
             if passwort_neu1 == passwort_neu2:
-                benutzer_passwort["passwort"] = hash_passwort(passwort_neu1)
+                felder = passwort_felder(passwort_neu1, benutzer_passwort)
+                with protokollierte_änderung("passwort_setzen", **felder):
+                    benutzer_passwort.update(felder)
+                    metadaten_markieren()
                 daten_speichern_func()
                 print("\n\033[32mPasswort erfolgreich geändert!\033[0m")
                 break
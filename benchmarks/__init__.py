@@ -0,0 +1,5 @@
+"""
+Benchmarks für Budget-Tracker
+Enthält einen deterministischen Datengenerator und Zeitmessungen der
+Lade-, Speicher- und Statistikfunktionen (Aufruf: python -m benchmarks)
+"""
@@ -0,0 +1,8 @@
+"""Startet die Benchmarks mit python -m benchmarks."""
+
+import sys
+
+from benchmarks.run import main
+
+
+sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Datengenerator für die Benchmarks
+Erzeugt reproduzierbare Budgetdaten im Format von STANDARD_KATEGORIEN
+"""
+
+import random
+import string
+from datetime import date
+
+from credentials import STANDARD_PASSWORT, hash_passwort
+from data_handler import snapshot_inhalt
+from entry_model import (EINTRAG_TRENNER, betrag_als_text, tag_als_datum)
+
+
+KOSTENARTEN = [
+    "Brot", "Milch", "Käse", "Gemüse", "Früchte", "Miete", "Strom",
+    "Internet", "Handy", "Busabo", "Benzin", "Kino", "Konzert", "Bücher",
+    "Kleider", "Schuhe", "Arzt", "Apotheke", "Versicherung", "Geschenke",
+    "Restaurant", "Kaffee", "Fitness", "Reisen", "Hotel", "Zugticket",
+]
+
+# Niedrige bcrypt-Kosten, damit das Passwort die Messungen nicht prägt
+BENCHMARK_BCRYPT_KOSTEN = 4
+
+
+def kategorie_name(index):
+    """
+    Liefert einen gültigen Kategorienamen (nur Buchstaben).
+
+    Args:
+        index (int): Laufnummer der Kategorie (0-basiert)
+
+    Returns:
+        str: z.B. "KategorieA", "KategorieB", ..., "KategorieBA"
+    """
+    buchstaben = ""
+    while True:
+        index, rest = divmod(index, 26)
+        buchstaben = string.ascii_uppercase[rest] + buchstaben
+        if index == 0:
+            return "Kategorie" + buchstaben
+
+
+def budget_daten_erzeugen(anzahl_kategorien,
+                          einträge_pro_kategorie,
+                          jahre,
+                          seed=0,
+                          start_jahr=2020):
+    """
+    Erzeugt Kategorien mit nach Datum sortierten Einträgen als Strings
+    ("DD.MM.YYYY - Kostenart - Betrag CHF") sowie Limits und Ziele.
+    Gleiche Parameter liefern immer dieselben Daten.
+
+    Args:
+        anzahl_kategorien (int): Anzahl Kategorien
+        einträge_pro_kategorie (int): Anzahl Einträge pro Kategorie
+        jahre (int): Zeitraum in Jahren, über den die Daten verteilt werden
+        seed (int): Startwert des Zufallsgenerators
+        start_jahr (int): Jahr des frühesten Eintrags
+
+    Returns:
+        tuple: (kategorien_texte, budget_limits, finanzziele)
+    """
+    zufall = random.Random(seed)
+    erster_tag = date(start_jahr, 1, 1).toordinal()
+    anzahl_tage = date(start_jahr + jahre, 1, 1).toordinal() - erster_tag
+
+    kategorien_texte = {}
+    budget_limits = {}
+    finanzziele = {}
+    for i in range(anzahl_kategorien):
+        kategorie = kategorie_name(i)
+        tage = sorted(erster_tag + zufall.randrange(anzahl_tage)
+                      for _ in range(einträge_pro_kategorie))
+        kategorien_texte[kategorie] = [
+            f"{tag_als_datum(tag)}"
+            f"{EINTRAG_TRENNER}{zufall.choice(KOSTENARTEN)}{EINTRAG_TRENNER}"
+            f"{betrag_als_text(zufall.randint(5, 30000) / 100)} CHF"
+            for tag in tage]
+        if i % 2 == 0:
+            budget_limits[kategorie] = float(zufall.randint(100, 2000))
+        if i % 3 == 0:
+            finanzziele[kategorie] = {
+                "ziel": float(zufall.randint(500, 50000)),
+                "meldung": f"Ziel für {kategorie} erreicht!"}
+
+    return kategorien_texte, budget_limits, finanzziele
+
+
+def daten_datei_schreiben(pfad, kategorien_texte, budget_limits,
+                          finanzziele):
+    """
+    Schreibt erzeugte Daten im Format von budget_daten.json.
+
+    Args:
+        pfad (str): Zieldatei
+        kategorien_texte (dict): Kategorien mit Einträgen als Strings
+        budget_limits (dict): Budget-Limits pro Kategorie
+        finanzziele (dict): Finanzziele pro Kategorie
+    """
+    benutzer_passwort = {
+        "passwort": hash_passwort(STANDARD_PASSWORT,
+                                  kosten=BENCHMARK_BCRYPT_KOSTEN)}
+    with open(pfad, "wb") as f:
+        f.write(snapshot_inhalt(kategorien_texte, budget_limits,
+                                finanzziele, benutzer_passwort))
@@ -0,0 +1,161 @@
+"""
+Lasttest für den Budget-Server
+Schickt von mehreren Clients gleichzeitig lesende und schreibende
+Anfragen an einen laufenden Server (python main.py serve) und gibt
+Durchsatz und Latenzen aus
+Aufruf: python -m benchmarks.load_test
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from urllib.error import HTTPError
+from urllib.parse import quote
+from urllib.request import Request, urlopen
+
+from benchmarks.generator import KOSTENARTEN
+
+
+STANDARD_URL = "http://127.0.0.1:8765/api"
+STANDARD_CLIENTS = 8
+STANDARD_ANFRAGEN = 500
+STANDARD_SCHREIBANTEIL = 0.1
+
+
+def anfrage(url, methode="GET", daten=None, token=None):
+    """
+    Schickt eine Anfrage und liefert die JSON-Antwort.
+
+    Args:
+        url (str): Vollständige URL
+        methode (str): HTTP-Methode
+        daten (dict, optional): JSON-Inhalt der Anfrage
+        token (str, optional): Token aus dem Login
+
+    Returns:
+        tuple: (HTTP-Status, Antwort)
+    """
+    inhalt = None if daten is None else json.dumps(daten).encode("utf-8")
+    kopf = {"Content-Type": "application/json"}
+    if token:
+        kopf["Authorization"] = f"Bearer {token}"
+    try:
+        with urlopen(Request(url, inhalt, kopf, method=methode)) as antwort:
+            return antwort.status, json.loads(antwort.read())
+    except HTTPError as e:
+        return e.code, json.loads(e.read() or b"{}")
+
+
+def _client(basis, token, kategorien, anzahl, schreibanteil, seed,
+            latenzen, fehler):
+    """Führt anzahl zufällige Anfragen aus und sammelt die Latenzen."""
+    zufall = random.Random(seed)
+    lesend = [
+        lambda: f"{basis}/kategorien",
+        lambda: f"{basis}/statistik/monate",
+        lambda: f"{basis}/statistik/ziele",
+        lambda: f"{basis}/limits",
+        lambda: (f"{basis}/kategorien/"
+                 f"{quote(zufall.choice(kategorien))}/eintraege"
+                 f"?seite={zufall.randint(1, 5)}&pro_seite=50"),
+    ]
+    for _ in range(anzahl):
+        if zufall.random() < schreibanteil:
+            art = "schreiben"
+            url = (f"{basis}/kategorien/{quote(zufall.choice(kategorien))}"
+                   "/eintraege")
+            daten = {
+                "datum": f"{zufall.randint(1, 28):02d}."
+                         f"{zufall.randint(1, 12):02d}.2024",
+                "kostenart": zufall.choice(KOSTENARTEN),
+                "betrag": round(zufall.uniform(1, 100), 2),
+            }
+            start = time.perf_counter()
+            status, _ = anfrage(url, "POST", daten, token)
+        else:
+            art = "lesen"
+            start = time.perf_counter()
+            status, _ = anfrage(zufall.choice(lesend)(), token=token)
+        latenzen[art].append(time.perf_counter() - start)
+        if status != 200:
+            fehler.append(status)
+
+
+def _perzentil(werte, anteil):
+    werte = sorted(werte)
+    return werte[min(len(werte) - 1, int(anteil * len(werte)))]
+
+
+def main(argumente=None):
+    """
+    Führt den Lasttest aus und gibt eine Übersicht aus.
+
+    Args:
+        argumente (list, optional): Kommandozeilen-Argumente
+
+    Returns:
+        int: Exit-Code (1 bei fehlgeschlagenen Anfragen)
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.load_test",
+        description="Lasttest für den Budget-Server (python main.py serve).")
+    parser.add_argument("--url", default=STANDARD_URL)
+    parser.add_argument("--clients", type=int, default=STANDARD_CLIENTS)
+    parser.add_argument("--anfragen", type=int, default=STANDARD_ANFRAGEN,
+                        help="Anfragen pro Client")
+    parser.add_argument("--schreibanteil", type=float,
+                        default=STANDARD_SCHREIBANTEIL,
+                        help="Anteil der Anfragen, die Einträge hinzufügen")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argumente)
+    basis = args.url.rstrip("/")
+
+    status, login = anfrage(f"{basis}/login", "POST", {
+        "passwort": os.environ.get("BUDGET_PASSWORT", "")})
+    if status != 200:
+        print(f"Login fehlgeschlagen: {login.get('fehler')}", file=sys.stderr)
+        return 1
+    token = login["token"]
+    _, kategorien = anfrage(f"{basis}/kategorien", token=token)
+    kategorien = [k["name"] for k in kategorien]
+    if not kategorien:
+        print("Der Server hat keine Kategorien.", file=sys.stderr)
+        return 1
+
+    latenzen = {"lesen": [], "schreiben": []}
+    fehler = []
+    threads = [threading.Thread(
+        target=_client,
+        args=(basis, token, kategorien, args.anfragen, args.schreibanteil,
+              args.seed + i, latenzen, fehler))
+        for i in range(args.clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    dauer = time.perf_counter() - start
+
+    gesamt = sum(len(werte) for werte in latenzen.values())
+    print(f"{gesamt} Anfragen von {args.clients} Clients in {dauer:.2f} s "
+          f"({gesamt / dauer:.0f} Anfragen/s), {len(fehler)} Fehler")
+    print(f"{'Art':<12} {'Anzahl':>8} {'Median ms':>10} {'p95 ms':>10} "
+          f"{'p99 ms':>10} {'Max ms':>10}")
+    for art, werte in latenzen.items():
+        if not werte:
+            continue
+        print(f"{art:<12} {len(werte):>8} "
+              f"{statistics.median(werte) * 1000:>10.2f} "
+              f"{_perzentil(werte, 0.95) * 1000:>10.2f} "
+              f"{_perzentil(werte, 0.99) * 1000:>10.2f} "
+              f"{max(werte) * 1000:>10.2f}")
+    return 1 if fehler else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
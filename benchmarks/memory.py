@@ -0,0 +1,112 @@
+"""
+Speicher-Vergleich für Budget-Tracker
+Misst mit tracemalloc, wie viel Speicher eine erzeugte Kategorie in
+verschiedenen Darstellungen belegt
+Aufruf: python -m benchmarks.memory
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from array import array
+
+from benchmarks.generator import budget_daten_erzeugen
+from entry_model import (EINTRAG_TRENNER, EintragsListe, betrag_als_rappen,
+                         datum_als_tag, eintrag_aus_text)
+
+
+STANDARD_EINTRÄGE = 1000000
+STANDARD_JAHRE = 3
+
+
+def _eintrag_objekte(zeilen):
+    """Eine Liste von Eintrag-Objekten (internierte Kostenarten)."""
+    return [eintrag_aus_text(zeile) for zeile in zeilen]
+
+
+def _strings_liste(zeilen):
+    """
+    Spalten für Tage und Rappen, dazu eine Liste mit der Kostenart
+    jedes Eintrags als eigenem String (wie aus JSON gelesen).
+    """
+    tage = array("i")
+    rappen = array("q")
+    kostenarten = []
+    for zeile in zeilen:
+        datum, kostenart, betrag = zeile.split(EINTRAG_TRENNER)
+        tage.append(datum_als_tag(datum))
+        kostenarten.append(kostenart)
+        rappen.append(betrag_als_rappen(float(betrag.replace("CHF", ""))))
+    return tage, rappen, kostenarten
+
+
+def _kostenart_codes(zeilen):
+    """Die EintragsListe mit Spalten und Kostenart-Codes."""
+    return EintragsListe(map(eintrag_aus_text, zeilen))
+
+
+DARSTELLUNGEN = {
+    "eintrag_objekte": _eintrag_objekte,
+    "strings_liste": _strings_liste,
+    "kostenart_codes": _kostenart_codes,
+}
+
+
+def speicher_messen(funktion, zeilen):
+    """
+    Baut eine Darstellung auf und misst den dabei belegten Speicher.
+
+    Args:
+        funktion (callable): Baut die Darstellung aus den Zeilen
+        zeilen (list): Einträge als Strings
+
+    Returns:
+        int: Belegte Bytes, solange die Darstellung existiert
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        vorher = tracemalloc.get_traced_memory()[0]
+        darstellung = funktion(zeilen)
+        gc.collect()
+        belegt = tracemalloc.get_traced_memory()[0] - vorher
+        del darstellung
+    finally:
+        tracemalloc.stop()
+    return belegt
+
+
+def main(argumente=None):
+    """
+    Vergleicht den Speicherbedarf der Darstellungen.
+
+    Args:
+        argumente (list, optional): Kommandozeilen-Argumente
+
+    Returns:
+        int: Exit-Code
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.memory",
+        description="Vergleicht den Speicherbedarf einer Kategorie.")
+    parser.add_argument("--einträge", type=int, default=STANDARD_EINTRÄGE)
+    parser.add_argument("--jahre", type=int, default=STANDARD_JAHRE)
+    args = parser.parse_args(argumente)
+
+    texte, _, _ = budget_daten_erzeugen(1, args.einträge, args.jahre)
+    zeilen = next(iter(texte.values()))
+    # Datums-Cache vorab füllen, damit er in keiner Messung zählt
+    for zeile in zeilen:
+        datum_als_tag(zeile.split(EINTRAG_TRENNER, 1)[0])
+
+    print(f"{'Darstellung':<20} {'MB':>10} {'Bytes/Eintrag':>15}")
+    for name, funktion in DARSTELLUNGEN.items():
+        belegt = speicher_messen(funktion, zeilen)
+        print(f"{name:<20} {belegt / 1e6:>10.1f} "
+              f"{belegt / max(1, len(zeilen)):>15.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,337 @@
+"""
+Benchmark-Läufe für Budget-Tracker
+Misst die Lade-, Speicher- und Statistikfunktionen über mehrere
+Datenmengen und schreibt die Ergebnisse als JSON
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import data_handler
+import render_cache
+from benchmarks.generator import (budget_daten_erzeugen,
+                                  daten_datei_schreiben, KOSTENARTEN)
+from benchmarks.startup import startzeit_prüfen, PROJEKT_VERZEICHNIS
+from category_manager import (kategorie_bearbeiten, eintrag_hinzufügen,
+                              eintrag_entfernen, eintrag_löschen)
+from entry_model import Eintrag, datum_als_tag, tag_als_datum, tag_als_monat
+from journal import offene_änderungen_verwerfen
+from statistic import (monats_summen_pro_kategorie_mit_limits,
+                       finanzziel_statistik_daten,
+                       plot_monats_summen_pro_kategorie, plot_finanzziele)
+
+
+STANDARD_KATEGORIEN = [8]
+STANDARD_EINTRÄGE = [1000, 10000, 100000]
+STANDARD_JAHRE = 3
+STANDARD_WIEDERHOLUNGEN = 5
+
+# Anzahl Einträge, die pro Wiederholung über das Menü erfasst werden
+EINFÜGUNGEN_PRO_MESSUNG = 200
+
+# Anzahl Einträge, die pro Wiederholung gelöscht werden
+LÖSCHUNGEN_PRO_MESSUNG = 200
+
+BENCHMARKS = (
+    "daten_laden",
+    "daten_laden_alle_kategorien",
+    "daten_laden_binär",
+    "daten_laden_binär_alle_kategorien",
+    "daten_speichern_snapshot",
+    "daten_speichern_journal",
+    "monats_summen_pro_kategorie_mit_limits",
+    "finanzziel_statistik_daten",
+    "plot_monats_summen_pro_kategorie",
+    "plot_finanzziele",
+    "eintrag_mit_limitprüfung",
+    "einträge_löschen_nach_id",
+    "einträge_entfernen_nach_position",
+)
+
+
+def messen(funktion, wiederholungen, vorbereitung=None):
+    """
+    Misst eine Funktion mehrfach mit time.perf_counter.
+
+    Args:
+        funktion (callable): Zu messende Funktion ohne Argumente
+        wiederholungen (int): Anzahl Messungen
+        vorbereitung (callable, optional): Wird vor jeder Messung
+                                           ungemessen aufgerufen
+
+    Returns:
+        list: Dauer jeder Messung in Sekunden
+    """
+    dauer = []
+    for _ in range(wiederholungen):
+        if vorbereitung is not None:
+            vorbereitung()
+        start = time.perf_counter()
+        funktion()
+        dauer.append(time.perf_counter() - start)
+    return dauer
+
+
+def _caches_leeren():
+    """Leert die Datums-Caches, damit jeder Ladevorgang kalt beginnt."""
+    datum_als_tag.cache_clear()
+    tag_als_datum.cache_clear()
+    tag_als_monat.cache_clear()
+
+
+def _alle_kategorien_laden():
+    """Lädt die Daten und greift auf jede Kategorie zu."""
+    for einträge in data_handler.daten_laden()[0].values():
+        len(einträge)
+
+
+def _render_cache_leeren():
+    shutil.rmtree(render_cache.CACHE_VERZEICHNIS, ignore_errors=True)
+
+
+def _menü_eingaben(kategorie_nummer, anzahl):
+    """Eingaben für kategorie_bearbeiten: anzahl Einträge hinzufügen."""
+    eingaben = [str(kategorie_nummer)]
+    for i in range(anzahl):
+        eingaben += ["2", f"{i % 28 + 1:02d}.03.2024",
+                     KOSTENARTEN[i % len(KOSTENARTEN)], "12.50"]
+    eingaben += ["0", "0"]
+    return iter(eingaben)
+
+
+def datenmenge_messen(anzahl_kategorien, einträge, jahre, wiederholungen,
+                      auswahl):
+    """
+    Führt alle ausgewählten Benchmarks für eine Datenmenge aus.
+    Gearbeitet wird in einem temporären Verzeichnis, da die Module
+    ihre Dateien relativ zum Arbeitsverzeichnis ablegen.
+
+    Args:
+        anzahl_kategorien (int): Anzahl Kategorien
+        einträge (int): Einträge pro Kategorie
+        jahre (int): Zeitraum der Daten in Jahren
+        wiederholungen (int): Messungen pro Benchmark
+        auswahl (list): Namen der auszuführenden Benchmarks
+
+    Returns:
+        list: Ein Ergebnis-Dictionary pro Benchmark
+    """
+    texte, limits, ziele = budget_daten_erzeugen(anzahl_kategorien,
+                                                 einträge, jahre)
+    ergebnisse = []
+    arbeitsverzeichnis = os.getcwd()
+    with tempfile.TemporaryDirectory() as verzeichnis:
+        os.chdir(verzeichnis)
+        try:
+            daten_datei_schreiben(data_handler.DATEN_DATEI, texte,
+                                  limits, ziele)
+            del texte
+            ausgabe = io.StringIO()
+            with contextlib.redirect_stdout(ausgabe):
+                daten = data_handler.daten_laden()
+                messungen = _messungen(daten)
+                for name in auswahl:
+                    funktion, vorbereitung, faktor = messungen[name]
+                    dauer = [d / faktor for d in messen(
+                        funktion, wiederholungen, vorbereitung)]
+                    ergebnisse.append({
+                        "benchmark": name,
+                        "kategorien": anzahl_kategorien,
+                        "einträge_pro_kategorie": einträge,
+                        "jahre": jahre,
+                        "sekunden": dauer,
+                        "minimum": min(dauer),
+                        "median": statistics.median(dauer),
+                    })
+                    ausgabe.seek(0)
+                    ausgabe.truncate()
+        finally:
+            offene_änderungen_verwerfen()
+            os.chdir(arbeitsverzeichnis)
+    return ergebnisse
+
+
+def _messungen(daten):
+    """
+    Beschreibt jeden Benchmark als (Funktion, Vorbereitung, Faktor);
+    die gemessene Dauer wird durch den Faktor geteilt.
+    """
+    budget_kategorien, budget_limits, finanzziele, _ = daten
+    monats_daten = monats_summen_pro_kategorie_mit_limits(budget_kategorien,
+                                                          budget_limits)
+    ziel_daten = finanzziel_statistik_daten(budget_kategorien, finanzziele)
+    erste_kategorie = next(iter(budget_kategorien))
+
+    def json_vorbereiten():
+        # Ohne binären Snapshot wird die JSON-Datei geladen
+        if os.path.exists(data_handler.BINÄR_DATEI):
+            os.remove(data_handler.BINÄR_DATEI)
+        _caches_leeren()
+
+    def binär_vorbereiten():
+        if not os.path.exists(data_handler.BINÄR_DATEI):
+            data_handler.snapshot_schreiben(*daten)
+        _caches_leeren()
+
+    eingefügt = []
+
+    def journal_vorbereiten():
+        data_handler.snapshot_schreiben(*daten)
+        eingefügt.append(eintrag_hinzufügen(
+            budget_kategorien, erste_kategorie,
+            budget_kategorien[erste_kategorie][0]))
+
+    def journal_speichern():
+        data_handler.daten_speichern(*daten)
+        eintrag_entfernen(budget_kategorien, erste_kategorie,
+                          eingefügt.pop())
+        offene_änderungen_verwerfen()
+
+    def einfügen():
+        eingaben = _menü_eingaben(1, EINFÜGUNGEN_PRO_MESSUNG)
+        kategorie_bearbeiten(budget_kategorien, budget_limits,
+                             lambda _: next(eingaben))
+
+    zufall = random.Random(0)
+    zu_löschen = []
+
+    def löschen_vorbereiten():
+        # Neue Einträge an zufälligen bestehenden Tagen, damit die
+        # Löschungen über die ganze Kategorie verteilt sind
+        offene_änderungen_verwerfen()
+        einträge = budget_kategorien[erste_kategorie]
+        tage = einträge.spalten()[0]
+        neue = [Eintrag(zufall.choice(tage), "Benchmark", 1.0)
+                for _ in range(LÖSCHUNGEN_PRO_MESSUNG)]
+        for eintrag in neue:
+            eintrag_hinzufügen(budget_kategorien, erste_kategorie, eintrag)
+        ids = {eintrag.id for eintrag in neue}
+        zu_löschen[:] = [(position, eintrag_id) for position, eintrag_id
+                         in enumerate(einträge.id_spalte())
+                         if eintrag_id in ids]
+
+    def nach_id_löschen():
+        for _, eintrag_id in zu_löschen:
+            eintrag_löschen(budget_kategorien, erste_kategorie, eintrag_id)
+        # Die gelöschten Einträge werden beim nächsten Zugriff verdichtet
+        len(budget_kategorien[erste_kategorie])
+
+    def nach_position_entfernen():
+        # Von hinten, damit die übrigen Positionen gültig bleiben
+        for position, _ in reversed(zu_löschen):
+            eintrag_entfernen(budget_kategorien, erste_kategorie, position)
+
+    return {
+        "daten_laden": (data_handler.daten_laden, json_vorbereiten, 1),
+        "daten_laden_alle_kategorien": (_alle_kategorien_laden,
+                                        json_vorbereiten, 1),
+        "daten_laden_binär": (data_handler.daten_laden,
+                              binär_vorbereiten, 1),
+        "daten_laden_binär_alle_kategorien": (_alle_kategorien_laden,
+                                              binär_vorbereiten, 1),
+        "daten_speichern_snapshot": (
+            lambda: data_handler.snapshot_schreiben(*daten), None, 1),
+        "daten_speichern_journal": (journal_speichern,
+                                    journal_vorbereiten, 1),
+        "monats_summen_pro_kategorie_mit_limits": (
+            lambda: monats_summen_pro_kategorie_mit_limits(
+                budget_kategorien, budget_limits), None, 1),
+        "finanzziel_statistik_daten": (
+            lambda: finanzziel_statistik_daten(budget_kategorien,
+                                               finanzziele), None, 1),
+        "plot_monats_summen_pro_kategorie": (
+            lambda: plot_monats_summen_pro_kategorie(monats_daten,
+                                                     budget_limits),
+            _render_cache_leeren, 1),
+        "plot_finanzziele": (lambda: plot_finanzziele(ziel_daten),
+                             _render_cache_leeren, 1),
+        "eintrag_mit_limitprüfung": (einfügen, offene_änderungen_verwerfen,
+                                     EINFÜGUNGEN_PRO_MESSUNG),
+        "einträge_löschen_nach_id": (nach_id_löschen, löschen_vorbereiten,
+                                     LÖSCHUNGEN_PRO_MESSUNG),
+        "einträge_entfernen_nach_position": (nach_position_entfernen,
+                                             löschen_vorbereiten,
+                                             LÖSCHUNGEN_PRO_MESSUNG),
+    }
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJEKT_VERZEICHNIS,
+            capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argumente=None):
+    """
+    Führt die Benchmarks aus und gibt eine Übersicht sowie JSON aus.
+
+    Args:
+        argumente (list, optional): Kommandozeilen-Argumente
+
+    Returns:
+        int: Exit-Code (1 wenn das Startzeit-Budget überschritten ist)
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Misst die Lade-, Speicher- und Statistikfunktionen.")
+    parser.add_argument("--kategorien", type=int, nargs="+",
+                        default=STANDARD_KATEGORIEN)
+    parser.add_argument("--einträge", type=int, nargs="+",
+                        default=STANDARD_EINTRÄGE,
+                        help="Einträge pro Kategorie (Skalierungsreihe)")
+    parser.add_argument("--jahre", type=int, default=STANDARD_JAHRE)
+    parser.add_argument("--wiederholungen", type=int,
+                        default=STANDARD_WIEDERHOLUNGEN)
+    parser.add_argument("--nur", nargs="+", choices=BENCHMARKS,
+                        default=list(BENCHMARKS),
+                        help="Nur diese Benchmarks ausführen")
+    parser.add_argument("--ausgabe", default="benchmark_ergebnisse.json",
+                        help='JSON-Datei oder "-" für stdout')
+    args = parser.parse_args(argumente)
+
+    ergebnis = {
+        "zeitpunkt": datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "plattform": platform.platform(),
+        "startzeit": startzeit_prüfen(),
+        "ergebnisse": [],
+    }
+    for anzahl_kategorien in args.kategorien:
+        for einträge in args.einträge:
+            for messung in datenmenge_messen(anzahl_kategorien, einträge,
+                                             args.jahre, args.wiederholungen,
+                                             args.nur):
+                ergebnis["ergebnisse"].append(messung)
+                print(f"{messung['benchmark']:<40} "
+                      f"{anzahl_kategorien:>4} x {einträge:<8} "
+                      f"{messung['median'] * 1000:>10.3f} ms",
+                      file=sys.stderr)
+
+    startzeit = ergebnis["startzeit"]
+    print(f"{'startzeit main':<40} {'':>15} "
+          f"{startzeit['importzeit_ms'] or 0:>10.3f} ms "
+          f"(Budget {startzeit['budget_ms']:.0f} ms)", file=sys.stderr)
+
+    text = json.dumps(ergebnis, indent=4, ensure_ascii=False)
+    if args.ausgabe == "-":
+        print(text)
+    else:
+        with open(args.ausgabe, "w", encoding="utf-8") as f:
+            f.write(text)
+    return 0 if startzeit["ok"] else 1
@@ -0,0 +1,91 @@
+"""
+Startzeit-Prüfung für Budget-Tracker
+Misst mit "python -X importtime" die Importzeit von main.py bis zur
+Login-Abfrage und prüft, dass NumPy und matplotlib dabei nicht geladen
+werden (Aufruf: python -m benchmarks.startup)
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+
+# Zeitbudget für alle Importe von main.py in Millisekunden
+STARTZEIT_BUDGET_MS = 200.0
+
+# Module, die erst bei einer Statistik geladen werden dürfen
+VERZÖGERTE_MODULE = ("numpy", "matplotlib")
+
+PROJEKT_VERZEICHNIS = os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__)))
+
+
+def importzeit_messen():
+    """
+    Importiert main.py in einem frischen Interpreter mit -X importtime.
+
+    Returns:
+        tuple: (Importzeit von main in ms, Liste aller Module in
+                sys.modules nach dem Import)
+    """
+    ergebnis = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         "import sys, main; print(*sys.modules, sep='\\n')"],
+        cwd=PROJEKT_VERZEICHNIS, capture_output=True, text=True, check=True)
+
+    module = ergebnis.stdout.split()
+    main_ms = None
+    for zeile in ergebnis.stderr.splitlines():
+        if not zeile.startswith("import time:") or "|" not in zeile:
+            continue
+        _, kumuliert, name = zeile[len("import time:"):].split("|")
+        if not kumuliert.strip().isdigit():
+            continue
+        name = name.strip()
+        if name == "main":
+            main_ms = int(kumuliert) / 1000
+    return main_ms, module
+
+
+def startzeit_prüfen(budget_ms=STARTZEIT_BUDGET_MS):
+    """
+    Prüft Importzeit und verzögerte Module gegen das Startzeit-Budget.
+
+    Args:
+        budget_ms (float): Erlaubte Importzeit in Millisekunden
+
+    Returns:
+        dict: Messergebnis mit "ok", "importzeit_ms", "budget_ms"
+              und "verfrüht_geladen"
+    """
+    main_ms, module = importzeit_messen()
+    verfrüht = sorted({name for name in module
+                       if name.split(".")[0] in VERZÖGERTE_MODULE})
+    return {
+        "ok": main_ms is not None and main_ms <= budget_ms and not verfrüht,
+        "importzeit_ms": main_ms,
+        "budget_ms": budget_ms,
+        "verfrüht_geladen": verfrüht,
+    }
+
+
+def main(argumente=None):
+    parser = argparse.ArgumentParser(
+        description="Prüft die Startzeit von main.py.")
+    parser.add_argument("--budget-ms", type=float,
+                        default=STARTZEIT_BUDGET_MS,
+                        help="Erlaubte Importzeit in Millisekunden")
+    args = parser.parse_args(argumente)
+
+    ergebnis = startzeit_prüfen(args.budget_ms)
+    print(f"Importzeit main: {ergebnis['importzeit_ms'] or 0:.1f} ms "
+          f"(Budget {ergebnis['budget_ms']:.0f} ms)")
+    if ergebnis["verfrüht_geladen"]:
+        print("Beim Start geladen, obwohl erst für Statistiken nötig: "
+              + ", ".join(ergebnis["verfrüht_geladen"][:5]))
+    return 0 if ergebnis["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,291 @@
+"""
+Binär-Snapshot-Modul für Budget-Tracker
+Enthält ein kompaktes Snapshot-Format mit Spalten für Tage, Beträge
+in Rappen, Kostenarten und IDs, das ohne Parsen einzelner Einträge
+gelesen wird
+"""
+
+import json
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+
+from entry_model import (EintragsListe, VerzögerteEintragsListe,
+                         kostenart_code, kostenart_tabelle, nachlade_sperre,
+                         ungeladene_quelle, quelle_ersetzen)
+from tracing import span
+
+
+# Aufbau der Datei:
+#   Kopf (_KOPF): Kennung, Format, CRC32 und Länge der Kopfdaten
+#   Kopfdaten (JSON): Journal-Stand, Passwort, Limits, Ziele, die
+#       Kostenarten-Tabelle (Code -> Kostenart, nur die verwendeten
+#       Kostenarten), pro Kategorie
+#       [Start, Anzahl, CRC32, nächste ID] und (optional) pro Kategorie
+#       die nicht lesbaren Eintragszeilen aus dem Textformat
+#   Spalten jeder Kategorie ab einer durch 8 teilbaren Position:
+#       Beträge in Rappen (int64), Tage (int32), Kostenart-Codes (int32),
+#       IDs (int32)
+# Alle Zahlen sind Little Endian.
+BINÄR_KENNUNG = b"BUDGETBS"
+BINÄR_FORMAT = 2
+
+_KOPF = struct.Struct("<8sIIQ")
+
+# Bytes pro Eintrag: Rappen (8), Tag (4), Kostenart-Code (4), ID (4)
+_EINTRAG_BYTES = 20
+
+_UMDREHEN = sys.byteorder != "little"
+
+
+class _BinärAbschnitt:
+    """
+    Quelle einer VerzögerteEintragsListe: die Spalten einer Kategorie
+    im binären Snapshot. Stimmen die Codes der Datei nicht mit der
+    gemeinsamen Kostenarten-Tabelle überein, werden sie beim Laden
+    übersetzt.
+    """
+
+    __slots__ = ("pfad", "kategorie", "start", "anzahl", "prüfsumme",
+                 "nächste_id", "übersetzung", "unlesbar")
+
+    def __init__(self, pfad, kategorie, start, anzahl, prüfsumme,
+                 nächste_id, übersetzung=None, unlesbar=()):
+        self.pfad = pfad
+        self.kategorie = kategorie
+        self.start = start
+        self.anzahl = anzahl
+        self.prüfsumme = prüfsumme
+        self.nächste_id = nächste_id
+        self.übersetzung = übersetzung
+        self.unlesbar = unlesbar
+
+    def spalten(self):
+        """
+        Liest die Spalten der Kategorie, ohne eine EintragsListe zu
+        erstellen. Die Codes sind in die gemeinsame Tabelle übersetzt.
+
+        Returns:
+            tuple: (rappen, tage, codes, ids) als Arrays
+        """
+        with open(self.pfad, "rb") as f:
+            f.seek(self.start)
+            block = f.read(self.anzahl * _EINTRAG_BYTES)
+        rappen, tage, codes, ids = self._spalten_lesen(memoryview(block))
+        if self.übersetzung is not None:
+            codes = array("i", map(self.übersetzung.__getitem__, codes))
+        return rappen, tage, codes, ids
+
+    def __call__(self):
+        länge = self.anzahl * _EINTRAG_BYTES
+        with span("kategorie_nachladen", bytes=länge):
+            with open(self.pfad, "rb") as f:
+                with mmap.mmap(f.fileno(), 0,
+                               access=mmap.ACCESS_READ) as karte:
+                    with memoryview(karte) as ansicht:
+                        rappen, tage, codes, ids = self._spalten_lesen(
+                            ansicht[self.start:self.start + länge])
+            if self.übersetzung is not None:
+                codes = array("i", map(self.übersetzung.__getitem__, codes))
+            einträge = EintragsListe.aus_spalten(tage, rappen, codes, ids,
+                                                 self.nächste_id)
+            einträge.unlesbar = list(self.unlesbar)
+            return einträge
+
+    def _spalten_lesen(self, block):
+        with block:
+            if (len(block) < self.anzahl * _EINTRAG_BYTES
+                    or zlib.crc32(block) != self.prüfsumme):
+                raise ValueError(
+                    f"Die Kategorie '{self.kategorie}' im binären "
+                    f"Snapshot ist beschädigt (Prüfsumme).")
+            n = self.anzahl
+            return (_spalte("q", block[:8 * n]),
+                    _spalte("i", block[8 * n:12 * n]),
+                    _spalte("i", block[12 * n:16 * n]),
+                    _spalte("i", block[16 * n:]))
+
+
+def _spalte(typ, daten):
+    spalte = array(typ)
+    spalte.frombytes(daten)
+    if _UMDREHEN:
+        spalte.byteswap()
+    return spalte
+
+
+def _ausrichten(position):
+    return -(-position // 8) * 8
+
+
+def binär_inhalt(pfad,
+                 budget_kategorien,
+                 budget_limits,
+                 finanzziele,
+                 benutzer_passwort,
+                 journal_stand):
+    """
+    Erstellt den Inhalt eines binären Snapshots. Die Tabelle der
+    Datei enthält nur die noch verwendeten Kostenarten; sind alle
+    Kostenarten der gemeinsamen Tabelle in Gebrauch, werden die Codes
+    unverändert geschrieben, sonst auf die kleinere Tabelle umkodiert.
+    Noch nicht geladene Kategorien aus einem binären Snapshot werden
+    spaltenweise übernommen, ohne sie zu laden. Unter der
+    Änderungssperre aufrufen.
+
+    Args:
+        pfad (str): Künftiger Pfad des Snapshots
+        budget_kategorien (dict): Budget-Kategorien mit Eintrag-Objekten
+        budget_limits (dict): Budget-Limits pro Kategorie
+        finanzziele (dict): Finanzziele pro Kategorie
+        benutzer_passwort (dict): Gehashtes Benutzer-Passwort
+        journal_stand (int): Stand des zugehörigen Journals
+
+    Returns:
+        tuple: (Inhalt als Bytes, [(ungeladene EintragsListe, Quelle im
+                neuen Snapshot)] für quellen_übernehmen)
+    """
+    with nachlade_sperre:
+        quellen = {kategorie: ungeladene_quelle(einträge)
+                   for kategorie, einträge in budget_kategorien.items()}
+        kategorien = {}
+        unlesbar = {}
+        for kategorie, einträge in budget_kategorien.items():
+            quelle = quellen[kategorie]
+            if isinstance(quelle, _BinärAbschnitt):
+                kategorien[kategorie] = (*quelle.spalten(),
+                                         quelle.nächste_id)
+                zeilen = quelle.unlesbar
+            else:
+                tage, rappen = einträge.spalten()
+                kategorien[kategorie] = (rappen, tage, einträge.code_spalte(),
+                                         einträge.id_spalte(),
+                                         einträge.nächste_id)
+                zeilen = einträge.unlesbar
+            if zeilen:
+                unlesbar[kategorie] = list(zeilen)
+
+        # Nur verwendete Kostenarten schreiben; gelöschte oder
+        # geänderte Einträge hinterlassen sonst Namen in der Tabelle
+        tabelle = kostenart_tabelle()
+        verwendet = set()
+        for _, _, codes, _, _ in kategorien.values():
+            verwendet.update(codes)
+        verwendet = sorted(verwendet)
+        if len(verwendet) == len(tabelle):
+            tabelle = list(tabelle)
+            umkodierung = übersetzung = None
+        else:
+            tabelle = [tabelle[code] for code in verwendet]
+            umkodierung = array("i", bytes(4 * len(kostenart_tabelle())))
+            for neu, code in enumerate(verwendet):
+                umkodierung[code] = neu
+            übersetzung = array("i", verwendet)
+
+        blöcke = []
+        index = {}
+        position = 0
+        for kategorie, (rappen, tage, codes, ids,
+                        nächste_id) in kategorien.items():
+            if umkodierung is not None:
+                codes = array("i", map(umkodierung.__getitem__, codes))
+            spalten = [rappen, tage, codes, ids]
+            if _UMDREHEN:
+                spalten = [array(s.typecode, s) for s in spalten]
+                for spalte in spalten:
+                    spalte.byteswap()
+            block = b"".join(s.tobytes() for s in spalten)
+            index[kategorie] = [position, len(tage), zlib.crc32(block),
+                                nächste_id]
+            blöcke.append(block)
+            position += len(block)
+
+    kopfdaten = json.dumps({
+        "journal_stand": journal_stand,
+        "benutzer_passwort": benutzer_passwort,
+        "budget_limits": budget_limits,
+        "finanzziele": finanzziele,
+        "kostenarten": tabelle,
+        "kategorien": index,
+        "unlesbar": unlesbar,
+    }, ensure_ascii=False).encode("utf-8")
+    datenbeginn = _ausrichten(_KOPF.size + len(kopfdaten))
+    kopf = _KOPF.pack(BINÄR_KENNUNG, BINÄR_FORMAT, zlib.crc32(kopfdaten),
+                      len(kopfdaten))
+    füllung = bytes(datenbeginn - _KOPF.size - len(kopfdaten))
+
+    ungeladen = [(budget_kategorien[kategorie], _BinärAbschnitt(
+                     pfad, kategorie, datenbeginn + start, anzahl,
+                     prüfsumme, nächste_id, übersetzung=übersetzung,
+                     unlesbar=unlesbar.get(kategorie, ())))
+                 for kategorie, (start, anzahl, prüfsumme, nächste_id)
+                 in index.items()
+                 if quellen[kategorie] is not None]
+    return b"".join([kopf, kopfdaten, füllung, *blöcke]), ungeladen
+
+
+def quellen_übernehmen(ungeladen):
+    """
+    Lässt noch nicht geladene Kategorien nach dem Schreiben aus dem
+    neuen Snapshot lesen (unter nachlade_sperre aufrufen).
+
+    Args:
+        ungeladen (list): Zweiter Rückgabewert von binär_inhalt
+    """
+    for einträge, quelle in ungeladen:
+        if ungeladene_quelle(einträge) is not None:
+            quelle_ersetzen(einträge, quelle)
+
+
+def binär_laden(pfad):
+    """
+    Liest Kopf und Kopfdaten eines binären Snapshots und prüft Format
+    und Prüfsumme. Die Spalten jeder Kategorie werden erst beim ersten
+    Zugriff per mmap gelesen.
+
+    Args:
+        pfad (str): Pfad zum Snapshot
+
+    Returns:
+        tuple: (budget_kategorien, budget_limits, finanzziele,
+                benutzer_passwort, journal_stand)
+
+    Raises:
+        ValueError: Wenn die Datei kein gültiger Snapshot ist
+    """
+    with open(pfad, "rb") as f:
+        kopf = f.read(_KOPF.size)
+        if len(kopf) < _KOPF.size:
+            raise ValueError(f"'{pfad}' ist unvollständig.")
+        kennung, format_, prüfsumme, länge = _KOPF.unpack(kopf)
+        if kennung != BINÄR_KENNUNG:
+            raise ValueError(f"'{pfad}' ist kein binärer Snapshot.")
+        if format_ != BINÄR_FORMAT:
+            raise ValueError(f"'{pfad}' hat ein nicht unterstütztes "
+                             f"Format ({format_}).")
+        kopfdaten = f.read(länge)
+    if len(kopfdaten) < länge or zlib.crc32(kopfdaten) != prüfsumme:
+        raise ValueError(f"'{pfad}' ist beschädigt (Prüfsumme).")
+
+    daten = json.loads(kopfdaten)
+    # Meist stimmen die Codes der Datei mit der gemeinsamen Tabelle
+    # überein (z.B. beim ersten Laden); sonst werden sie übersetzt
+    übersetzung = array("i", map(kostenart_code, daten["kostenarten"]))
+    if übersetzung == array("i", range(len(übersetzung))):
+        übersetzung = None
+    datenbeginn = _ausrichten(_KOPF.size + länge)
+    unlesbar = daten.get("unlesbar", {})
+    budget_kategorien = {
+        kategorie: VerzögerteEintragsListe(_BinärAbschnitt(
+            pfad, kategorie, datenbeginn + start, anzahl, prüfsumme,
+            nächste_id, übersetzung=übersetzung,
+            unlesbar=unlesbar.get(kategorie, ())))
+        for kategorie, (start, anzahl, prüfsumme, nächste_id)
+        in daten["kategorien"].items()}
+    return (budget_kategorien,
+            daten["budget_limits"],
+            daten["finanzziele"],
+            daten["benutzer_passwort"],
+            daten["journal_stand"])
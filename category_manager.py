@@ -4,7 +4,226 @@ Enthält alle Funktionen zur Verwaltung von Budget-Kategorien
 """
 
 import re
-from utils import validiere_datum, validiere_positiven_betrag
+from utils import (validiere_datum, validiere_positiven_betrag,
+                   zeitraum_eingeben, KOSTENART_MUSTER)
+from entry_model import EintragsListe, eintrag_erstellen, eintrag_als_text
+from journal import protokollierte_änderung, kategorie_markieren
+from pager import EintragsSeiten, BEDIENUNG
+from search_index import (index_eintrag_hinzugefügt, index_eintrag_entfernt,
+                          index_kategorie_umbenannt, index_kategorie_entfernt)
+
+
+def kategorie_anlegen(budget_kategorien, kategorie):
+    """
+    Legt eine leere Kategorie an und protokolliert die Änderung.
+
+    Args:
+        budget_kategorien (dict): Dictionary mit allen Kategorien
+        kategorie (str): Name der neuen Kategorie
+    """
+    with protokollierte_änderung("kategorie_anlegen", kategorie=kategorie):
+        budget_kategorien[kategorie] = EintragsListe()
+        kategorie_markieren(budget_kategorien[kategorie])
+
+
+def kategorie_umbenennen(budget_kategorien, alter_name, neuer_name):
+    """
+    Benennt eine Kategorie um und protokolliert die Änderung.
+
+    Args:
+        budget_kategorien (dict): Dictionary mit allen Kategorien
+        alter_name (str): Bisheriger Name der Kategorie
+        neuer_name (str): Neuer Name der Kategorie
+    """
+    with protokollierte_änderung("kategorie_umbenennen",
+                                 alt=alter_name, neu=neuer_name):
+        budget_kategorien[neuer_name] = budget_kategorien.pop(alter_name)
+        index_kategorie_umbenannt(budget_kategorien, alter_name, neuer_name)
+
+
+def kategorie_entfernen(budget_kategorien, kategorie):
+    """
+    Entfernt eine Kategorie samt Einträgen und protokolliert die Änderung.
+
+    Args:
+        budget_kategorien (dict): Dictionary mit allen Kategorien
+        kategorie (str): Name der zu entfernenden Kategorie
+
+    Returns:
+        EintragsListe: Die Einträge der entfernten Kategorie
+    """
+    with protokollierte_änderung("kategorie_entfernen", kategorie=kategorie):
+        index_kategorie_entfernt(budget_kategorien, kategorie)
+        return budget_kategorien.pop(kategorie)
+
+
+def eintrag_hinzufügen(budget_kategorien, kategorie, eintrag):
+    """
+    Fügt einer Kategorie einen Eintrag hinzu und protokolliert die Änderung.
+
+    Args:
+        budget_kategorien (dict): Dictionary mit allen Kategorien
+        kategorie (str): Name der Kategorie
+        eintrag (Eintrag): Der neue Eintrag
+
+    Returns:
+        int: Position des Eintrags (die Kategorie ist nach Datum sortiert)
+    """
+    with protokollierte_änderung("eintrag_hinzufügen", kategorie=kategorie,
+                                 eintrag=eintrag_als_text(eintrag)):
+        position = budget_kategorien[kategorie].einfügen(eintrag)
+        kategorie_markieren(budget_kategorien[kategorie])
+        index_eintrag_hinzugefügt(budget_kategorien, kategorie, eintrag)
+        return position
+
+
+def einträge_hinzufügen(budget_kategorien, kategorie, einträge):
+    """
+    Fügt einer Kategorie mehrere Einträge in einem Schritt hinzu
+    (z.B. beim Import) und protokolliert sie als eine Änderung.
+
+    Args:
+        budget_kategorien (dict): Dictionary mit allen Kategorien
+        kategorie (str): Name der Kategorie
+        einträge (list): Die neuen Eintrag-Objekte
+    """
+    with protokollierte_änderung("einträge_hinzufügen", kategorie=kategorie,
+                                 einträge=[eintrag_als_text(e)
+                                           for e in einträge]):
+        budget_kategorien[kategorie].erweitern(einträge)
+        kategorie_markieren(budget_kategorien[kategorie])
+        for eintrag in einträge:
+            index_eintrag_hinzugefügt(budget_kategorien, kategorie, eintrag)
+
+
+def eintrag_entfernen(budget_kategorien, kategorie, position):
+    """
+    Entfernt einen Eintrag aus einer Kategorie und protokolliert
+    die Änderung. Positionen verschieben sich mit jeder Änderung;
+    neue Aufrufer verwenden eintrag_löschen mit der ID.
+
+    Args:
+        budget_kategorien (dict): Dictionary mit allen Kategorien
+        kategorie (str): Name der Kategorie
+        position (int): Position des Eintrags (0-basiert)
+
+    Returns:
+        Eintrag: Der entfernte Eintrag
+
+    Raises:
+        IndexError: Wenn die Position ungültig ist
+    """
+    with protokollierte_änderung("eintrag_entfernen", kategorie=kategorie,
+                                 position=position):
+        eintrag = budget_kategorien[kategorie].entfernen(position)
+        kategorie_markieren(budget_kategorien[kategorie])
+        index_eintrag_entfernt(budget_kategorien, kategorie, eintrag)
+        return eintrag
+
+
+def eintrag_löschen(budget_kategorien, kategorie, eintrag_id):
+    """
+    Löscht einen Eintrag über seine ID und protokolliert die Änderung.
+    Anders als Positionen bleiben die IDs der übrigen Einträge gleich;
+    mehrere Löschungen nacheinander sind daher unabhängig voneinander.
+
+    Args:
+        budget_kategorien (dict): Dictionary mit allen Kategorien
+        kategorie (str): Name der Kategorie
+        eintrag_id (int): ID des Eintrags (Eintrag.id)
+
+    Returns:
+        Eintrag: Der gelöschte Eintrag
+
+    Raises:
+        KeyError: Wenn die Kategorie keinen Eintrag mit dieser ID hat
+    """
+    with protokollierte_änderung("eintrag_löschen", kategorie=kategorie,
+                                 id=eintrag_id):
+        eintrag = budget_kategorien[kategorie].löschen(eintrag_id)
+        kategorie_markieren(budget_kategorien[kategorie])
+        index_eintrag_entfernt(budget_kategorien, kategorie, eintrag)
+        return eintrag
+
+
+def eintrag_ändern(budget_kategorien, kategorie, eintrag_id, eintrag):
+    """
+    Ersetzt Datum, Kostenart und Betrag eines Eintrags; die ID bleibt
+    erhalten. Protokolliert die Änderung.
+
+    Args:
+        budget_kategorien (dict): Dictionary mit allen Kategorien
+        kategorie (str): Name der Kategorie
+        eintrag_id (int): ID des Eintrags (Eintrag.id)
+        eintrag (Eintrag): Die neuen Werte
+
+    Returns:
+        Eintrag: Der Eintrag vor der Änderung
+
+    Raises:
+        KeyError: Wenn die Kategorie keinen Eintrag mit dieser ID hat
+    """
+    with protokollierte_änderung("eintrag_ändern", kategorie=kategorie,
+                                 id=eintrag_id,
+                                 eintrag=eintrag_als_text(eintrag)):
+        alter = budget_kategorien[kategorie].ändern(eintrag_id, eintrag)
+        kategorie_markieren(budget_kategorien[kategorie])
+        index_eintrag_entfernt(budget_kategorien, kategorie, alter)
+        index_eintrag_hinzugefügt(budget_kategorien, kategorie, eintrag)
+        return alter
+
+
+def _limit_prüfen(budget_kategorien, budget_limits, kategorie, eintrag):
+    """Warnt, wenn der Monat des Eintrags sein Budgetlimit übersteigt."""
+    # Limit gilt pro Monat (wie in der Statistik)
+    monats_summe = budget_kategorien[kategorie].monats_summe(eintrag.monat)
+    limit = budget_limits.get(kategorie)
+    if limit is not None and monats_summe > limit:
+        print(f"\033[31mAchtung: "
+              f"Budgetlimit von {limit:.2f} CHF für "
+              f"'{kategorie}' im Monat "
+              f"{eintrag.datum[3:]} "
+              f"überschritten!\033[0m")
+
+
+def _neue_werte_eingeben(eintrag, timed_input):
+    """
+    Fragt neue Werte für einen Eintrag ab; Enter übernimmt den
+    bisherigen Wert.
+
+    Args:
+        eintrag (Eintrag): Der bisherige Eintrag
+        timed_input (callable): Input-Funktion mit Timeout
+
+    Returns:
+        Eintrag | None: Eintrag mit den neuen Werten oder None bei
+                        ungültiger Eingabe
+    """
+    datum = timed_input(
+        f"\033[34mNeues Datum (DD.MM.YYYY, Enter = {eintrag.datum}):"
+        f"\033[0m").strip() or eintrag.datum
+    if not validiere_datum(datum):
+        print("\n\033[31mUngültiges Datum! Bitte verwende das Format "
+              "DD.MM.YYYY (z.B. 01.02.2025)\033[0m")
+        return None
+    art = timed_input(
+        f"\033[34mNeue Art der Kosten (Enter = {eintrag.kostenart}):"
+        f"\033[0m").strip() or eintrag.kostenart
+    if not KOSTENART_MUSTER.match(art):
+        print("\n\033[31mUngültige Kostenart! "
+              "Nur Buchstaben sind erlaubt.\033[0m")
+        return None
+    betrag = timed_input(
+        f"\033[34mNeuer Betrag in CHF (Enter = {eintrag.betrag:.2f}):"
+        f"\033[0m").strip()
+    try:
+        betrag = float(betrag) if betrag else eintrag.betrag
+    except ValueError:
+        print("\n\033[31mAchtung: Ungültiger Betrag.\033[0m")
+        return None
+    if not validiere_positiven_betrag(betrag):
+        return None
+    return eintrag_erstellen(datum, art, betrag)
 
 
 def anzeigen_kategorien(budget_kategorien, timed_input):
@@ -35,34 +254,43 @@ def anzeigen_kategorien(budget_kategorien, timed_input):
                 gewählte_kategorie = kategorien_liste[auswahl]
                 print(f"\n\033[1mKostenübersicht für "
                       f"\033[1m{gewählte_kategorie}\033[0m:")
-                print(f"{'Datum':<15} {'Kostenart':<30} "
-                      f"{'        Betrag (CHF)':>12}")
-                print("-" * 67)
 
-                if not budget_kategorien[gewählte_kategorie]:
+                einträge = budget_kategorien[gewählte_kategorie]
+                if not einträge:
                     print("Keine Einträge vorhanden.")
-                else:
-                    for zeile in budget_kategorien[gewählte_kategorie]:
-                        teile = zeile.split(" - ")
-                        if len(teile) == 3:
-                            datum = teile[0].strip()
-                            kostenart = teile[1].strip()
-                            betrag_str = teile[2].replace("CHF", "").strip()
-                            try:
-                                betrag = float(betrag_str)
-                                print(f"{datum:<15} {kostenart:<35} "
-                                      f"{betrag:>15.2f}")
-                            except ValueError:
-                                print(f"{datum:<15} {kostenart:<35} "
-                                      f"{'Ungültiger Betrag':>15}")
-                        else:
-                            print(f"{'':15} {zeile:<35} {'Formatfehler':>15}")
+                    continue
+
+                zeitraum = zeitraum_eingeben(timed_input)
+                seiten = EintragsSeiten(einträge, zeitraum)
+                if not seiten.anzahl():
+                    print("Keine Einträge im gewählten Zeitraum.")
+                    continue
+                print(f"\nSumme im Zeitraum: "
+                      f"{einträge.zeitraum_summe(*zeitraum):.2f} CHF\n")
+                _einträge_blättern(seiten, timed_input)
             else:
                 print("\n\033[31mAchtung: Ungültige Nummer!\033[0m")
         except ValueError:
             print("\033[31mBitte eine gültige Zahl eingeben. \033[0m")
 
 
+def _einträge_blättern(seiten, timed_input):
+    """
+    Zeigt Einträge seitenweise an, bis der Benutzer zurückkehrt.
+
+    Args:
+        seiten (EintragsSeiten): Seitenansicht der Kategorie
+        timed_input (callable): Input-Funktion mit Timeout
+    """
+    while True:
+        seiten.anzeigen()
+        eingabe = timed_input(f"\033[34m{BEDIENUNG}, 0 = Zurück:\033[0m")
+        if eingabe.strip() == "0":
+            return
+        if not seiten.befehl_ausführen(eingabe):
+            print("\n\033[31mAchtung: Ungültige Eingabe!\033[0m")
+
+
 def neue_kategorie_hinzufügen(budget_kategorien, timed_input):
     """
     Fügt eine neue Budget-Kategorie hinzu.
@@ -94,7 +322,7 @@ def neue_kategorie_hinzufügen(budget_kategorien, timed_input):
                   f"'{neue_kategorie}' existiert bereits.\033[0m")
             continue
         else:
-            budget_kategorien[neue_kategorie] = []
+            kategorie_anlegen(budget_kategorien, neue_kategorie)
             print(f"\n\033[32mKategorie '{neue_kategorie}' "
                   f"wurde erfolgreich hinzugefügt.\033[0m")
             break
@@ -144,6 +372,7 @@ def kategorie_bearbeiten(budget_kategorien, budget_limits, timed_input):
             print("1. Namen ändern")
             print("2. Eintrag hinzufügen")
             print("3. Eintrag löschen")
+            print("4. Eintrag ändern")
             print("")
 
             try:
@@ -172,8 +401,8 @@ def kategorie_bearbeiten(budget_kategorien, budget_limits, timed_input):
                           f"existiert bereits.\033[0m")
                     continue
                 else:
-                    budget_kategorien[neuer_name] = budget_kategorien.pop(
-                        gewählte_kategorie)
+                    kategorie_umbenennen(budget_kategorien,
+                                         gewählte_kategorie, neuer_name)
                     print(f"\n\033[32mKategorie wurde erfolgreich von "
                           f"'{gewählte_kategorie}' zu "
                           f"'{neuer_name}' umbenannt.\033[0m")
@@ -204,7 +433,7 @@ def kategorie_bearbeiten(budget_kategorien, budget_limits, timed_input):
                                 "\n\033[31mDie Kostenart darf nicht leer sein."
                                 "\033[0m")
                             continue
-                        elif not re.match(r'^[A-Za-zÄÖÜäöüß]+$', art):
+                        elif not KOSTENART_MUSTER.match(art):
                             print("\n\033[31mUngültige Kostenart! "
                                   "Nur Buchstaben sind erlaubt.\033[0m")
                             continue
@@ -214,57 +443,61 @@ def kategorie_bearbeiten(budget_kategorien, budget_limits, timed_input):
                             if not validiere_positiven_betrag(betrag):
                                 continue
 
-                            aktuelle_summe = 0
-                            for eintrag in budget_kategorien[gewählte_kategorie]:
-                                teile = eintrag.split(" - ")
-                                if len(teile) == 3:
-                                    try:
-                                        aktuelle_summe += float(
-                                            teile[2].replace(
-                                                "CHF", "").strip())
-                                    except ValueError:
-                                        continue
-
-                            neue_summe = aktuelle_summe + betrag
-                            limit = budget_limits.get(gewählte_kategorie)
-
-                            print(f"\n\033[32mEintrag "
-                                  f"'{datum} - {art} - {betrag} CHF' "
+                            eintrag = eintrag_erstellen(datum, art, betrag)
+                            eintrag_hinzufügen(budget_kategorien,
+                                               gewählte_kategorie, eintrag)
+
+                            print(f"\n\033[32mEintrag '{eintrag}' "
                                   f"wurde erfolgreich hinzugefügt.\033[0m")
-                            if limit is not None and neue_summe > limit:
-                                print(f"\033[31mAchtung: "
-                                      f"Budgetlimit von {limit:.2f} CHF für "
-                                      f"'{gewählte_kategorie}' "
-                                      f"überschritten!\033[0m")
-
-                            budget_kategorien[gewählte_kategorie].append(
-                                f"{datum} - {art} - {betrag} CHF")
+                            _limit_prüfen(budget_kategorien, budget_limits,
+                                          gewählte_kategorie, eintrag)
                             break
                         except ValueError:
                             print("\n\033[31mAchtung: Ungültiger Betrag."
                                   "\033[0m")
                     break
-            # Eintrag löschen
-            elif aktion == 3:
+            # Eintrag löschen oder ändern
+            elif aktion in (3, 4):
                 einträge = budget_kategorien[gewählte_kategorie]
                 if not einträge:
                     print("\n\033[33mKeine Einträge vorhanden!\033[0m")
                     continue
-                print("\n\033[1mAktuelle Einträge:\033[0m")
-                for i, eintrag in enumerate(einträge, start=1):
-                    print(f"{i}. {eintrag}")
-                try:
-                    zu_löschen = int(timed_input(
-                        "\n\033[34mNummer des Eintrags zum Löschen "
-                        "(0 = Zurück):\033[0m"))
-                    if zu_löschen == 0:
+                zweck = "zum Löschen" if aktion == 3 else "zum Ändern"
+                # Nummern beziehen sich auf die angezeigte Seite
+                seiten = EintragsSeiten(einträge)
+                while einträge:
+                    print("\n\033[1mAktuelle Einträge:\033[0m")
+                    seiten.anzeigen()
+                    eingabe = timed_input(
+                        f"\n\033[34mNummer des Eintrags {zweck} "
+                        f"({BEDIENUNG}, 0 = Zurück):\033[0m").strip()
+                    if eingabe == "0":
+                        break
+                    if seiten.befehl_ausführen(eingabe):
+                        continue
+                    try:
+                        position = seiten.position(int(eingabe))
+                    except (ValueError, IndexError):
+                        print("\n\033[31mUngültige Auswahl.\033[0m")
+                        continue
+                    eintrag = einträge[position]
+                    if aktion == 3:
+                        eintrag_löschen(budget_kategorien,
+                                        gewählte_kategorie, eintrag.id)
+                        seiten.eintrag_entfernt(position)
+                        print(f"\n\033[32mEintrag '{eintrag}' wurde "
+                              f"erfolgreich gelöscht.\033[0m")
+                        continue
+                    neu = _neue_werte_eingeben(eintrag, timed_input)
+                    if neu is None:
                         continue
-                    zu_löschen -= 1
-                    gelöscht = einträge.pop(zu_löschen)
-                    print(f"\n\033[32mEintrag '{gelöscht}' wurde "
-                          f"erfolgreich gelöscht.\033[0m")
-                except (ValueError, IndexError):
-                    print("\n\033[31mUngültige Auswahl.\033[0m")
+                    eintrag_ändern(budget_kategorien, gewählte_kategorie,
+                                   eintrag.id, neu)
+                    seiten.eintrag_geändert()
+                    print(f"\n\033[32mEintrag '{eintrag}' wurde zu "
+                          f"'{neu}' geändert.\033[0m")
+                    _limit_prüfen(budget_kategorien, budget_limits,
+                                  gewählte_kategorie, neu)
 
     return budget_kategorien
 
@@ -295,7 +528,7 @@ def kategorie_löschen(budget_kategorien, timed_input):
             index -= 1
             if 0 <= index < len(kategorien_liste):
                 entfernte = kategorien_liste[index]
-                budget_kategorien.pop(entfernte)
+                kategorie_entfernen(budget_kategorien, entfernte)
                 print(
                     f"\n\033[32mKategorie '{entfernte}' wurde "
                     f"erfolgreich gelöscht.\033[0m")
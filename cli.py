@@ -0,0 +1,346 @@
+"""
+Kommandozeilen-Modul für Budget-Tracker
+Enthält den nicht-interaktiven Modus mit Unterbefehlen und Batch-Dateien
+"""
+
+import argparse
+import csv
+import getpass
+import os
+import shlex
+import sys
+
+from auth import passwort_prüfen
+from category_manager import (eintrag_hinzufügen, eintrag_löschen,
+                              eintrag_ändern)
+from csv_import import csv_importieren
+from data_export import (EXPORT_FORMATE, einträge_auswählen,
+                         einträge_exportieren, monats_summen_exportieren)
+from data_handler import (daten_laden, daten_speichern, json_exportieren,
+                          DATEN_DATEI)
+from entry_model import eintrag_erstellen
+from finance_control import limit_setzen, ziel_setzen
+from journal import offene_änderungen_vorhanden
+from utils import (validiere_datum, betrag_fehler, KOSTENART_MUSTER,
+                   MAX_BUDGET_LIMIT)
+
+
+# Umgebungsvariable mit dem Passwort für den Batch-Modus;
+# ohne Angabe wird einmal danach gefragt
+PASSWORT_VARIABLE = "BUDGET_PASSWORT"
+
+
+class BefehlsFehler(Exception):
+    """Ungültiger Befehl oder ungültige Argumente."""
+
+
+class _Parser(argparse.ArgumentParser):
+    """ArgumentParser, der bei Fehlern nicht das Programm beendet."""
+
+    def error(self, message):
+        raise BefehlsFehler(message)
+
+
+def cli_ausführen(argumente):
+    """
+    Führt einen Unterbefehl oder eine Batch-Datei aus. Die Daten werden
+    einmal geladen, das Passwort einmal geprüft und Änderungen am Ende
+    einmal gespeichert.
+
+    Args:
+        argumente (list): Kommandozeilen-Argumente ohne Programmnamen
+
+    Returns:
+        int: Exit-Code (0 = Erfolg, 1 = fehlgeschlagene Befehle,
+             2 = ungültiger Aufruf oder falsches Passwort)
+    """
+    parser = _parser_erstellen(mit_batch=True)
+    try:
+        args = parser.parse_args(argumente)
+    except BefehlsFehler as e:
+        parser.print_usage(sys.stderr)
+        print(f"Fehler: {e}", file=sys.stderr)
+        return 2
+
+    daten = daten_laden()
+    passwort = os.environ.get(PASSWORT_VARIABLE)
+    if passwort is None:
+        passwort = getpass.getpass("Passwort: ")
+    if not passwort_prüfen(daten[3], passwort):
+        print("Fehler: Falsches Passwort.", file=sys.stderr)
+        return 2
+
+    if args.befehl == "serve":
+        # Erst hier importiert, damit der Server den Start nicht bremst
+        from server import server_starten
+        server_starten(daten, args.host, args.port)
+        return 0
+    if args.befehl == "batch":
+        fehler = batch_ausführen(daten, args.datei)
+    else:
+        fehler = 0
+        try:
+            args.ausführen(daten, args)
+        except (BefehlsFehler, OSError, ValueError, csv.Error) as e:
+            print(f"Fehler: {e}", file=sys.stderr)
+            fehler = 1
+
+    if offene_änderungen_vorhanden():
+        daten_speichern(*daten)
+    return 1 if fehler else 0
+
+
+def batch_ausführen(daten, pfad):
+    """
+    Führt die Befehle einer Batch-Datei nacheinander aus, eine Zeile
+    pro Befehl (Syntax wie auf der Kommandozeile, "#" für Kommentare).
+    Fehlerhafte Zeilen werden gemeldet und übersprungen.
+
+    Args:
+        daten (tuple): (budget_kategorien, budget_limits, finanzziele,
+                        benutzer_passwort)
+        pfad (str): Pfad zur Batch-Datei oder "-" für stdin
+
+    Returns:
+        int: Anzahl fehlgeschlagener Zeilen
+    """
+    parser = _parser_erstellen(mit_batch=False)
+    datei = (sys.stdin if pfad == "-"
+             else open(pfad, "r", encoding="utf-8"))
+    ausgeführt = 0
+    fehler = 0
+    with datei:
+        for zeilennummer, zeile in enumerate(datei, start=1):
+            try:
+                teile = shlex.split(zeile, comments=True)
+                if not teile:
+                    continue
+                args = parser.parse_args(teile)
+                args.ausführen(daten, args)
+                ausgeführt += 1
+            except (BefehlsFehler, OSError, ValueError, csv.Error) as e:
+                print(f"Zeile {zeilennummer}: {e}", file=sys.stderr)
+                fehler += 1
+
+    print(f"{ausgeführt} Befehle ausgeführt, {fehler} fehlgeschlagen.",
+          file=sys.stderr)
+    return fehler
+
+
+def _parser_erstellen(mit_batch):
+    """Erstellt den Parser mit allen Unterbefehlen."""
+    parser = _Parser(
+        prog="main.py",
+        description="Budget-Tracker ohne Menü. Ohne Argumente startet "
+                    "das interaktive Hauptmenü.")
+    befehle = parser.add_subparsers(dest="befehl", required=True)
+
+    befehl = befehle.add_parser("add-entry", help="Eintrag hinzufügen")
+    befehl.add_argument("kategorie")
+    befehl.add_argument("datum", help="DD.MM.YYYY")
+    befehl.add_argument("kostenart")
+    befehl.add_argument("betrag", type=float)
+    befehl.set_defaults(ausführen=_eintrag_hinzufügen)
+
+    befehl = befehle.add_parser("edit-entry", help="Eintrag ändern")
+    befehl.add_argument("kategorie")
+    befehl.add_argument("id", type=int, help="ID aus list")
+    befehl.add_argument("--datum", help="Neues Datum (DD.MM.YYYY)")
+    befehl.add_argument("--kostenart", help="Neue Kostenart")
+    befehl.add_argument("--betrag", type=float, help="Neuer Betrag")
+    befehl.set_defaults(ausführen=_eintrag_ändern)
+
+    befehl = befehle.add_parser("delete-entry", help="Einträge löschen")
+    befehl.add_argument("kategorie")
+    befehl.add_argument("ids", type=int, nargs="+", metavar="id",
+                        help="IDs aus list")
+    befehl.set_defaults(ausführen=_einträge_löschen)
+
+    befehl = befehle.add_parser("list", help="Einträge anzeigen")
+    _filter_hinzufügen(befehl)
+    befehl.set_defaults(ausführen=_einträge_anzeigen)
+
+    befehl = befehle.add_parser("set-limit", help="Budgetlimit setzen")
+    befehl.add_argument("kategorie")
+    befehl.add_argument("limit", type=float)
+    befehl.set_defaults(ausführen=_limit_setzen)
+
+    befehl = befehle.add_parser("set-goal", help="Finanzziel setzen")
+    befehl.add_argument("kategorie")
+    befehl.add_argument("ziel", type=float)
+    befehl.add_argument("--meldung", default="",
+                        help="Meldung bei Zielerreichung")
+    befehl.set_defaults(ausführen=_ziel_setzen)
+
+    befehl = befehle.add_parser("report",
+                                help="Monatssummen pro Kategorie ausgeben")
+    _filter_hinzufügen(befehl)
+    _ausgabe_hinzufügen(befehl)
+    befehl.set_defaults(ausführen=_bericht_ausgeben)
+
+    befehl = befehle.add_parser("export", help="Einträge exportieren")
+    _filter_hinzufügen(befehl)
+    _ausgabe_hinzufügen(befehl)
+    befehl.set_defaults(ausführen=_einträge_exportieren)
+
+    befehl = befehle.add_parser(
+        "json-export", help="Alle Daten als JSON-Datei exportieren")
+    befehl.add_argument("--ausgabe", default=DATEN_DATEI)
+    befehl.set_defaults(ausführen=_json_exportieren)
+
+    befehl = befehle.add_parser("import", help="CSV-Datei importieren")
+    befehl.add_argument("datei")
+    befehl.add_argument("--kategorie",
+                        help="Kategorie für Zeilen ohne Kategorie-Spalte")
+    befehl.add_argument("--trennzeichen")
+    befehl.set_defaults(ausführen=_csv_importieren)
+
+    if mit_batch:
+        befehl = befehle.add_parser(
+            "batch", help="Befehle aus einer Datei ausführen")
+        befehl.add_argument("datei", help='Batch-Datei oder "-" für stdin')
+
+        befehl = befehle.add_parser(
+            "serve", help="Lokale HTTP/JSON-Schnittstelle starten")
+        befehl.add_argument("--host", default="127.0.0.1",
+                            help="Adresse (Standard: nur lokal)")
+        befehl.add_argument("--port", type=int, default=8765)
+    return parser
+
+
+def _filter_hinzufügen(befehl):
+    befehl.add_argument("--kategorie", action="append", dest="kategorien",
+                        help="Nur diese Kategorie (mehrfach möglich)")
+    befehl.add_argument("--von", help="Erstes Datum (DD.MM.YYYY)")
+    befehl.add_argument("--bis", help="Letztes Datum (DD.MM.YYYY)")
+
+
+def _ausgabe_hinzufügen(befehl):
+    befehl.add_argument("--format", dest="export_format", default="csv",
+                        choices=EXPORT_FORMATE)
+    befehl.add_argument("--ausgabe", default="-",
+                        help='Zieldatei oder "-" für stdout (Standard)')
+
+
+def _kategorie_prüfen(budget_kategorien, kategorie):
+    if kategorie not in budget_kategorien:
+        raise BefehlsFehler(f"Kategorie '{kategorie}' existiert nicht.")
+
+
+def _betrag_prüfen(betrag, max_wert=None):
+    fehler = betrag_fehler(betrag, max_wert)
+    if fehler is not None:
+        raise BefehlsFehler(fehler)
+
+
+def _filter_prüfen(args):
+    for datum in (args.von, args.bis):
+        if datum and not validiere_datum(datum):
+            raise BefehlsFehler(f"Ungültiges Datum '{datum}' "
+                                "(Format DD.MM.YYYY).")
+
+
+def _eintrag_prüfen(datum, kostenart, betrag):
+    if not validiere_datum(datum):
+        raise BefehlsFehler(f"Ungültiges Datum '{datum}' "
+                            "(Format DD.MM.YYYY).")
+    if not KOSTENART_MUSTER.match(kostenart):
+        raise BefehlsFehler(f"Ungültige Kostenart '{kostenart}' "
+                            "(nur Buchstaben).")
+    _betrag_prüfen(betrag)
+    return eintrag_erstellen(datum, kostenart, betrag)
+
+
+def _limit_warnen(daten, kategorie, eintrag):
+    limit = daten[1].get(kategorie)
+    einträge = daten[0][kategorie]
+    if limit is not None and einträge.monats_summe(eintrag.monat) > limit:
+        print(f"Warnung: Budgetlimit von {limit:.2f} CHF für "
+              f"'{kategorie}' im Monat {eintrag.datum[3:]} "
+              "überschritten.", file=sys.stderr)
+
+
+def _eintrag_suchen(einträge, kategorie, eintrag_id):
+    try:
+        return einträge.nach_id(eintrag_id)
+    except KeyError:
+        raise BefehlsFehler(f"Kein Eintrag mit ID {eintrag_id} in "
+                            f"'{kategorie}'.") from None
+
+
+def _eintrag_hinzufügen(daten, args):
+    _kategorie_prüfen(daten[0], args.kategorie)
+    eintrag = _eintrag_prüfen(args.datum, args.kostenart, args.betrag)
+    eintrag_hinzufügen(daten[0], args.kategorie, eintrag)
+    _limit_warnen(daten, args.kategorie, eintrag)
+
+
+def _eintrag_ändern(daten, args):
+    _kategorie_prüfen(daten[0], args.kategorie)
+    alter = _eintrag_suchen(daten[0][args.kategorie], args.kategorie,
+                            args.id)
+    eintrag = _eintrag_prüfen(
+        alter.datum if args.datum is None else args.datum,
+        alter.kostenart if args.kostenart is None else args.kostenart,
+        alter.betrag if args.betrag is None else args.betrag)
+    eintrag_ändern(daten[0], args.kategorie, args.id, eintrag)
+    _limit_warnen(daten, args.kategorie, eintrag)
+
+
+def _einträge_löschen(daten, args):
+    _kategorie_prüfen(daten[0], args.kategorie)
+    # Erst alle IDs prüfen, damit ein Tippfehler nichts halb löscht
+    ids = list(dict.fromkeys(args.ids))
+    for eintrag_id in ids:
+        _eintrag_suchen(daten[0][args.kategorie], args.kategorie,
+                        eintrag_id)
+    for eintrag_id in ids:
+        eintrag_löschen(daten[0], args.kategorie, eintrag_id)
+
+
+def _einträge_anzeigen(daten, args):
+    _filter_prüfen(args)
+    for kategorie, block in einträge_auswählen(
+            daten[0], args.von, args.bis, args.kategorien):
+        sys.stdout.writelines(
+            f"{kategorie:<15} {eintrag.id:>8} {eintrag.datum:<12} "
+            f"{eintrag.kostenart:<30} {eintrag.betrag:>12.2f}\n"
+            for eintrag in block)
+
+
+def _limit_setzen(daten, args):
+    _kategorie_prüfen(daten[0], args.kategorie)
+    _betrag_prüfen(args.limit, MAX_BUDGET_LIMIT)
+    limit_setzen(daten[1], args.kategorie, args.limit)
+
+
+def _ziel_setzen(daten, args):
+    _kategorie_prüfen(daten[0], args.kategorie)
+    _betrag_prüfen(args.ziel)
+    ziel_setzen(daten[2], args.kategorie, args.ziel, args.meldung)
+
+
+def _bericht_ausgeben(daten, args):
+    _filter_prüfen(args)
+    monats_summen_exportieren(args.ausgabe, daten[0], daten[1],
+                              args.export_format, args.von, args.bis,
+                              args.kategorien)
+
+
+def _einträge_exportieren(daten, args):
+    _filter_prüfen(args)
+    einträge_exportieren(args.ausgabe, daten[0], args.export_format,
+                         args.von, args.bis, args.kategorien)
+
+
+def _json_exportieren(daten, args):
+    json_exportieren(args.ausgabe, *daten)
+
+
+def _csv_importieren(daten, args):
+    if args.kategorie is not None:
+        _kategorie_prüfen(daten[0], args.kategorie)
+    bericht = csv_importieren(args.datei, daten[0],
+                              standard_kategorie=args.kategorie,
+                              trennzeichen=args.trennzeichen)
+    bericht.ausgeben()
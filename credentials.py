@@ -0,0 +1,236 @@
+"""
+Zugangsdaten-Modul für Budget-Tracker
+Enthält Passwort-Hashing, den Standard-Passwort-Hash und die
+Kalibrierung der bcrypt-Kosten
+"""
+
+import base64
+import os
+import sys
+import time
+from functools import lru_cache
+
+from tracing import gemessen
+
+try:
+    import bcrypt
+except ImportError:
+    print("\n\033[31mFehler: Das Paket 'bcrypt' ist erforderlich, "
+          "aber nicht installiert.\033[0m")
+    print("\n\033[32mInstalliere es mit: pip install bcrypt\033[0m")
+    sys.exit(1)
+
+
+STANDARD_PASSWORT = "Test1234!"
+
+# bcrypt-Kosten: Zahl (z.B. "12"), "auto" für eine Kalibrierung auf
+# ZIEL_LATENZ, deren Ergebnis neben dem Hash gespeichert und danach
+# wiederverwendet wird, oder "kalibrieren", um neu zu messen; ohne
+# Angabe gilt STANDARD_KOSTEN
+STANDARD_KOSTEN = 12
+ZIEL_LATENZ = 0.25
+MIN_KOSTEN = 10
+MAX_KOSTEN = 16
+
+
+def _kosten_konfiguration_lesen(text):
+    """
+    Liest die Einstellung BUDGET_BCRYPT_KOSTEN. Ungültige Werte werden
+    gemeldet und durch STANDARD_KOSTEN ersetzt, damit ein Tippfehler
+    nicht jede Anmeldung scheitern lässt.
+
+    Args:
+        text (str): Wert der Umgebungsvariable
+
+    Returns:
+        int | str: Kosten zwischen MIN_KOSTEN und MAX_KOSTEN oder
+                   "auto" bzw. "kalibrieren"
+    """
+    text = text.strip()
+    if text in ("auto", "kalibrieren"):
+        return text
+    if not text:
+        return STANDARD_KOSTEN
+    try:
+        return min(max(int(text), MIN_KOSTEN), MAX_KOSTEN)
+    except ValueError:
+        print(f"\n\033[33mUngültiger Wert für BUDGET_BCRYPT_KOSTEN: "
+              f"{text!r}, verwende {STANDARD_KOSTEN}.\033[0m")
+        return STANDARD_KOSTEN
+
+
+KOSTEN_KONFIGURATION = _kosten_konfiguration_lesen(
+    os.environ.get("BUDGET_BCRYPT_KOSTEN", ""))
+
+
+@gemessen
+def hash_passwort(passwort, kosten=None):
+    """
+    Hasht ein Passwort mit bcrypt für sichere Speicherung.
+
+    Args:
+        passwort (str): Das zu hashende Passwort
+        kosten (int, optional): bcrypt-Kosten, sonst die konfigurierten
+
+    Returns:
+        str: Der gehashte Passwort-String
+        (base64-kodiert für JSON-Kompatibilität)
+    """
+    if kosten is None:
+        kosten = konfigurierte_kosten()
+    salt = bcrypt.gensalt(rounds=kosten)
+    hashed = bcrypt.hashpw(passwort.encode('utf-8'), salt)
+    return base64.b64encode(hashed).decode('utf-8')
+
+
+@gemessen
+def verifiziere_passwort(passwort, hashed_passwort):
+    """
+    Vergleicht ein eingegebenes Passwort mit einem gehashten Passwort.
+
+    Args:
+        passwort (str): Das zu verifizierende Passwort
+        hashed_passwort (str): Der gehashte Passwort-String (base64-kodiert)
+
+    Returns:
+        bool: True wenn Passwort korrekt ist, False sonst
+    """
+    try:
+        hashed_bytes = base64.b64decode(hashed_passwort.encode('utf-8'))
+        return bcrypt.checkpw(passwort.encode('utf-8'), hashed_bytes)
+    except Exception:
+        return False
+
+
+@lru_cache(maxsize=None)
+def standard_passwort_hash():
+    """
+    Liefert den Hash des Standard-Passworts. Er wird erst bei Bedarf
+    und pro Programmlauf höchstens einmal berechnet.
+
+    Returns:
+        str: Gehashtes Standard-Passwort (base64-kodiert)
+    """
+    return hash_passwort(STANDARD_PASSWORT)
+
+
+def hash_kosten(hashed_passwort):
+    """
+    Liest die bcrypt-Kosten aus einem gespeicherten Hash.
+
+    Args:
+        hashed_passwort (str): Der gehashte Passwort-String (base64-kodiert)
+
+    Returns:
+        int | None: Kosten des Hashes oder None bei ungültigem Format
+    """
+    try:
+        hashed = base64.b64decode(hashed_passwort.encode('utf-8'))
+        return int(hashed.split(b"$")[2])
+    except (ValueError, IndexError):
+        return None
+
+
+def konfigurierte_kosten(benutzer_passwort=None):
+    """
+    Liefert die zu verwendenden bcrypt-Kosten gemäss Konfiguration.
+    Mit "auto" gelten die in benutzer_passwort gespeicherten
+    kalibrierten Kosten; gemessen wird nur, wenn noch keine
+    gespeichert sind oder "kalibrieren" konfiguriert ist, und pro
+    Programmlauf höchstens einmal.
+
+    Args:
+        benutzer_passwort (dict, optional): Gespeicherte Zugangsdaten
+
+    Returns:
+        int: bcrypt-Kosten
+    """
+    if _kosten_kalibriert():
+        gespeichert = _gespeicherte_kosten(benutzer_passwort)
+        if gespeichert is not None and KOSTEN_KONFIGURATION == "auto":
+            return gespeichert
+        return _gemessene_kosten()
+    return KOSTEN_KONFIGURATION
+
+
+def _kosten_kalibriert():
+    return KOSTEN_KONFIGURATION in ("auto", "kalibrieren")
+
+
+def _gespeicherte_kosten(benutzer_passwort):
+    # SQLite speichert die Zugangsdaten als Text
+    try:
+        return int((benutzer_passwort or {})["kosten"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=None)
+def _gemessene_kosten():
+    return kosten_kalibrieren()
+
+
+def kosten_kalibrieren(ziel_latenz=ZIEL_LATENZ, mess_kosten=8):
+    """
+    Misst bcrypt.hashpw auf diesem Rechner und wählt die höchsten
+    Kosten, deren Prüfdauer die Ziel-Latenz nicht überschreitet.
+    Jede zusätzliche Kostenstufe verdoppelt die Rechenzeit.
+
+    Args:
+        ziel_latenz (float): Gewünschte Dauer einer Prüfung in Sekunden
+        mess_kosten (int): Kosten für die Referenzmessung
+
+    Returns:
+        int: Gewählte Kosten zwischen MIN_KOSTEN und MAX_KOSTEN
+    """
+    salt = bcrypt.gensalt(rounds=mess_kosten)
+    start = time.perf_counter()
+    bcrypt.hashpw(b"kalibrierung", salt)
+    dauer = time.perf_counter() - start
+
+    kosten = mess_kosten
+    while kosten < MAX_KOSTEN and dauer * 2 <= ziel_latenz:
+        dauer *= 2
+        kosten += 1
+    return max(kosten, MIN_KOSTEN)
+
+
+def neu_hashen_nötig(hashed_passwort, benutzer_passwort=None):
+    """
+    Prüft, ob ein gespeicherter Hash mit anderen als den
+    konfigurierten Kosten erstellt wurde oder kalibrierte Kosten noch
+    nicht neben dem Hash gespeichert sind.
+
+    Args:
+        hashed_passwort (str): Der gehashte Passwort-String (base64-kodiert)
+        benutzer_passwort (dict, optional): Gespeicherte Zugangsdaten
+
+    Returns:
+        bool: True wenn der Hash neu erstellt werden sollte
+    """
+    kosten = konfigurierte_kosten(benutzer_passwort)
+    if hash_kosten(hashed_passwort) != kosten:
+        return True
+    return (_kosten_kalibriert() and benutzer_passwort is not None
+            and _gespeicherte_kosten(benutzer_passwort) != kosten)
+
+
+def passwort_felder(passwort, benutzer_passwort=None):
+    """
+    Hasht ein Passwort mit den konfigurierten Kosten und liefert die
+    zu speichernden Zugangsdaten. Kalibrierte Kosten werden neben dem
+    Hash gespeichert, damit spätere Programmläufe nicht neu messen.
+
+    Args:
+        passwort (str): Das zu hashende Passwort
+        benutzer_passwort (dict, optional): Gespeicherte Zugangsdaten
+
+    Returns:
+        dict: {"passwort": Hash} und bei "auto"/"kalibrieren"
+              zusätzlich {"kosten": int}
+    """
+    kosten = konfigurierte_kosten(benutzer_passwort)
+    felder = {"passwort": hash_passwort(passwort, kosten)}
+    if _kosten_kalibriert():
+        felder["kosten"] = kosten
+    return felder
@@ -0,0 +1,324 @@
+"""
+Import-Modul für Budget-Tracker
+Enthält den blockweisen CSV-Import von Bank- und Kontoauszügen
+"""
+
+import csv
+import math
+import os
+from collections import Counter
+from itertools import islice
+
+from category_manager import einträge_hinzufügen
+from entry_model import Eintrag, datum_als_tag, MAX_BETRAG
+from utils import KOSTENART_MUSTER, validiere_datum
+
+
+# Anzahl Zeilen, die gemeinsam geprüft und übernommen werden
+BLOCK_GRÖSSE = 5000
+
+# Anzahl abgelehnter Zeilen, die im Bericht einzeln aufgeführt werden
+MAX_BEISPIELE = 10
+
+# Erwartete Spalten (Gross-/Kleinschreibung egal);
+# die Kategorie-Spalte ist optional
+SPALTE_DATUM = "datum"
+SPALTE_KOSTENART = "kostenart"
+SPALTE_BETRAG = "betrag"
+SPALTE_KATEGORIE = "kategorie"
+
+
+class ImportBericht:
+    """
+    Sammelt das Ergebnis eines Imports. Abgelehnte Zeilen werden nur
+    gezählt und bis MAX_BEISPIELE aufgeführt, damit der Bericht auch
+    bei sehr grossen Dateien klein bleibt.
+
+    Attributes:
+        übernommen (Counter): Übernommene Einträge pro Kategorie
+        duplikate (int): Anzahl übersprungener Duplikate
+        abgelehnt (Counter): Abgelehnte Zeilen pro Grund
+        beispiele (list): (Zeilennummer, Grund, Zeile) der ersten
+                          abgelehnten Zeilen
+    """
+
+    def __init__(self):
+        self.übernommen = Counter()
+        self.duplikate = 0
+        self.abgelehnt = Counter()
+        self.beispiele = []
+
+    def ablehnen(self, zeilennummer, grund, zeile):
+        """Zählt eine abgelehnte Zeile."""
+        self.abgelehnt[grund] += 1
+        if len(self.beispiele) < MAX_BEISPIELE:
+            self.beispiele.append((zeilennummer, grund, zeile))
+
+    def ausgeben(self):
+        """Gibt den Bericht auf der Konsole aus."""
+        print(f"\n\033[1mImport abgeschlossen:\033[0m "
+              f"{sum(self.übernommen.values())} Einträge übernommen, "
+              f"{self.duplikate} Duplikate übersprungen, "
+              f"{sum(self.abgelehnt.values())} Zeilen abgelehnt.")
+        for kategorie, anzahl in self.übernommen.items():
+            print(f"  {kategorie}: {anzahl}")
+        if self.abgelehnt:
+            print("\n\033[33mAbgelehnte Zeilen:\033[0m")
+            for grund, anzahl in self.abgelehnt.most_common():
+                print(f"  {grund}: {anzahl}")
+            for zeilennummer, grund, zeile in self.beispiele:
+                print(f"  Zeile {zeilennummer} ({grund}): "
+                      f"{';'.join(zeile)}")
+
+
+def csv_zeilen(datei, trennzeichen=None):
+    """
+    Liest eine CSV-Datei zeilenweise. Die erste Zeile enthält die
+    Spaltennamen; das Trennzeichen wird ohne Angabe erkannt.
+
+    Args:
+        datei (file): Geöffnete Textdatei (newline="")
+        trennzeichen (str, optional): Trennzeichen der Spalten
+
+    Yields:
+        tuple: (Zeilennummer, Datum, Kostenart, Betrag, Kategorie, Zeile)
+               als Rohtexte; Kategorie ist None ohne Kategorie-Spalte
+
+    Raises:
+        ValueError: Wenn eine Pflichtspalte fehlt
+    """
+    if trennzeichen is None:
+        probe = datei.read(4096)
+        datei.seek(0)
+        try:
+            trennzeichen = csv.Sniffer().sniff(probe, ",;\t").delimiter
+        except csv.Error:
+            trennzeichen = ";"
+
+    leser = csv.reader(datei, delimiter=trennzeichen)
+    kopf = [name.strip().lower() for name in next(leser, [])]
+    for spalte in (SPALTE_DATUM, SPALTE_KOSTENART, SPALTE_BETRAG):
+        if spalte not in kopf:
+            raise ValueError(f"Spalte '{spalte}' fehlt in der CSV-Datei.")
+    i_datum = kopf.index(SPALTE_DATUM)
+    i_art = kopf.index(SPALTE_KOSTENART)
+    i_betrag = kopf.index(SPALTE_BETRAG)
+    i_kategorie = (kopf.index(SPALTE_KATEGORIE)
+                   if SPALTE_KATEGORIE in kopf else None)
+    breite = max(i_datum, i_art, i_betrag, i_kategorie or 0) + 1
+
+    for zeile in leser:
+        if not zeile:
+            continue
+        if len(zeile) < breite:
+            yield leser.line_num, None, None, None, None, zeile
+            continue
+        kategorie = zeile[i_kategorie] if i_kategorie is not None else None
+        yield (leser.line_num, zeile[i_datum], zeile[i_art],
+               zeile[i_betrag], kategorie, zeile)
+
+
+def in_blöcken(zeilen, grösse=BLOCK_GRÖSSE):
+    """
+    Fasst einen Zeilen-Strom in Listen fester Grösse zusammen.
+
+    Args:
+        zeilen (iterable): Beliebiger Strom von Zeilen
+        grösse (int): Maximale Anzahl Zeilen pro Block
+
+    Yields:
+        list: Nächster Block
+    """
+    zeilen = iter(zeilen)
+    while True:
+        block = list(islice(zeilen, grösse))
+        if not block:
+            return
+        yield block
+
+
+def betrag_lesen(text):
+    """
+    Liest einen Betrag aus einem Kontoauszug (z.B. "1'234.50" oder
+    "12,90").
+
+    Args:
+        text (str): Betrag als Text
+
+    Returns:
+        float: Auf Rappen gerundeter Betrag
+
+    Raises:
+        ValueError: Wenn der Text keine Zahl ist oder der Betrag
+                    MAX_BETRAG übersteigt
+    """
+    text = text.strip().replace("'", "").replace("CHF", "").strip()
+    if "," in text and "." not in text:
+        text = text.replace(",", ".")
+    betrag = float(text)
+    if not math.isfinite(betrag) or abs(betrag) > MAX_BETRAG:
+        raise ValueError(f"Ungültiger Betrag: {text!r}")
+    return round(betrag, 2)
+
+
+def block_prüfen(block,
+                 budget_kategorien,
+                 bekannte_einträge,
+                 bericht,
+                 zuordnung=None,
+                 standard_kategorie=None):
+    """
+    Prüft einen Block mit denselben Regeln wie die Eingabe im Menü
+    (Datum DD.MM.YYYY, Kostenart nur Buchstaben, Betrag nicht negativ),
+    ordnet die Zeilen Kategorien zu und verwirft Duplikate.
+
+    Args:
+        block (list): Zeilen aus csv_zeilen
+        budget_kategorien (dict): Dictionary mit allen Kategorien
+        bekannte_einträge (dict): Kategorie -> Menge bekannter
+                                  (Tag, Kostenart, Betrag); wird ergänzt
+        bericht (ImportBericht): Sammelt Duplikate und Ablehnungen
+        zuordnung (dict, optional): Kostenart -> Kategorie
+        standard_kategorie (str, optional): Kategorie für alle übrigen
+                                            Zeilen
+
+    Returns:
+        dict: Kategorie -> Liste neuer Eintrag-Objekte
+    """
+    neue_einträge = {}
+    for zeilennummer, datum, art, betrag_text, kategorie, zeile in block:
+        if datum is None:
+            bericht.ablehnen(zeilennummer, "Fehlende Spalten", zeile)
+            continue
+
+        art = art.strip()
+        kategorie = ((kategorie or "").strip()
+                     or (zuordnung or {}).get(art)
+                     or standard_kategorie)
+        if kategorie not in budget_kategorien:
+            bericht.ablehnen(zeilennummer, "Unbekannte Kategorie", zeile)
+            continue
+        datum = datum.strip()
+        if not validiere_datum(datum):
+            bericht.ablehnen(zeilennummer, "Ungültiges Datum", zeile)
+            continue
+        tag = datum_als_tag(datum)
+        if not art:
+            bericht.ablehnen(zeilennummer, "Leere Kostenart", zeile)
+            continue
+        if not KOSTENART_MUSTER.match(art):
+            bericht.ablehnen(zeilennummer, "Ungültige Kostenart", zeile)
+            continue
+        try:
+            betrag = betrag_lesen(betrag_text)
+        except ValueError:
+            bericht.ablehnen(zeilennummer, "Ungültiger Betrag", zeile)
+            continue
+        if betrag < 0:
+            bericht.ablehnen(zeilennummer, "Negativer Betrag", zeile)
+            continue
+
+        bekannt = bekannte_einträge.get(kategorie)
+        if bekannt is None:
+            bekannt = bekannte_einträge[kategorie] = {
+                (e.tag, e.kostenart, e.betrag)
+                for e in budget_kategorien[kategorie]}
+        schlüssel = (tag, art, betrag)
+        if schlüssel in bekannt:
+            bericht.duplikate += 1
+            continue
+        bekannt.add(schlüssel)
+        neue_einträge.setdefault(kategorie, []).append(
+            Eintrag(tag, art, betrag))
+    return neue_einträge
+
+
+def csv_importieren(pfad,
+                    budget_kategorien,
+                    zuordnung=None,
+                    standard_kategorie=None,
+                    trennzeichen=None,
+                    block_grösse=BLOCK_GRÖSSE):
+    """
+    Importiert eine CSV-Datei blockweise in die Kategorien.
+    Es liegt immer nur ein Block im Speicher; gespeichert wird
+    nicht hier, sondern einmal durch den Aufrufer.
+
+    Args:
+        pfad (str): Pfad zur CSV-Datei
+        budget_kategorien (dict): Dictionary mit allen Kategorien
+        zuordnung (dict, optional): Kostenart -> Kategorie
+        standard_kategorie (str, optional): Kategorie für Zeilen ohne
+                                            Kategorie-Spalte und Zuordnung
+        trennzeichen (str, optional): Trennzeichen der Spalten
+        block_grösse (int): Anzahl Zeilen pro Block
+
+    Returns:
+        ImportBericht: Ergebnis des Imports
+
+    Raises:
+        OSError: Wenn die Datei nicht gelesen werden kann
+        ValueError: Wenn eine Pflichtspalte fehlt
+    """
+    bericht = ImportBericht()
+    bekannte_einträge = {}
+    with open(pfad, "r", encoding="utf-8-sig", newline="") as datei:
+        for block in in_blöcken(csv_zeilen(datei, trennzeichen),
+                                block_grösse):
+            neue_einträge = block_prüfen(block,
+                                         budget_kategorien,
+                                         bekannte_einträge,
+                                         bericht,
+                                         zuordnung,
+                                         standard_kategorie)
+            for kategorie, einträge in neue_einträge.items():
+                einträge_hinzufügen(budget_kategorien, kategorie, einträge)
+                bericht.übernommen[kategorie] += len(einträge)
+    return bericht
+
+
+def csv_import_menü(budget_kategorien, timed_input, daten_speichern_func):
+    """
+    Fragt Datei und Standard-Kategorie ab, importiert die Datei und
+    speichert einmal am Ende.
+
+    Args:
+        budget_kategorien (dict): Dictionary mit allen Kategorien
+        timed_input (callable): Input-Funktion mit Timeout
+        daten_speichern_func (callable): Funktion zum Speichern der Daten
+    """
+    pfad = timed_input(
+        "\n\033[34mPfad zur CSV-Datei (Spalten Datum, Kostenart, Betrag "
+        "und optional Kategorie, 0 = Zurück):\033[0m").strip()
+    if pfad == "0":
+        return
+    if not os.path.isfile(pfad):
+        print(f"\n\033[31mDatei '{pfad}' nicht gefunden.\033[0m")
+        return
+
+    print("\n\033[1mKategorie für Zeilen ohne Kategorie-Spalte:\033[0m")
+    kategorien_liste = list(budget_kategorien.keys())
+    for i, kategorie in enumerate(kategorien_liste, start=1):
+        print(f"{i}. {kategorie}")
+    auswahl = timed_input(
+        "\n\033[34mNummer der Kategorie (Enter = keine):\033[0m").strip()
+    standard_kategorie = None
+    if auswahl:
+        nummer = int(auswahl) if auswahl.isdigit() else 0
+        if not 1 <= nummer <= len(kategorien_liste):
+            print("\n\033[31mUngültige Auswahl.\033[0m")
+            return
+        standard_kategorie = kategorien_liste[nummer - 1]
+
+    try:
+        bericht = csv_importieren(pfad, budget_kategorien,
+                                  standard_kategorie=standard_kategorie)
+    except (OSError, ValueError, csv.Error) as e:
+        # Bereits übernommene Blöcke bleiben protokolliert erhalten
+        print(f"\n\033[31mImport abgebrochen: {e}\033[0m")
+        daten_speichern_func()
+        return
+
+    bericht.ausgeben()
+    if bericht.übernommen:
+        daten_speichern_func()
@@ -0,0 +1,355 @@
+"""
+Export-Modul für Budget-Tracker
+Enthält den Export von Einträgen und Monatssummen als CSV oder JSONL
+"""
+
+import csv
+import io
+import json
+import sys
+
+from entry_model import datum_als_tag, tag_als_datum, betrag_als_text
+from statistic import monats_summen_pro_kategorie_mit_limits
+from utils import validiere_datum
+
+
+EXPORT_FORMATE = ("csv", "jsonl")
+
+EINTRAG_SPALTEN = ("Kategorie", "Datum", "Kostenart", "Betrag")
+MONATS_SPALTEN = ("Kategorie", "Monat", "Summe", "Limit", "Farbe")
+
+# Anzahl Einträge, die gemeinsam formatiert und geschrieben werden
+BLOCK_GRÖSSE = 10000
+
+# Maximale Anzahl zwischengespeicherter Texte pro Feld
+MAX_TEXTE = 100000
+
+
+class _Texte(dict):
+    """
+    Merkt sich formatierte Texte wiederkehrender Werte (Daten,
+    Kostenarten, Beträge). Beim Erreichen von MAX_TEXTE wird geleert,
+    damit der Speicherbedarf begrenzt bleibt.
+    """
+
+    def __init__(self, formatieren):
+        super().__init__()
+        self._formatieren = formatieren
+
+    def __missing__(self, wert):
+        if len(self) >= MAX_TEXTE:
+            self.clear()
+        text = self[wert] = self._formatieren(wert)
+        return text
+
+
+def _csv_feld(wert):
+    """Setzt ein CSV-Feld nur bei Bedarf in Anführungszeichen."""
+    puffer = io.StringIO()
+    csv.writer(puffer, lineterminator="").writerow([wert])
+    return puffer.getvalue()
+
+
+def _json_feld(wert):
+    return json.dumps(wert, ensure_ascii=False)
+
+
+def einträge_auswählen(budget_kategorien, von=None, bis=None,
+                       kategorien=None, block_grösse=BLOCK_GRÖSSE):
+    """
+    Liefert die Einträge gefiltert nach Zeitraum und Kategorien
+    in Blöcken, ohne den Datenbestand zu kopieren. Der Zeitraum wird
+    per bisect in den nach Datum sortierten Kategorien gesucht.
+
+    Args:
+        budget_kategorien (dict): Dictionary mit allen Kategorien
+        von (str, optional): Erstes Datum (DD.MM.YYYY, inklusive)
+        bis (str, optional): Letztes Datum (DD.MM.YYYY, inklusive)
+        kategorien (list, optional): Nur diese Kategorien
+        block_grösse (int): Maximale Anzahl Einträge pro Block
+
+    Yields:
+        tuple: (Kategorie, Liste von Eintrag-Objekten)
+    """
+    erster_tag = datum_als_tag(von) if von else None
+    letzter_tag = datum_als_tag(bis) if bis else None
+    for kategorie in _kategorien_wählen(budget_kategorien, kategorien):
+        einträge = budget_kategorien[kategorie]
+        anfang, ende = einträge.bereich(erster_tag, letzter_tag)
+        for start in range(anfang, ende, block_grösse):
+            yield kategorie, einträge[start:min(start + block_grösse, ende)]
+
+
+def einträge_als_csv(auswahl):
+    """
+    Formatiert ausgewählte Einträge als CSV mit Kopfzeile.
+
+    Args:
+        auswahl (iterable): Blöcke aus einträge_auswählen
+
+    Yields:
+        str: Text eines Blocks
+    """
+    daten = _Texte(tag_als_datum)
+    kostenarten = _Texte(_csv_feld)
+    beträge = _Texte(betrag_als_text)
+    yield ",".join(EINTRAG_SPALTEN) + "\r\n"
+    for kategorie, block in auswahl:
+        präfix = _csv_feld(kategorie) + ","
+        yield "".join([
+            f"{präfix}{daten[e.tag]},{kostenarten[e.kostenart]},"
+            f"{beträge[e.betrag]}\r\n" for e in block])
+
+
+def einträge_als_jsonl(auswahl):
+    """
+    Formatiert ausgewählte Einträge als JSON-Objekte, eines pro Zeile.
+
+    Args:
+        auswahl (iterable): Blöcke aus einträge_auswählen
+
+    Yields:
+        str: Text eines Blocks
+    """
+    daten = _Texte(tag_als_datum)
+    kostenarten = _Texte(_json_feld)
+    beträge = _Texte(betrag_als_text)
+    for kategorie, block in auswahl:
+        präfix = '{"kategorie": ' + _json_feld(kategorie) + ', "datum": "'
+        yield "".join([
+            f'{präfix}{daten[e.tag]}", "kostenart": '
+            f'{kostenarten[e.kostenart]}, "betrag": {beträge[e.betrag]}}}\n'
+            for e in block])
+
+
+def monats_zeilen(budget_kategorien, budget_limits, von=None, bis=None,
+                  kategorien=None):
+    """
+    Liefert die Monatssummen pro Kategorie wie in der Statistik.
+    Ohne Zeitraum werden die mitgeführten Monatssummen verwendet,
+    sonst werden sie aus den Rappen-Spalten des Zeitraums gebildet
+    (siehe EintragsListe.monats_summen), ohne Eintrag-Objekte zu
+    erzeugen.
+
+    Args:
+        budget_kategorien (dict): Dictionary mit allen Kategorien
+        budget_limits (dict): Budget-Limits pro Kategorie
+        von (str, optional): Erstes Datum (DD.MM.YYYY, inklusive)
+        bis (str, optional): Letztes Datum (DD.MM.YYYY, inklusive)
+        kategorien (list, optional): Nur diese Kategorien
+
+    Yields:
+        tuple: Werte in der Reihenfolge von MONATS_SPALTEN
+    """
+    erster_tag = datum_als_tag(von) if von else None
+    letzter_tag = datum_als_tag(bis) if bis else None
+    monats_summen = {kategorie: budget_kategorien[kategorie]
+                     .monats_summen(erster_tag, letzter_tag)
+                     for kategorie in _kategorien_wählen(budget_kategorien,
+                                                         kategorien)}
+
+    statistik = monats_summen_pro_kategorie_mit_limits(
+        monats_summen, budget_limits, vorberechnet=monats_summen)
+    for kategorie, daten in statistik.items():
+        for monat, summe, farbe in zip(daten["monate"], daten["werte"],
+                                       daten["farben"]):
+            yield kategorie, monat, summe, daten["limit"], farbe
+
+
+def zeilen_als_csv(spalten, zeilen):
+    """
+    Formatiert beliebige Zeilen als CSV mit Kopfzeile.
+
+    Args:
+        spalten (tuple): Spaltennamen
+        zeilen (iterable): Tupel in Spaltenreihenfolge
+
+    Yields:
+        str: Text einer Zeile
+    """
+    yield ",".join(spalten) + "\r\n"
+    for zeile in zeilen:
+        yield ",".join(
+            betrag_als_text(wert) if isinstance(wert, float)
+            else "" if wert is None else _csv_feld(wert)
+            for wert in zeile) + "\r\n"
+
+
+def zeilen_als_jsonl(spalten, zeilen):
+    """
+    Formatiert beliebige Zeilen als JSON-Objekte, eines pro Zeile.
+
+    Args:
+        spalten (tuple): Schlüssel der Objekte (klein geschrieben)
+        zeilen (iterable): Tupel in Spaltenreihenfolge
+
+    Yields:
+        str: Text einer Zeile
+    """
+    schlüssel = [spalte.lower() for spalte in spalten]
+    for zeile in zeilen:
+        werte = (round(wert, 2) if isinstance(wert, float) else wert
+                 for wert in zeile)
+        yield json.dumps(dict(zip(schlüssel, werte)),
+                         ensure_ascii=False) + "\n"
+
+
+def exportieren(pfad, texte):
+    """
+    Schreibt einen Text-Strom in eine Datei oder auf stdout.
+
+    Args:
+        pfad (str): Zieldatei oder "-" für stdout
+        texte (iterable): Zu schreibende Texte
+
+    Raises:
+        OSError: Wenn die Datei nicht geschrieben werden kann
+    """
+    if pfad == "-":
+        sys.stdout.writelines(texte)
+        return
+    with open(pfad, "w", encoding="utf-8", newline="") as datei:
+        datei.writelines(texte)
+
+
+def einträge_exportieren(pfad, budget_kategorien, export_format="csv",
+                         von=None, bis=None, kategorien=None):
+    """
+    Exportiert Einträge mit Kategorie, Datum, Kostenart und Betrag.
+
+    Args:
+        pfad (str): Zieldatei oder "-" für stdout
+        budget_kategorien (dict): Dictionary mit allen Kategorien
+        export_format (str): "csv" oder "jsonl"
+        von (str, optional): Erstes Datum (DD.MM.YYYY, inklusive)
+        bis (str, optional): Letztes Datum (DD.MM.YYYY, inklusive)
+        kategorien (list, optional): Nur diese Kategorien
+
+    Returns:
+        int: Anzahl exportierter Einträge
+
+    Raises:
+        ValueError: Bei unbekanntem Format
+        OSError: Wenn die Datei nicht geschrieben werden kann
+    """
+    formatieren = _formatierer(export_format, einträge_als_csv,
+                               einträge_als_jsonl)
+    anzahl = 0
+
+    def gezählt(auswahl):
+        nonlocal anzahl
+        for kategorie, block in auswahl:
+            anzahl += len(block)
+            yield kategorie, block
+
+    exportieren(pfad, formatieren(gezählt(einträge_auswählen(
+        budget_kategorien, von, bis, kategorien))))
+    return anzahl
+
+
+def monats_summen_exportieren(pfad, budget_kategorien, budget_limits,
+                              export_format="csv", von=None, bis=None,
+                              kategorien=None):
+    """
+    Exportiert die Monatssummen pro Kategorie samt Limit und Farbcode.
+
+    Args:
+        pfad (str): Zieldatei oder "-" für stdout
+        budget_kategorien (dict): Dictionary mit allen Kategorien
+        budget_limits (dict): Budget-Limits pro Kategorie
+        export_format (str): "csv" oder "jsonl"
+        von (str, optional): Erstes Datum (DD.MM.YYYY, inklusive)
+        bis (str, optional): Letztes Datum (DD.MM.YYYY, inklusive)
+        kategorien (list, optional): Nur diese Kategorien
+
+    Returns:
+        int: Anzahl exportierter Monatszeilen
+
+    Raises:
+        ValueError: Bei unbekanntem Format
+        OSError: Wenn die Datei nicht geschrieben werden kann
+    """
+    formatieren = _formatierer(export_format, zeilen_als_csv,
+                               zeilen_als_jsonl)
+    anzahl = 0
+
+    def gezählt(zeilen):
+        nonlocal anzahl
+        for zeile in zeilen:
+            anzahl += 1
+            yield zeile
+
+    exportieren(pfad, formatieren(MONATS_SPALTEN, gezählt(monats_zeilen(
+        budget_kategorien, budget_limits, von, bis, kategorien))))
+    return anzahl
+
+
+def export_menü(budget_kategorien, budget_limits, timed_input):
+    """
+    Fragt Inhalt, Format, Zeitraum und Zieldatei ab und exportiert.
+
+    Args:
+        budget_kategorien (dict): Dictionary mit allen Kategorien
+        budget_limits (dict): Budget-Limits pro Kategorie
+        timed_input (callable): Input-Funktion mit Timeout
+    """
+    print("\n\033[1mDaten exportieren\033[0m")
+    print("1. Einträge")
+    print("2. Monatssummen pro Kategorie")
+    inhalt = timed_input(
+        "\n\033[34mWas soll exportiert werden? (0 = Zurück):\033[0m").strip()
+    if inhalt == "0":
+        return
+    if inhalt not in ("1", "2"):
+        print("\n\033[31mAchtung: Ungültige Nummer!\033[0m")
+        return
+
+    export_format = timed_input(
+        "\033[34mFormat (csv/jsonl, Enter = csv):\033[0m").strip().lower()
+    export_format = export_format or "csv"
+    if export_format not in EXPORT_FORMATE:
+        print("\n\033[31mUnbekanntes Format.\033[0m")
+        return
+
+    zeitraum = []
+    for frage in ("Von", "Bis"):
+        datum = timed_input(
+            f"\033[34m{frage} (DD.MM.YYYY, Enter = ohne):\033[0m").strip()
+        if datum and not validiere_datum(datum):
+            print("\n\033[31mUngültiges Datum! Bitte verwende das Format "
+                  "DD.MM.YYYY (z.B. 01.02.2025)\033[0m")
+            return
+        zeitraum.append(datum or None)
+    von, bis = zeitraum
+
+    pfad = timed_input("\033[34mZieldatei:\033[0m").strip()
+    if not pfad:
+        print("\n\033[31mKeine Zieldatei angegeben.\033[0m")
+        return
+
+    try:
+        if inhalt == "1":
+            anzahl = einträge_exportieren(pfad, budget_kategorien,
+                                          export_format, von, bis)
+        else:
+            anzahl = monats_summen_exportieren(pfad, budget_kategorien,
+                                               budget_limits, export_format,
+                                               von, bis)
+    except OSError as e:
+        print(f"\n\033[31mExport fehlgeschlagen: {e}\033[0m")
+        return
+    print(f"\n\033[32m{anzahl} Zeilen nach '{pfad}' exportiert.\033[0m")
+
+
+def _formatierer(export_format, für_csv, für_jsonl):
+    if export_format == "csv":
+        return für_csv
+    if export_format == "jsonl":
+        return für_jsonl
+    raise ValueError(f"Unbekanntes Export-Format: {export_format!r}")
+
+
+def _kategorien_wählen(budget_kategorien, kategorien):
+    if kategorien is None:
+        return list(budget_kategorien.keys())
+    return [k for k in budget_kategorien if k in kategorien]
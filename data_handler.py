@@ -3,10 +3,34 @@ Datenverwaltungs-Modul für Budget-Tracker
 Enthält Funktionen zum Laden und Speichern von Daten
 """
 
+import codecs
 import json
 import os
 import base64
-from auth import hash_passwort
+import threading
+import time
+from credentials import passwort_felder, standard_passwort_hash
+from binary_snapshot import binär_inhalt, binär_laden, quellen_übernehmen
+from entry_model import (kategorien_aus_texten, einträge_aus_texten,
+                         eintrag_aus_text, einträge_als_texte,
+                         VerzögerteEintragsListe, nachlade_sperre)
+from journal import (änderungs_sperre, protokollierte_änderung,
+                     offene_änderungen_übernehmen, metadaten_markieren,
+                     offene_änderungen_verwerfen, änderungen_zurücklegen,
+                     journal_anhängen,
+                     journal_lesen, journal_löschen, kompaktierung_fällig)
+from category_manager import (kategorie_anlegen, kategorie_umbenennen,
+                              kategorie_entfernen, eintrag_hinzufügen,
+                              einträge_hinzufügen, eintrag_entfernen,
+                              eintrag_löschen, eintrag_ändern)
+from finance_control import (limit_setzen, limit_entfernen,
+                             ziel_setzen, ziel_entfernen)
+from shard_storage import (verzeichnis_importieren, verzeichnis_laden,
+                           verzeichnis_speichern, verzeichnis_vorhanden)
+from sqlite_storage import (sqlite_importieren, sqlite_laden,
+                            sqlite_änderungen_anwenden)
+from tracing import gemessen, span
+from utils import atomar_schreiben
 
 
 # Standardkategorien beim ersten Start
@@ -73,6 +97,28 @@ STANDARD_KATEGORIEN = {
 }
 
 DATEN_DATEI = "budget_daten.json"
+BINÄR_DATEI = "budget_daten.bin"
+DATENBANK_DATEI = "budget_daten.db"
+DATEN_VERZEICHNIS = "budget_daten"
+
+# Speicher-Backend: "json" (binärer Snapshot + Journal), "sqlite" oder
+# "verzeichnis" (eine Datei pro Kategorie)
+SPEICHER_BACKEND = os.environ.get("BUDGET_SPEICHER", "json")
+
+# Stand des zuletzt geschriebenen Snapshots; das Journal gehört dazu
+_journal_stand = 0
+
+# Ab Format 3 stehen Passwort, Limits und Ziele vor den Kategorien,
+# zusammen mit einem Byte-Index, über den jede Kategorie einzeln
+# nachgeladen wird
+SNAPSHOT_FORMAT = 3
+
+# Blockgrösse beim schrittweisen Lesen des Snapshot-Kopfs
+KOPF_BLOCK = 64 * 1024
+
+# True nach dem Laden einer JSON-Datei: das nächste Speichern
+# schreibt einen binären Snapshot, statt das Journal fortzuführen
+_snapshot_nötig = False
 
 
 def _is_bcrypt_base64(s):
@@ -84,64 +130,614 @@ def _is_bcrypt_base64(s):
         return False
 
 
+@gemessen
 def daten_laden():
     """
-    Lädt gespeicherte Budgetdaten aus der JSON-Datei.
-    Falls keine Datei existiert, werden Standardwerte verwendet.
+    Lädt gespeicherte Budgetdaten aus dem konfigurierten Backend.
+    Falls keine Daten existieren, werden Standardwerte verwendet.
+    Ein binärer Snapshot wird der JSON-Datei vorgezogen. Beim ersten
+    Start mit SQLite oder dem Datenverzeichnis wird ein vorhandener
+    Snapshot übernommen.
     Migriert alte ungehashte Passwörter zu gehashten Passwörtern.
 
     Returns:
         tuple: (budget_kategorien, budget_limits, finanzziele,
                 benutzer_passwort)
     """
-    if os.path.exists(DATEN_DATEI):
+    snapshot = next((pfad for pfad in (BINÄR_DATEI, DATEN_DATEI)
+                     if os.path.exists(pfad)), None)
+    if SPEICHER_BACKEND == "sqlite":
+        if os.path.exists(DATENBANK_DATEI):
+            daten = sqlite_laden(DATENBANK_DATEI)
+        else:
+            daten = _snapshot_laden()
+            sqlite_importieren(DATENBANK_DATEI, *daten)
+            if snapshot is not None:
+                print(f"\n\033[32mDaten aus '{snapshot}' wurden nach "
+                      f"'{DATENBANK_DATEI}' übernommen.\033[0m")
+    elif SPEICHER_BACKEND == "verzeichnis":
+        if verzeichnis_vorhanden(DATEN_VERZEICHNIS):
+            daten = verzeichnis_laden(DATEN_VERZEICHNIS)
+        else:
+            daten = _snapshot_laden()
+            verzeichnis_importieren(DATEN_VERZEICHNIS, *daten)
+            if snapshot is not None:
+                print(f"\n\033[32mDaten aus '{snapshot}' wurden nach "
+                      f"'{DATEN_VERZEICHNIS}/' übernommen.\033[0m")
+    else:
+        daten = _snapshot_laden()
+
+    budget_kategorien, budget_limits, finanzziele, benutzer_passwort = daten
+
+    # Fehlendes Passwort: Standard-Hash einmalig erzeugen und speichern
+    if not benutzer_passwort.get("passwort"):
+        with protokollierte_änderung("passwort_setzen",
+                                     passwort=standard_passwort_hash()):
+            benutzer_passwort["passwort"] = standard_passwort_hash()
+            metadaten_markieren()
+        daten_speichern(budget_kategorien,
+                        budget_limits,
+                        finanzziele,
+                        benutzer_passwort)
+
+    # Migration: Falls Passwort noch nicht gehashed ist
+    stored_pass = benutzer_passwort.get("passwort")
+    if stored_pass and not _is_bcrypt_base64(stored_pass):
+        felder = passwort_felder(stored_pass, benutzer_passwort)
+        with protokollierte_änderung("passwort_setzen", **felder):
+            benutzer_passwort.update(felder)
+            metadaten_markieren()
+        # Sofort speichern
+        daten_speichern(budget_kategorien,
+                        budget_limits,
+                        finanzziele,
+                        benutzer_passwort)
+
+    return budget_kategorien, budget_limits, finanzziele, benutzer_passwort
+
+
+def _snapshot_laden():
+    """
+    Lädt den binären Snapshot, falls vorhanden, sonst die JSON-Datei,
+    und wendet die Änderungen aus dem Journal an.
+    """
+    global _journal_stand
+
+    if not os.path.exists(BINÄR_DATEI):
+        return _json_laden()
+
+    # Die Spalten jeder Kategorie werden erst beim ersten Zugriff
+    # gelesen
+    (budget_kategorien, budget_limits, finanzziele, benutzer_passwort,
+     _journal_stand) = binär_laden(BINÄR_DATEI)
+    for änderung in journal_lesen(_journal_stand):
+        _änderung_anwenden(änderung,
+                           budget_kategorien,
+                           budget_limits,
+                           finanzziele,
+                           benutzer_passwort)
+    offene_änderungen_verwerfen()
+
+    return budget_kategorien, budget_limits, finanzziele, benutzer_passwort
+
+
+def _json_laden():
+    """
+    Lädt die Budgetdaten aus der JSON-Datei und wendet die Änderungen
+    aus dem Journal an. Einträge werden dabei einmalig in
+    Eintrag-Objekte geparst.
+    """
+    global _journal_stand, _snapshot_nötig
+
+    if not os.path.exists(DATEN_DATEI):
+        return (kategorien_aus_texten(STANDARD_KATEGORIEN),
+                {},
+                {},
+                {"passwort": standard_passwort_hash()})
+
+    # Nur der Kopf wird gelesen; die Kategorien werden erst beim
+    # ersten Zugriff aus ihrem Byte-Bereich nachgeladen
+    daten, kategorien_start = _kopf_lesen(DATEN_DATEI)
+    if "kategorien_index" in daten:
+        budget_kategorien = {
+            kategorie: VerzögerteEintragsListe(_SnapshotAbschnitt(
+                kategorie, kategorien_start + start, länge))
+            for kategorie, (start, länge)
+            in daten["kategorien_index"].items()}
+    else:
         with open(DATEN_DATEI, "r", encoding="utf-8") as f:
             daten = json.load(f)
-            budget_kategorien = daten.get("budget_kategorien", {})
-            budget_limits = daten.get("budget_limits", {})
-            finanzziele = daten.get("finanzziele", {})
-            benutzer_passwort = daten.get(
-                "benutzer_passwort", {"passwort": hash_passwort("Test1234!")})
-
-            # Migration: Falls Passwort noch nicht gehashed ist
-            stored_pass = benutzer_passwort.get("passwort")
-            if stored_pass and not _is_bcrypt_base64(stored_pass):
-                benutzer_passwort["passwort"] = hash_passwort(stored_pass)
-                # Sofort speichern
-                daten_speichern(budget_kategorien,
-                                budget_limits,
-                                finanzziele,
-                                benutzer_passwort)
-    else:
-        budget_kategorien = STANDARD_KATEGORIEN.copy()
-        budget_limits = {}
-        finanzziele = {}
-        benutzer_passwort = {"passwort": hash_passwort("Test1234!")}
+        budget_kategorien = kategorien_aus_texten(
+            daten.get("budget_kategorien", {}))
+    budget_limits = daten.get("budget_limits", {})
+    finanzziele = daten.get("finanzziele", {})
+    benutzer_passwort = daten.get("benutzer_passwort", {})
+    _journal_stand = daten.get("journal_stand", 0)
+
+    # Das nächste Speichern legt den binären Snapshot an
+    _snapshot_nötig = True
+
+    for änderung in journal_lesen(_journal_stand):
+        _änderung_anwenden(änderung,
+                           budget_kategorien,
+                           budget_limits,
+                           finanzziele,
+                           benutzer_passwort)
+    offene_änderungen_verwerfen()
 
     return budget_kategorien, budget_limits, finanzziele, benutzer_passwort
 
 
+@gemessen
 def daten_speichern(budget_kategorien,
                     budget_limits,
                     finanzziele,
                     benutzer_passwort):
 
     """
-    Speichert alle aktuellen Budgetdaten in eine JSON-Datei.
+    Speichert die seit dem letzten Aufruf angefallenen Änderungen.
+    Mit SQLite werden die protokollierten Änderungen als einzelne
+    Zeilen-Operationen ausgeführt. Im Datenverzeichnis werden nur die
+    geänderten Kategorien neu geschrieben. Sonst werden sie an das
+    Journal angehängt; fehlt der binäre Snapshot oder erreicht das
+    Journal die Grössen- bzw. Altersgrenze, wird ein vollständiger
+    Snapshot geschrieben und das Journal geleert. Schlägt das Schreiben
+    fehl, bleiben die Änderungen vorgemerkt bzw. der nächste Aufruf
+    schreibt einen vollständigen Snapshot.
 
     Args:
-        budget_kategorien (dict): Budget-Kategorien mit Einträgen
+        budget_kategorien (dict): Budget-Kategorien mit Eintrag-Objekten
         budget_limits (dict): Budget-Limits pro Kategorie
         finanzziele (dict): Finanzziele pro Kategorie
         benutzer_passwort (dict): Gehashtes Benutzer-Passwort
     """
-    daten = {
-        "budget_kategorien": budget_kategorien,
+    global _snapshot_nötig
+
+    if SPEICHER_BACKEND == "sqlite":
+        änderungen = offene_änderungen_übernehmen()
+        try:
+            sqlite_änderungen_anwenden(DATENBANK_DATEI, änderungen)
+        except Exception:
+            # Die Transaktion wurde zurückgerollt
+            änderungen_zurücklegen(änderungen)
+            raise
+    elif SPEICHER_BACKEND == "verzeichnis":
+        verzeichnis_speichern(DATEN_VERZEICHNIS,
+                              budget_kategorien,
+                              budget_limits,
+                              finanzziele,
+                              benutzer_passwort)
+    elif (_snapshot_nötig
+            or not os.path.exists(BINÄR_DATEI)
+            or kompaktierung_fällig(BINÄR_DATEI)):
+        try:
+            snapshot_schreiben(budget_kategorien,
+                               budget_limits,
+                               finanzziele,
+                               benutzer_passwort)
+        except Exception:
+            _snapshot_nötig = True
+            raise
+    else:
+        try:
+            journal_anhängen(_journal_stand, offene_änderungen_übernehmen())
+        except Exception:
+            # Das Journal ist womöglich nur teilweise geschrieben; ein
+            # Snapshot mit neuem Stand macht es ungültig
+            _snapshot_nötig = True
+            raise
+
+
+@gemessen
+def snapshot_schreiben(budget_kategorien,
+                       budget_limits,
+                       finanzziele,
+                       benutzer_passwort):
+    """
+    Schreibt alle Budgetdaten als binären Snapshot und leert das
+    Journal. Noch nicht geladene Kategorien werden unverändert aus dem
+    alten Snapshot übernommen. Die Daten werden unter der
+    Änderungssperre serialisiert und dann über eine temporäre Datei
+    atomar ersetzt, damit ein Absturz beim Schreiben die bestehende
+    Datei nicht beschädigt.
+
+    Args:
+        budget_kategorien (dict): Budget-Kategorien mit Eintrag-Objekten
+        budget_limits (dict): Budget-Limits pro Kategorie
+        finanzziele (dict): Finanzziele pro Kategorie
+        benutzer_passwort (dict): Gehashtes Benutzer-Passwort
+    """
+    global _journal_stand, _snapshot_nötig
+
+    with änderungs_sperre:
+        inhalt, ungeladen = binär_inhalt(BINÄR_DATEI,
+                                         budget_kategorien,
+                                         budget_limits,
+                                         finanzziele,
+                                         benutzer_passwort,
+                                         _journal_stand + 1)
+        offene_änderungen_verwerfen()
+
+    # Ungeladene Kategorien lesen ab jetzt aus dem neuen Snapshot
+    with nachlade_sperre:
+        atomar_schreiben(BINÄR_DATEI, inhalt)
+        quellen_übernehmen(ungeladen)
+    _journal_stand += 1
+    _snapshot_nötig = False
+    journal_löschen()
+
+
+@gemessen
+def json_exportieren(pfad,
+                     budget_kategorien,
+                     budget_limits,
+                     finanzziele,
+                     benutzer_passwort):
+    """
+    Schreibt alle Budgetdaten im JSON-Format (z.B. zur Weitergabe oder
+    Sicherung). Ohne binären Snapshot lädt daten_laden diese Datei;
+    Snapshot und Journal bleiben unverändert.
+
+    Args:
+        pfad (str): Zieldatei
+        budget_kategorien (dict): Budget-Kategorien mit Eintrag-Objekten
+        budget_limits (dict): Budget-Limits pro Kategorie
+        finanzziele (dict): Finanzziele pro Kategorie
+        benutzer_passwort (dict): Gehashtes Benutzer-Passwort
+    """
+    # Alle Kategorien werden vor dem Schreiben geladen, damit keine
+    # mehr aus einer überschriebenen Datei nachlädt. Der Export gehört
+    # zu keinem Journal (Stand -1).
+    with änderungs_sperre:
+        abschnitte = [(kategorie, _einträge_als_json(
+                          einträge_als_texte(einträge)))
+                      for kategorie, einträge in budget_kategorien.items()]
+        inhalt, _ = _snapshot_inhalt(abschnitte, budget_limits, finanzziele,
+                                     benutzer_passwort, -1)
+    atomar_schreiben(pfad, inhalt)
+
+
+def snapshot_inhalt(kategorien_texte, budget_limits, finanzziele,
+                    benutzer_passwort, journal_stand=0):
+    """
+    Erstellt den Inhalt einer Snapshot-Datei aus Kategorien im
+    Textformat (z.B. für erzeugte Testdaten).
+
+    Args:
+        kategorien_texte (dict): Kategorien mit Einträgen als Strings
+        budget_limits (dict): Budget-Limits pro Kategorie
+        finanzziele (dict): Finanzziele pro Kategorie
+        benutzer_passwort (dict): Gehashtes Benutzer-Passwort
+        journal_stand (int): Stand des zugehörigen Journals
+
+    Returns:
+        bytes: UTF-8-kodierter Snapshot
+    """
+    abschnitte = [(kategorie, _einträge_als_json(zeilen))
+                  for kategorie, zeilen in kategorien_texte.items()]
+    return _snapshot_inhalt(abschnitte, budget_limits, finanzziele,
+                            benutzer_passwort, journal_stand)[0]
+
+
+def _einträge_als_json(zeilen):
+    """JSON-Array der Eintragszeilen, eingerückt wie im Snapshot."""
+    return json.dumps(list(zeilen), indent=4, ensure_ascii=False).replace(
+        "\n", "\n        ").encode("utf-8")
+
+
+def _snapshot_inhalt(abschnitte, budget_limits, finanzziele,
+                     benutzer_passwort, journal_stand):
+    """
+    Setzt den Snapshot aus Kopf und den fertig kodierten Kategorien
+    zusammen. Der Kopf enthält für jede Kategorie den Byte-Bereich
+    ihres Arrays relativ zum Beginn von "budget_kategorien"; die
+    Datei bleibt gewöhnliches JSON.
+
+    Args:
+        abschnitte (list): (Kategorie, JSON-Array als Bytes)
+        budget_limits (dict): Budget-Limits pro Kategorie
+        finanzziele (dict): Finanzziele pro Kategorie
+        benutzer_passwort (dict): Gehashtes Benutzer-Passwort
+        journal_stand (int): Stand des zugehörigen Journals
+
+    Returns:
+        tuple: (Inhalt als Bytes,
+                {Kategorie: (Start, Länge)} in Bytes ab Dateianfang)
+    """
+    teile = [b"{"]
+    index = {}
+    position = 1
+    for nummer, (kategorie, array) in enumerate(abschnitte):
+        schlüssel = ("," if nummer else "") + "\n        " + json.dumps(
+            kategorie, ensure_ascii=False) + ": "
+        schlüssel = schlüssel.encode("utf-8")
+        index[kategorie] = [position + len(schlüssel), len(array)]
+        teile += [schlüssel, array]
+        position += len(schlüssel) + len(array)
+    teile.append(b"\n    }" if abschnitte else b"}")
+
+    kopf = json.dumps({
+        "format": SNAPSHOT_FORMAT,
+        "journal_stand": journal_stand,
+        "benutzer_passwort": benutzer_passwort,
         "budget_limits": budget_limits,
         "finanzziele": finanzziele,
-        "benutzer_passwort": benutzer_passwort
-    }
-    with open(DATEN_DATEI, "w", encoding="utf-8") as f:
-        json.dump(daten, f, indent=4, ensure_ascii=False)
+        "kategorien_index": index,
+    }, indent=4, ensure_ascii=False)
+    kopf = (kopf[:-2] + ',\n    "budget_kategorien": ').encode("utf-8")
+    teile.insert(0, kopf)
+    teile.append(b"\n}")
+    bereiche = {kategorie: (len(kopf) + start, länge)
+                for kategorie, (start, länge) in index.items()}
+    return b"".join(teile), bereiche
+
+
+def _kopf_lesen(pfad):
+    """
+    Liest einen Snapshot blockweise, bis der Beginn der Kategorien
+    erreicht ist. Bei einer Datei im ursprünglichen Format
+    (Kategorien zuerst) fehlt danach "kategorien_index" in den
+    Kopfdaten.
+
+    Args:
+        pfad (str): Pfad zum Snapshot
+
+    Returns:
+        tuple: (Kopfdaten als dict, Byte-Position des Werts von
+                "budget_kategorien" oder None)
+    """
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    text = ""
+    with open(pfad, "rb") as f:
+        while True:
+            block = f.read(KOPF_BLOCK)
+            text += utf8.decode(block, final=not block)
+            try:
+                kopf, position = _kopf_parsen(text, ende=not block)
+            except _KopfUnvollständig:
+                continue
+            if position is None:
+                return kopf, None
+            return kopf, len(text[:position].encode("utf-8"))
+
+
+class _KopfUnvollständig(Exception):
+    """Der bisher gelesene Text reicht für den Kopf nicht aus."""
+
+
+def _kopf_parsen(text, ende):
+    """
+    Liest Schlüssel und Werte des äusseren JSON-Objekts, bis
+    "budget_kategorien" erreicht ist.
+
+    Args:
+        text (str): Bisher gelesener Anfang des Snapshots
+        ende (bool): True, wenn der Text die ganze Datei umfasst
+
+    Returns:
+        tuple: (Kopfdaten, Position des Werts von "budget_kategorien"
+                im Text oder None, wenn das Objekt ohne endet)
+
+    Raises:
+        _KopfUnvollständig: Wenn der Text vorher endet
+    """
+    decoder = json.JSONDecoder()
+
+    def leerzeichen(i):
+        while i < len(text) and text[i] in " \t\r\n":
+            i += 1
+        if i >= len(text):
+            if ende:
+                raise ValueError("Der Snapshot ist unvollständig.")
+            raise _KopfUnvollständig
+        return i
+
+    def wert(i):
+        try:
+            ergebnis, i = decoder.raw_decode(text, i)
+        except json.JSONDecodeError:
+            if ende:
+                raise
+            raise _KopfUnvollständig from None
+        # Eine Zahl am Textende könnte noch weitergehen
+        if i >= len(text) and not ende:
+            raise _KopfUnvollständig
+        return ergebnis, i
+
+    kopf = {}
+    i = leerzeichen(0)
+    if text[i] != "{":
+        raise ValueError("Der Snapshot ist kein JSON-Objekt.")
+    i += 1
+    while True:
+        i = leerzeichen(i)
+        if text[i] == "}":
+            return kopf, None
+        if text[i] == ",":
+            i = leerzeichen(i + 1)
+        schlüssel, i = wert(i)
+        i = leerzeichen(i)
+        if text[i] != ":":
+            raise ValueError("Ungültiger Snapshot-Kopf.")
+        i = leerzeichen(i + 1)
+        if schlüssel == "budget_kategorien":
+            return kopf, i
+        kopf[schlüssel], i = wert(i)
+
+
+class _SnapshotAbschnitt:
+    """
+    Quelle einer VerzögerteEintragsListe: das Array einer Kategorie
+    als Byte-Bereich im Snapshot.
+    """
+
+    __slots__ = ("kategorie", "start", "länge")
+
+    def __init__(self, kategorie, start, länge):
+        self.kategorie = kategorie
+        self.start = start
+        self.länge = länge
+
+    def __call__(self):
+        with span("kategorie_nachladen", bytes=self.länge):
+            with open(DATEN_DATEI, "rb") as f:
+                f.seek(self.start)
+                array = f.read(self.länge)
+            return einträge_aus_texten(self.kategorie, json.loads(array))
+
+
+class HintergrundSpeicher:
+    """
+    Schreibt Daten in einem eigenen Thread, damit das Menü nie auf
+    Datei-I/O warten muss. Anforderungen, die kurz hintereinander
+    eintreffen, werden zu einem einzigen Speichervorgang
+    zusammengefasst. Reissen die Anforderungen nicht ab (z.B. im
+    Server-Betrieb), wird spätestens nach max_verzögerung seit der
+    ersten ausstehenden Anforderung trotzdem gespeichert.
+
+    Args:
+        speicher_func (callable): Funktion, die die Daten speichert
+        verzögerung (float): Ruhezeit in Sekunden vor dem Speichern
+        max_verzögerung (float, optional): Längste Wartezeit in
+                                           Sekunden (Standard: das
+                                           Fünffache der Ruhezeit)
+    """
+
+    def __init__(self, speicher_func, verzögerung=0.5,
+                 max_verzögerung=None):
+        self._speicher_func = speicher_func
+        self._verzögerung = verzögerung
+        self._max_verzögerung = (5 * verzögerung if max_verzögerung is None
+                                 else max_verzögerung)
+        self._bedingung = threading.Condition()
+        self._angefordert = 0
+        self._erledigt = 0
+        self._fehlgeschlagen = 0
+        self._erste_anforderung = None
+        self._letzte_anforderung = 0.0
+        self._sofort = False
+        self._beendet = False
+        self._thread = threading.Thread(target=self._arbeiten,
+                                        name="HintergrundSpeicher",
+                                        daemon=True)
+        self._thread.start()
+
+    def anfordern(self):
+        """Fordert ein Speichern an, ohne darauf zu warten."""
+        with self._bedingung:
+            self._angefordert += 1
+            self._letzte_anforderung = time.monotonic()
+            if self._erste_anforderung is None:
+                self._erste_anforderung = self._letzte_anforderung
+            self._bedingung.notify_all()
+
+    def flush(self):
+        """
+        Speichert sofort und wartet, bis alles geschrieben ist oder der
+        Versuch fehlgeschlagen ist. Nach einem Fehler bleibt das
+        Speichern angefordert und wird später wiederholt.
+        """
+        with self._bedingung:
+            self._angefordert += 1
+            ziel = self._angefordert
+            self._sofort = True
+            self._bedingung.notify_all()
+            self._bedingung.wait_for(lambda: self._erledigt >= ziel
+                                     or self._fehlgeschlagen >= ziel)
+
+    def beenden(self):
+        """Schreibt ausstehende Daten und beendet den Thread."""
+        self.flush()
+        with self._bedingung:
+            self._beendet = True
+            self._bedingung.notify_all()
+        self._thread.join()
+
+    def _arbeiten(self):
+        while True:
+            with self._bedingung:
+                self._bedingung.wait_for(
+                    lambda: self._angefordert > self._erledigt
+                    or self._beendet)
+                if self._beendet:
+                    return
+
+                # Entprellen: warten, bis keine neuen Anforderungen
+                # kommen, aber nicht länger als max_verzögerung
+                while not self._sofort:
+                    frist = self._letzte_anforderung + self._verzögerung
+                    if self._erste_anforderung is not None:
+                        frist = min(frist, self._erste_anforderung
+                                    + self._max_verzögerung)
+                    rest = frist - time.monotonic()
+                    if rest <= 0:
+                        break
+                    self._bedingung.wait(rest)
+                ziel = self._angefordert
+                self._sofort = False
+                self._erste_anforderung = None
+
+            try:
+                self._speicher_func()
+            except Exception as e:
+                print(f"\n\033[31mFehler beim Speichern: {e}\033[0m")
+                # Die Anforderung bleibt offen und wird nach der
+                # Verzögerung erneut versucht
+                with self._bedingung:
+                    self._fehlgeschlagen = ziel
+                    self._bedingung.notify_all()
+                    if self._erste_anforderung is None:
+                        self._erste_anforderung = time.monotonic()
+                    self._letzte_anforderung = time.monotonic()
+                continue
+
+            with self._bedingung:
+                self._erledigt = ziel
+                self._bedingung.notify_all()
+
+
+def _änderung_anwenden(änderung,
+                       budget_kategorien,
+                       budget_limits,
+                       finanzziele,
+                       benutzer_passwort):
+    """Wendet eine Änderung aus dem Journal auf die geladenen Daten an."""
+    operation = änderung["op"]
+    if operation == "kategorie_anlegen":
+        kategorie_anlegen(budget_kategorien, änderung["kategorie"])
+    elif operation == "kategorie_umbenennen":
+        kategorie_umbenennen(budget_kategorien,
+                             änderung["alt"], änderung["neu"])
+    elif operation == "kategorie_entfernen":
+        kategorie_entfernen(budget_kategorien, änderung["kategorie"])
+    elif operation == "eintrag_hinzufügen":
+        eintrag_hinzufügen(budget_kategorien, änderung["kategorie"],
+                           eintrag_aus_text(änderung["eintrag"]))
+    elif operation == "einträge_hinzufügen":
+        einträge_hinzufügen(budget_kategorien, änderung["kategorie"],
+                            [eintrag_aus_text(e)
+                             for e in änderung["einträge"]])
+    elif operation == "eintrag_entfernen":
+        eintrag_entfernen(budget_kategorien, änderung["kategorie"],
+                          änderung["position"])
+    elif operation == "eintrag_löschen":
+        eintrag_löschen(budget_kategorien, änderung["kategorie"],
+                        änderung["id"])
+    elif operation == "eintrag_ändern":
+        eintrag_ändern(budget_kategorien, änderung["kategorie"],
+                       änderung["id"], eintrag_aus_text(änderung["eintrag"]))
+    elif operation == "limit_setzen":
+        limit_setzen(budget_limits, änderung["kategorie"], änderung["limit"])
+    elif operation == "limit_entfernen":
+        limit_entfernen(budget_limits, änderung["kategorie"])
+    elif operation == "ziel_setzen":
+        ziel_setzen(finanzziele, änderung["kategorie"],
+                    änderung["ziel"], änderung["meldung"])
+    elif operation == "ziel_entfernen":
+        ziel_entfernen(finanzziele, änderung["kategorie"])
+    elif operation == "passwort_setzen":
+        benutzer_passwort["passwort"] = änderung["passwort"]
+        if "kosten" in änderung:
+            benutzer_passwort["kosten"] = änderung["kosten"]
 
 
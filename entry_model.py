@@ -0,0 +1,922 @@
+"""
+Eintrags-Modul für Budget-Tracker
+Enthält das strukturierte Modell für einzelne Budget-Einträge
+"""
+
+import math
+import sys
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from functools import lru_cache
+from itertools import accumulate
+from operator import attrgetter
+
+
+# Trennzeichen im Textformat "DD.MM.YYYY - Kostenart - Betrag CHF"
+EINTRAG_TRENNER = " - "
+
+# Grösster zulässiger Betrag in CHF; Beträge und Summen werden als
+# int64 in Rappen gespeichert und dürfen nicht überlaufen
+MAX_BETRAG = 1_000_000_000
+
+# Schützt das Nachladen verzögerter Listen und das Verdichten nach
+# dem Löschen; wer die Quelle einer ungeladenen Liste austauscht
+# (z.B. beim Ersetzen des Snapshots), hält die Sperre ebenfalls
+nachlade_sperre = threading.RLock()
+
+# ID eines gelöschten Eintrags, bis die Spalten verdichtet werden;
+# vergebene IDs beginnen bei 1
+_GELÖSCHT = 0
+
+# Gemeinsame Tabelle aller Kostenarten (Code -> Kostenart); Einträge
+# speichern nur den Code. Die Tabelle wächst nur, Codes bleiben daher
+# für die Laufzeit des Programms gültig.
+_kostenarten = []
+_kostenart_codes = {}
+_kostenarten_sperre = threading.Lock()
+
+
+class Eintrag:
+    """
+    Ein einzelner Budget-Eintrag, einmalig aus dem Textformat geparst.
+
+    Attributes:
+        tag (int): Datum als Tages-Ordinalzahl (date.toordinal())
+        kostenart (str): Internierte Kostenart
+        betrag (float): Betrag in CHF
+        id (int | None): Stabile ID in der Kategorie (None, solange der
+                         Eintrag in keiner EintragsListe steht)
+    """
+
+    __slots__ = ("tag", "kostenart", "betrag", "id")
+
+    def __init__(self, tag, kostenart, betrag, eintrag_id=None):
+        self.tag = tag
+        self.kostenart = sys.intern(kostenart)
+        self.betrag = betrag
+        self.id = eintrag_id
+
+    @property
+    def datum(self):
+        """str: Datum im Format DD.MM.YYYY."""
+        return tag_als_datum(self.tag)
+
+    @property
+    def monat(self):
+        """str: Monatsschlüssel im Format YYYY-MM."""
+        return tag_als_monat(self.tag)
+
+    def __str__(self):
+        return eintrag_als_text(self)
+
+    def __repr__(self):
+        return f"Eintrag({eintrag_als_text(self)!r})"
+
+
+class EintragsListe:
+    """
+    Einträge einer Kategorie, nach Datum sortiert, mit laufend
+    nachgeführten Summen.
+
+    Neue Einträge werden per bisect hinter allen Einträgen desselben
+    Tages eingefügt. Die Reihenfolge hängt damit nur von der Folge der
+    Änderungen ab, sodass die Positionen im Journal beim Wiederholen
+    dieselben Einträge treffen. Gesamtsumme und Monatssummen werden in
+    O(1) aktualisiert; da sie in der Liste selbst liegen, bleiben sie
+    beim Umbenennen oder Löschen einer Kategorie ohne weiteren Aufwand
+    korrekt. Tage, Beträge, Kostenart-Codes und IDs werden als Spalten
+    geführt (20 Bytes pro Eintrag), dazu Präfixsummen für
+    Zeitraum-Abfragen in O(log n). Alle Summen rechnen in ganzen
+    Rappen und bleiben so auch nach vielen Änderungen exakt.
+    Eintrag-Objekte entstehen erst beim Zugriff auf einen Eintrag und
+    werden nicht aufbewahrt; zwei Zugriffe auf dieselbe Position
+    liefern gleiche, aber nicht identische Objekte.
+
+    Jeder Eintrag erhält beim Einfügen eine fortlaufende ID, die in
+    der Kategorie eindeutig bleibt und sich durch andere Änderungen
+    nicht verschiebt. Da die IDs dicht liegen, ist der Index ein
+    direkt adressiertes Array ID -> Tag; die Position ergibt sich per
+    bisect innerhalb dieses Tages. Der Index muss so beim Verschieben
+    von Einträgen nicht nachgeführt werden. Über die ID gelöschte
+    Einträge werden nur markiert und erst vor dem nächsten Zugriff auf
+    Positionen oder Spalten verdichtet, ab der ersten Lücke in einem
+    Durchgang; mehrere Löschungen kosten so zusammen nur eine
+    Verschiebung.
+
+    Attributes:
+        gesamt (float): Summe aller Beträge der Kategorie
+        nächste_id (int): ID, die der nächste neue Eintrag erhält
+        unlesbar (list): Nicht lesbare Eintragszeilen aus der Datei;
+                         sie werden beim Speichern unverändert
+                         zurückgeschrieben
+    """
+
+    __slots__ = ("_tage", "_rappen", "_codes", "_ids", "_gesamt",
+                 "_monats_summen", "_monats_anzahl", "_präfix",
+                 "_tag_nach_id", "_nächste_id", "_lücken", "_quelle",
+                 "unlesbar")
+
+    def __init__(self, einträge=()):
+        self._quelle = None
+        self.unlesbar = []
+        self._tage = array("i")
+        self._rappen = array("q")
+        self._codes = array("i")
+        self._ids = array("i")
+        self._gesamt = 0
+        self._monats_summen = {}
+        self._monats_anzahl = {}
+        # _präfix[i] = Summe der ersten i Beträge; wird nach Änderungen
+        # gekürzt und bei der nächsten Abfrage ergänzt
+        self._präfix = array("q", [0])
+        # _tag_nach_id[id] = Tag des Eintrags oder 0 (gelöscht); wird
+        # bei der ersten Suche nach einer ID aufgebaut
+        self._tag_nach_id = None
+        self._nächste_id = 1
+        # Positionen gelöschter, noch nicht verdichteter Einträge
+        self._lücken = []
+        self.erweitern(einträge)
+
+    @classmethod
+    def aus_spalten(cls, tage, rappen, codes, ids=None, nächste_id=None):
+        """
+        Erstellt die Liste direkt aus nach Datum sortierten Spalten
+        (z.B. aus dem binären Snapshot), ohne Eintrag-Objekte zu
+        erzeugen. Die Summen werden spaltenweise berechnet.
+
+        Args:
+            tage (array): array('i') Tages-Ordinalzahlen, sortiert
+            rappen (array): array('q') Beträge in Rappen
+            codes (array): array('i') Kostenart-Codes (kostenart_code)
+            ids (array, optional): array('i') IDs der Einträge
+                                   (Standard: 1, 2, 3, ...)
+            nächste_id (int, optional): Nächste freie ID
+                                        (Standard: grösste ID + 1)
+
+        Returns:
+            EintragsListe: Die neue Liste
+        """
+        liste = cls()
+        liste._spalten_setzen(tage, rappen, codes)
+        if ids is None:
+            ids = array("i", range(1, len(tage) + 1))
+        liste._ids = ids
+        liste._nächste_id = (max(ids, default=0) + 1 if nächste_id is None
+                             else nächste_id)
+        return liste
+
+    @classmethod
+    def aus_einträgen(cls, einträge, nächste_id=None):
+        """
+        Erstellt die Liste aus nach Datum sortierten Eintrag-Objekten,
+        die ihre IDs behalten (z.B. aus einer Datenbank).
+
+        Args:
+            einträge (iterable): Eintrag-Objekte mit gesetzter ID
+            nächste_id (int, optional): Nächste freie ID
+                                        (Standard: grösste ID + 1)
+
+        Returns:
+            EintragsListe: Die neue Liste
+        """
+        einträge = list(einträge)
+        return cls.aus_spalten(
+            array("i", map(attrgetter("tag"), einträge)),
+            array("q", map(betrag_als_rappen,
+                           map(attrgetter("betrag"), einträge))),
+            array("i", map(kostenart_code,
+                           map(attrgetter("kostenart"), einträge))),
+            array("i", map(attrgetter("id"), einträge)),
+            nächste_id)
+
+    @property
+    def gesamt(self):
+        return self._gesamt / 100
+
+    @property
+    def nächste_id(self):
+        return self._nächste_id
+
+    def einfügen(self, eintrag):
+        """
+        Fügt einen Eintrag nach Datum sortiert ein (hinter Einträgen
+        desselben Tages), vergibt seine ID und aktualisiert die Summen.
+
+        Args:
+            eintrag (Eintrag): Der neue Eintrag (eintrag.id wird gesetzt)
+
+        Returns:
+            int: Position des eingefügten Eintrags
+
+        Raises:
+            ValueError: Wenn der Betrag ausserhalb von MAX_BETRAG liegt
+        """
+        rappen = betrag_als_rappen(eintrag.betrag)
+        eintrag.id = self._id_vergeben()
+        return self._einsetzen(eintrag, rappen)
+
+    def erweitern(self, einträge):
+        """
+        Fügt mehrere Einträge ein. Das Ergebnis entspricht einzelnen
+        Aufrufen von einfügen() in derselben Reihenfolge, wird aber
+        mit einer einzigen stabilen Sortierung erreicht.
+
+        Args:
+            einträge (iterable): Die neuen Eintrag-Objekte (ihre IDs
+                                 werden in dieser Reihenfolge vergeben)
+        """
+        neue = list(einträge)
+        if not neue:
+            return
+        # Erst alle Beträge prüfen und die Spalten aufbauen, dann
+        # zuweisen: ein ungültiger Betrag lässt die Liste unverändert
+        neue_rappen = list(map(betrag_als_rappen,
+                               map(attrgetter("betrag"), neue)))
+        for eintrag in neue:
+            eintrag.id = self._id_vergeben()
+        self._verdichten()
+        erste_position = bisect_right(
+            self._tage, min(map(attrgetter("tag"), neue)))
+        rest = sorted(self[erste_position:] + neue, key=attrgetter("tag"))
+        tage = array("i", map(attrgetter("tag"), rest))
+        rappen = array("q", map(betrag_als_rappen,
+                                map(attrgetter("betrag"), rest)))
+        codes = array("i", map(kostenart_code,
+                               map(attrgetter("kostenart"), rest)))
+        ids = array("i", map(attrgetter("id"), rest))
+        self._tage[erste_position:] = tage
+        self._rappen[erste_position:] = rappen
+        self._codes[erste_position:] = codes
+        self._ids[erste_position:] = ids
+        self._präfix_kürzen(erste_position)
+        for eintrag, betrag in zip(neue, neue_rappen):
+            self._id_eintragen(eintrag.id, eintrag.tag)
+            self._summen_anpassen(eintrag.tag, betrag, 1)
+
+    def entfernen(self, position):
+        """
+        Entfernt den Eintrag an einer Position und aktualisiert die Summen.
+
+        Args:
+            position (int): Position des Eintrags (wie bei list.pop)
+
+        Returns:
+            Eintrag: Der entfernte Eintrag
+
+        Raises:
+            IndexError: Wenn die Position ungültig ist
+        """
+        eintrag = self[position]
+        if position < 0:
+            position += len(self._tage)
+        rappen = self._rappen[position]
+        del self._tage[position]
+        del self._rappen[position]
+        del self._codes[position]
+        del self._ids[position]
+        self._id_eintragen(eintrag.id, 0)
+        self._präfix_kürzen(position)
+        self._summen_anpassen(eintrag.tag, rappen, -1)
+        return eintrag
+
+    def löschen(self, eintrag_id):
+        """
+        Löscht einen Eintrag über seine ID, ohne andere Einträge zu
+        verschieben. Die Positionen der übrigen Einträge ändern sich
+        erst beim nächsten Zugriff, der die Spalten verdichtet;
+        mehrere Löschungen nacheinander kosten so zusammen nur einen
+        Durchgang.
+
+        Args:
+            eintrag_id (int): ID des Eintrags
+
+        Returns:
+            Eintrag: Der gelöschte Eintrag
+
+        Raises:
+            KeyError: Wenn kein Eintrag diese ID hat
+        """
+        position = self._ort(eintrag_id)
+        eintrag = self._eintrag(position)
+        self._ids[position] = _GELÖSCHT
+        self._tag_nach_id[eintrag_id] = 0
+        self._lücken.append(position)
+        self._summen_anpassen(eintrag.tag, self._rappen[position], -1)
+        return eintrag
+
+    def ändern(self, eintrag_id, eintrag):
+        """
+        Ändert Datum, Kostenart und Betrag eines Eintrags über seine ID;
+        die ID bleibt erhalten. Solange die Sortierung nach Datum gilt,
+        wird der Eintrag an seiner Position überschrieben. Ein Datum
+        ausserhalb der Nachbarn verschiebt ihn wie beim Einfügen hinter
+        die Einträge seines neuen Tages.
+
+        Args:
+            eintrag_id (int): ID des Eintrags
+            eintrag (Eintrag): Neue Werte (eintrag.id wird gesetzt)
+
+        Returns:
+            Eintrag: Der Eintrag vor der Änderung
+
+        Raises:
+            KeyError: Wenn kein Eintrag diese ID hat
+            ValueError: Wenn der Betrag ausserhalb von MAX_BETRAG liegt
+        """
+        position = self._ort(eintrag_id)
+        rappen = betrag_als_rappen(eintrag.betrag)
+        alter = self._eintrag(position)
+        eintrag.id = eintrag_id
+        tage = self._tage
+        if eintrag.tag != alter.tag and not (
+                (position == 0 or tage[position - 1] <= eintrag.tag)
+                and (position + 1 == len(tage)
+                     or eintrag.tag < tage[position + 1])):
+            self.löschen(eintrag_id)
+            self._einsetzen(eintrag, rappen)
+            return alter
+
+        self._summen_anpassen(alter.tag, self._rappen[position], -1)
+        tage[position] = eintrag.tag
+        self._rappen[position] = rappen
+        self._codes[position] = kostenart_code(eintrag.kostenart)
+        self._id_eintragen(eintrag_id, eintrag.tag)
+        self._präfix_kürzen(position)
+        self._summen_anpassen(eintrag.tag, rappen, 1)
+        return alter
+
+    def nach_id(self, eintrag_id):
+        """
+        Liefert einen Eintrag über seine ID.
+
+        Args:
+            eintrag_id (int): ID des Eintrags
+
+        Returns:
+            Eintrag: Der Eintrag
+
+        Raises:
+            KeyError: Wenn kein Eintrag diese ID hat
+        """
+        return self._eintrag(self._ort(eintrag_id))
+
+    def spalten(self):
+        """
+        Liefert Tage und Beträge als kompakte, nach Datum sortierte
+        Spalten (werden bei jeder Änderung mitgeführt).
+
+        Returns:
+            tuple: (array('i') Tages-Ordinalzahlen,
+                    array('q') Beträge in Rappen)
+        """
+        self._verdichten()
+        return self._tage, self._rappen
+
+    def code_spalte(self):
+        """
+        Liefert die Kostenart-Codes in derselben Reihenfolge wie
+        spalten() (siehe kostenart_tabelle).
+
+        Returns:
+            array: array('i') Kostenart-Code jedes Eintrags
+        """
+        self._verdichten()
+        return self._codes
+
+    def id_spalte(self):
+        """
+        Liefert die IDs in derselben Reihenfolge wie spalten().
+
+        Returns:
+            array: array('i') ID jedes Eintrags
+        """
+        self._verdichten()
+        return self._ids
+
+    def bereich(self, erster_tag=None, letzter_tag=None):
+        """
+        Sucht per bisect die Positionen eines Zeitraums.
+
+        Args:
+            erster_tag (int, optional): Erster Tag (inklusive)
+            letzter_tag (int, optional): Letzter Tag (inklusive)
+
+        Returns:
+            tuple: (start, ende) für einträge[start:ende]
+        """
+        self._verdichten()
+        start = (0 if erster_tag is None
+                 else bisect_left(self._tage, erster_tag))
+        ende = (len(self._tage) if letzter_tag is None
+                else bisect_right(self._tage, letzter_tag))
+        return start, max(start, ende)
+
+    def zeitraum(self, erster_tag=None, letzter_tag=None):
+        """
+        Liefert die Einträge eines Zeitraums.
+
+        Args:
+            erster_tag (int, optional): Erster Tag (inklusive)
+            letzter_tag (int, optional): Letzter Tag (inklusive)
+
+        Returns:
+            list: Eintrag-Objekte des Zeitraums, nach Datum sortiert
+        """
+        start, ende = self.bereich(erster_tag, letzter_tag)
+        return self[start:ende]
+
+    def zeitraum_summe(self, erster_tag=None, letzter_tag=None):
+        """
+        Liefert die Summe eines Zeitraums über die Präfixsummen.
+
+        Args:
+            erster_tag (int, optional): Erster Tag (inklusive)
+            letzter_tag (int, optional): Letzter Tag (inklusive)
+
+        Returns:
+            float: Summe der Beträge im Zeitraum
+        """
+        start, ende = self.bereich(erster_tag, letzter_tag)
+        if len(self._präfix) <= ende:
+            self._präfix_ergänzen()
+        return (self._präfix[ende] - self._präfix[start]) / 100
+
+    def monats_summe(self, monat):
+        """
+        Liefert die Summe eines Monats.
+
+        Args:
+            monat (str): Monatsschlüssel im Format YYYY-MM
+
+        Returns:
+            float: Summe der Beträge im Monat (0.0 ohne Einträge)
+        """
+        return self._monats_summen.get(monat, 0) / 100
+
+    def monats_summen(self, erster_tag=None, letzter_tag=None):
+        """
+        Liefert die Monatssummen in zeitlicher Reihenfolge, auf Wunsch
+        nur über die Einträge eines Zeitraums. Dabei wird jeder Monat
+        im Zeitraum per bisect abgegrenzt und über die Präfixsummen in
+        Rappen summiert.
+
+        Args:
+            erster_tag (int, optional): Erster Tag (inklusive)
+            letzter_tag (int, optional): Letzter Tag (inklusive)
+
+        Returns:
+            dict: Monatsschlüssel YYYY-MM -> Summe (nur Monate mit
+                  Einträgen im Zeitraum)
+        """
+        if erster_tag is None and letzter_tag is None:
+            return {monat: self._monats_summen[monat] / 100
+                    for monat in sorted(self._monats_summen)}
+        start, ende = self.bereich(erster_tag, letzter_tag)
+        if len(self._präfix) <= ende:
+            self._präfix_ergänzen()
+        tage = self._tage
+        summen = {}
+        while start < ende:
+            tag = date.fromordinal(tage[start])
+            monats_ende = bisect_left(tage, date(
+                tag.year + tag.month // 12, tag.month % 12 + 1,
+                1).toordinal(), start, ende)
+            summen[tag_als_monat(tage[start])] = (
+                self._präfix[monats_ende] - self._präfix[start]) / 100
+            start = monats_ende
+        return summen
+
+    def _eintrag(self, position):
+        return Eintrag(self._tage[position],
+                       _kostenarten[self._codes[position]],
+                       self._rappen[position] / 100,
+                       self._ids[position])
+
+    def _id_vergeben(self):
+        eintrag_id = self._nächste_id
+        self._nächste_id += 1
+        if self._tag_nach_id is not None:
+            self._tag_nach_id.append(0)
+        return eintrag_id
+
+    def _id_eintragen(self, eintrag_id, tag):
+        if self._tag_nach_id is not None:
+            self._tag_nach_id[eintrag_id] = tag
+
+    def _einsetzen(self, eintrag, rappen):
+        """Fügt einen Eintrag mit bereits vergebener ID und geprüftem
+        Betrag in Rappen ein."""
+        self._verdichten()
+        code = kostenart_code(eintrag.kostenart)
+        position = bisect_right(self._tage, eintrag.tag)
+        self._tage.insert(position, eintrag.tag)
+        self._rappen.insert(position, rappen)
+        self._codes.insert(position, code)
+        self._ids.insert(position, eintrag.id)
+        self._id_eintragen(eintrag.id, eintrag.tag)
+        self._präfix_kürzen(position)
+        self._summen_anpassen(eintrag.tag, rappen, 1)
+        return position
+
+    def _ort(self, eintrag_id):
+        """Position eines Eintrags über den Index ID -> Tag."""
+        if self._tag_nach_id is None:
+            tag_nach_id = array("i", [0]) * self._nächste_id
+            for vorhandene_id, tag in zip(self._ids, self._tage):
+                tag_nach_id[vorhandene_id] = tag
+            # Markierte Einträge haben die ID 0
+            tag_nach_id[_GELÖSCHT] = 0
+            self._tag_nach_id = tag_nach_id
+        if not 0 < eintrag_id < len(self._tag_nach_id) \
+                or not self._tag_nach_id[eintrag_id]:
+            raise KeyError(eintrag_id)
+        tag = self._tag_nach_id[eintrag_id]
+        start = bisect_left(self._tage, tag)
+        return self._ids.index(eintrag_id, start,
+                               bisect_right(self._tage, tag, start))
+
+    def _verdichten(self):
+        """Entfernt gelöschte Einträge aus den Spalten (siehe löschen)."""
+        if not self._lücken:
+            return
+        with nachlade_sperre:
+            if not self._lücken:
+                return
+            # Die Abschnitte zwischen den Lücken werden als Ganzes
+            # kopiert
+            lücken = sorted(self._lücken)
+            start = lücken[0]
+            abschnitte = list(zip([p + 1 for p in lücken],
+                                  lücken[1:] + [len(self._ids)]))
+            for spalte in (self._tage, self._rappen, self._codes,
+                           self._ids):
+                rest = array(spalte.typecode)
+                for von, bis in abschnitte:
+                    rest += spalte[von:bis]
+                spalte[start:] = rest
+            self._präfix_kürzen(start)
+            self._lücken = []
+
+    def _spalten_setzen(self, tage, rappen, codes):
+        self._tage = tage
+        self._rappen = rappen
+        self._codes = codes
+        self._präfix = array("q", [0])
+        self._präfix_ergänzen()
+        self._gesamt = self._präfix[-1]
+        # Die Tage sind sortiert: jeder Monat ist ein zusammenhängender
+        # Bereich, dessen Grenzen per bisect gefunden werden
+        self._monats_summen = {}
+        self._monats_anzahl = {}
+        start = 0
+        while start < len(tage):
+            tag = date.fromordinal(tage[start])
+            monats_ende = bisect_left(tage, date(
+                tag.year + tag.month // 12, tag.month % 12 + 1,
+                1).toordinal(), start)
+            monat = tag_als_monat(tage[start])
+            self._monats_anzahl[monat] = monats_ende - start
+            self._monats_summen[monat] = (self._präfix[monats_ende]
+                                          - self._präfix[start])
+            start = monats_ende
+
+    def _präfix_kürzen(self, position):
+        del self._präfix[position + 1:]
+
+    def _präfix_ergänzen(self):
+        bekannt = len(self._präfix) - 1
+        summen = accumulate(self._rappen[bekannt:],
+                            initial=self._präfix[-1])
+        next(summen)
+        self._präfix.extend(summen)
+
+    def _summen_anpassen(self, tag, rappen, richtung):
+        monat = tag_als_monat(tag)
+        anzahl = self._monats_anzahl.get(monat, 0) + richtung
+        if anzahl:
+            self._monats_anzahl[monat] = anzahl
+            self._monats_summen[monat] = (
+                self._monats_summen.get(monat, 0) + richtung * rappen)
+        else:
+            del self._monats_anzahl[monat]
+            del self._monats_summen[monat]
+        self._gesamt += richtung * rappen
+
+    def __iter__(self):
+        self._verdichten()
+        return map(self._eintrag, range(len(self._tage)))
+
+    def __len__(self):
+        self._verdichten()
+        return len(self._tage)
+
+    def __getitem__(self, position):
+        self._verdichten()
+        if isinstance(position, slice):
+            return list(map(self._eintrag,
+                            range(*position.indices(len(self._tage)))))
+        return self._eintrag(position)
+
+    def __repr__(self):
+        return f"EintragsListe({list(self)!r})"
+
+
+class VerzögerteEintragsListe(EintragsListe):
+    """
+    EintragsListe, deren Einträge erst beim ersten Zugriff geladen
+    werden (z.B. beim Öffnen oder Auswerten der Kategorie).
+
+    Jeder Attributzugriff lädt die Einträge über die Quelle und macht
+    das Objekt danach zu einer gewöhnlichen EintragsListe; weitere
+    Zugriffe kosten damit nichts extra. Verweise auf die Liste (z.B.
+    in budget_kategorien) bleiben gültig.
+
+    Args:
+        quelle (callable): Liefert die Eintrag-Objekte der Kategorie
+                           oder eine fertige EintragsListe
+    """
+
+    __slots__ = ()
+
+    def __init__(self, quelle):
+        object.__setattr__(self, "_quelle", quelle)
+
+    def __getattribute__(self, name):
+        with nachlade_sperre:
+            if type(self) is VerzögerteEintragsListe:
+                einträge = object.__getattribute__(self, "_quelle")()
+                # Erst nach erfolgreichem Laden umstellen, damit ein
+                # Lesefehler keine leere Liste hinterlässt
+                object.__setattr__(self, "__class__", EintragsListe)
+                if isinstance(einträge, EintragsListe):
+                    for slot in EintragsListe.__slots__:
+                        object.__setattr__(self, slot,
+                                           getattr(einträge, slot))
+                else:
+                    EintragsListe.__init__(self, einträge)
+        return object.__getattribute__(self, name)
+
+
+def kostenart_code(kostenart):
+    """
+    Liefert den Code einer Kostenart und nimmt sie bei Bedarf in die
+    gemeinsame Tabelle auf.
+
+    Args:
+        kostenart (str): Kostenart
+
+    Returns:
+        int: Code in kostenart_tabelle()
+    """
+    code = _kostenart_codes.get(kostenart)
+    if code is None:
+        with _kostenarten_sperre:
+            code = _kostenart_codes.get(kostenart)
+            if code is None:
+                kostenart = sys.intern(kostenart)
+                code = len(_kostenarten)
+                _kostenarten.append(kostenart)
+                _kostenart_codes[kostenart] = code
+    return code
+
+
+def kostenart_tabelle():
+    """
+    Liefert die gemeinsame Tabelle aller Kostenarten. Die Liste wird
+    nur verlängert; der Index eines Eintrags ist sein Code.
+
+    Returns:
+        list: Kostenarten nach Code
+    """
+    return _kostenarten
+
+
+def ungeladene_quelle(einträge):
+    """
+    Liefert die Quelle einer noch nicht geladenen Liste, ohne sie
+    zu laden.
+
+    Args:
+        einträge (EintragsListe): Einträge einer Kategorie
+
+    Returns:
+        callable: Quelle der VerzögerteEintragsListe oder None,
+                  wenn die Einträge bereits geladen sind
+    """
+    if type(einträge) is not VerzögerteEintragsListe:
+        return None
+    return object.__getattribute__(einträge, "_quelle")
+
+
+def quelle_ersetzen(einträge, quelle):
+    """
+    Ersetzt die Quelle einer noch nicht geladenen Liste (nur unter
+    nachlade_sperre aufrufen).
+
+    Args:
+        einträge (VerzögerteEintragsListe): Ungeladene Einträge
+        quelle (callable): Neue Quelle
+    """
+    object.__setattr__(einträge, "_quelle", quelle)
+
+
+@lru_cache(maxsize=None)
+def datum_als_tag(datum_str):
+    """
+    Wandelt ein Datum im Format DD.MM.YYYY in eine Tages-Ordinalzahl um.
+
+    Args:
+        datum_str (str): Datum als String im Format DD.MM.YYYY
+
+    Returns:
+        int: Tages-Ordinalzahl
+
+    Raises:
+        ValueError: Wenn das Datum ungültig ist
+    """
+    teile = datum_str.split(".")
+    if len(teile) != 3:
+        raise ValueError(f"Ungültiges Datum: {datum_str!r}")
+    return date(int(teile[2]), int(teile[1]), int(teile[0])).toordinal()
+
+
+@lru_cache(maxsize=None)
+def tag_als_datum(tag):
+    """Wandelt eine Tages-Ordinalzahl in ein Datum DD.MM.YYYY um."""
+    return date.fromordinal(tag).strftime("%d.%m.%Y")
+
+
+@lru_cache(maxsize=None)
+def tag_als_monat(tag):
+    """Wandelt eine Tages-Ordinalzahl in einen Monatsschlüssel YYYY-MM um."""
+    d = date.fromordinal(tag)
+    return f"{d.year:04d}-{d.month:02d}"
+
+
+def betrag_als_rappen(betrag):
+    """
+    Rechnet einen Betrag in ganze Rappen um.
+
+    Args:
+        betrag (float): Betrag in CHF
+
+    Returns:
+        int: Betrag in Rappen (z.B. 2.5 -> 250)
+
+    Raises:
+        ValueError: Wenn der Betrag nicht endlich ist oder sein
+                    Absolutwert MAX_BETRAG übersteigt
+    """
+    if not math.isfinite(betrag) or abs(betrag) > MAX_BETRAG:
+        raise ValueError(f"Ungültiger Betrag: {betrag!r}")
+    return round(betrag * 100)
+
+
+def betrag_als_text(betrag):
+    """
+    Formatiert einen Betrag für das Textformat der Einträge.
+    Ganze Beträge ohne Nachkommastellen, sonst mit zwei.
+
+    Args:
+        betrag (float): Betrag in CHF
+
+    Returns:
+        str: Formatierter Betrag (z.B. "750" oder "2.50")
+    """
+    text = f"{betrag:.2f}"
+    return text[:-3] if text.endswith(".00") else text
+
+
+def eintrag_erstellen(datum_str, kostenart, betrag):
+    """
+    Erstellt einen Eintrag aus validierten Benutzereingaben.
+
+    Args:
+        datum_str (str): Datum im Format DD.MM.YYYY
+        kostenart (str): Art der Kosten
+        betrag (float): Betrag in CHF
+
+    Returns:
+        Eintrag: Der neue Eintrag
+    """
+    return Eintrag(datum_als_tag(datum_str), kostenart.strip(), float(betrag))
+
+
+def eintrag_aus_text(zeile):
+    """
+    Parst einen Eintrag im Format "DD.MM.YYYY - Kostenart - Betrag CHF".
+
+    Args:
+        zeile (str): Eintrag im Textformat
+
+    Returns:
+        Eintrag | None: Der geparste Eintrag oder None bei Formatfehler
+                        oder einem Betrag ausserhalb von MAX_BETRAG
+    """
+    teile = zeile.split(EINTRAG_TRENNER)
+    if len(teile) != 3:
+        return None
+    try:
+        betrag = float(teile[2].replace("CHF", "").strip())
+        betrag_als_rappen(betrag)
+        return Eintrag(datum_als_tag(teile[0].strip()),
+                       teile[1].strip(), betrag)
+    except ValueError:
+        return None
+
+
+def eintrag_als_text(eintrag):
+    """
+    Wandelt einen Eintrag in das Textformat der JSON-Datei um.
+
+    Args:
+        eintrag (Eintrag): Der Eintrag
+
+    Returns:
+        str: Eintrag im Format "DD.MM.YYYY - Kostenart - Betrag CHF"
+    """
+    return (f"{tag_als_datum(eintrag.tag)}{EINTRAG_TRENNER}"
+            f"{eintrag.kostenart}{EINTRAG_TRENNER}"
+            f"{betrag_als_text(eintrag.betrag)} CHF")
+
+
+def kategorien_aus_texten(kategorien_texte):
+    """
+    Parst alle Kategorien aus dem Textformat in das Eintrags-Modell.
+    Nicht lesbare Einträge werden gemeldet und unverändert aufbewahrt.
+
+    Args:
+        kategorien_texte (dict): Kategorien mit Einträgen als Strings
+
+    Returns:
+        dict: Kategorien mit EintragsListe-Objekten
+    """
+    return {kategorie: einträge_aus_texten(kategorie, zeilen)
+            for kategorie, zeilen in kategorien_texte.items()}
+
+
+def einträge_aus_texten(kategorie, zeilen, ids=None, nächste_id=None):
+    """
+    Parst die Einträge einer Kategorie aus dem Textformat.
+    Nicht lesbare Einträge werden gemeldet und in
+    EintragsListe.unlesbar aufbewahrt, damit sie beim nächsten
+    Speichern nicht aus der Datei verschwinden.
+
+    Args:
+        kategorie (str): Name der Kategorie (für Warnungen)
+        zeilen (list): Einträge als Strings, nach Datum sortiert,
+                       wenn ids angegeben sind
+        ids (list, optional): Gespeicherte ID jedes Eintrags
+        nächste_id (int, optional): Nächste freie ID (nur mit ids)
+
+    Returns:
+        EintragsListe: Die Einträge der Kategorie
+    """
+    einträge = []
+    unlesbar = []
+    for nummer, zeile in enumerate(zeilen):
+        eintrag = eintrag_aus_text(zeile)
+        if eintrag is None:
+            print(f"\n\033[33mWarnung: Eintrag '{zeile}' in "
+                  f"'{kategorie}' hat ein ungültiges Format und wird "
+                  f"unverändert aufbewahrt.\033[0m")
+            unlesbar.append(zeile)
+            continue
+        if ids is not None:
+            eintrag.id = ids[nummer]
+        einträge.append(eintrag)
+    liste = (EintragsListe(einträge) if ids is None
+             else EintragsListe.aus_einträgen(einträge, nächste_id))
+    liste.unlesbar = unlesbar
+    return liste
+
+
+def einträge_als_texte(einträge):
+    """
+    Wandelt die Einträge einer Kategorie in das Textformat der
+    JSON-Datei um. Nicht lesbare Zeilen aus der Datei werden
+    unverändert angehängt.
+
+    Args:
+        einträge (EintragsListe): Einträge der Kategorie
+
+    Returns:
+        list: Einträge als Strings
+    """
+    return [*map(eintrag_als_text, einträge), *einträge.unlesbar]
+
+
+def kategorien_als_texte(budget_kategorien):
+    """
+    Wandelt alle Kategorien in das Textformat der JSON-Datei um.
+
+    Args:
+        budget_kategorien (dict): Kategorien mit Eintrag-Objekten
+
+    Returns:
+        dict: Kategorien mit Einträgen als Strings
+    """
+    return {kategorie: einträge_als_texte(einträge)
+            for kategorie, einträge in budget_kategorien.items()}
@@ -4,6 +4,66 @@ Enthält Funktionen zur Verwaltung von Budgetlimits und Finanzzielen
 """
 
 from utils import validiere_positiven_betrag, MAX_BUDGET_LIMIT
+from journal import protokollierte_änderung, metadaten_markieren
+
+
+def limit_setzen(budget_limits, kategorie, limit):
+    """
+    Setzt das Budgetlimit einer Kategorie und protokolliert die Änderung.
+
+    Args:
+        budget_limits (dict): Dictionary mit Budget-Limits
+        kategorie (str): Name der Kategorie
+        limit (float): Neues Budgetlimit in CHF
+    """
+    with protokollierte_änderung("limit_setzen",
+                                 kategorie=kategorie, limit=limit):
+        budget_limits[kategorie] = limit
+        metadaten_markieren()
+
+
+def limit_entfernen(budget_limits, kategorie):
+    """
+    Entfernt das Budgetlimit einer Kategorie und protokolliert
+    die Änderung.
+
+    Args:
+        budget_limits (dict): Dictionary mit Budget-Limits
+        kategorie (str): Name der Kategorie
+    """
+    with protokollierte_änderung("limit_entfernen", kategorie=kategorie):
+        del budget_limits[kategorie]
+        metadaten_markieren()
+
+
+def ziel_setzen(finanzziele, kategorie, ziel, meldung):
+    """
+    Setzt das Finanzziel einer Kategorie und protokolliert die Änderung.
+
+    Args:
+        finanzziele (dict): Dictionary mit Finanzzielen
+        kategorie (str): Name der Kategorie
+        ziel (float): Zielbetrag in CHF
+        meldung (str): Meldung bei Zielerreichung
+    """
+    with protokollierte_änderung("ziel_setzen", kategorie=kategorie,
+                                 ziel=ziel, meldung=meldung):
+        finanzziele[kategorie] = {"ziel": ziel, "meldung": meldung}
+        metadaten_markieren()
+
+
+def ziel_entfernen(finanzziele, kategorie):
+    """
+    Entfernt das Finanzziel einer Kategorie und protokolliert
+    die Änderung.
+
+    Args:
+        finanzziele (dict): Dictionary mit Finanzzielen
+        kategorie (str): Name der Kategorie
+    """
+    with protokollierte_änderung("ziel_entfernen", kategorie=kategorie):
+        del finanzziele[kategorie]
+        metadaten_markieren()
 
 
 def finanzkontrolle(budget_kategorien,
@@ -108,7 +168,7 @@ def _budgetlimite_verwalten(kategorie,
                     f"CHF):\033[0m")
                 )
                 if validiere_positiven_betrag(limit, MAX_BUDGET_LIMIT):
-                    budget_limits[kategorie] = limit
+                    limit_setzen(budget_limits, kategorie, limit)
                     daten_speichern_func()
                     print(f"\n\033[32mBudgetlimite gesetzt: {limit:.2f} "
                           f"CHF\033[0m")
@@ -125,7 +185,7 @@ def _budgetlimite_verwalten(kategorie,
                                     f"(max. {MAX_BUDGET_LIMIT:.2f} CHF):\033[0m"))
                     if validiere_positiven_betrag(neues_limit,
                                                   MAX_BUDGET_LIMIT):
-                        budget_limits[kategorie] = neues_limit
+                        limit_setzen(budget_limits, kategorie, neues_limit)
                         daten_speichern_func()
                         print(
                             f"\n\033[32mLimit geändert auf {neues_limit:.2f} "
@@ -135,7 +195,7 @@ def _budgetlimite_verwalten(kategorie,
 
         elif auswahl == "4":
             if kategorie in budget_limits:
-                del budget_limits[kategorie]
+                limit_entfernen(budget_limits, kategorie)
                 daten_speichern_func()
                 print(f"\n\033[32mLimit entfernt.\033[0m")
             else:
@@ -175,7 +235,7 @@ def _finanzziel_verwalten(kategorie,
                 if validiere_positiven_betrag(ziel):
                     meldung = (
                         timed_input("\033[34mMeldung bei Zielerreichung:\033[0m").strip())
-                    finanzziele[kategorie] = {"ziel": ziel, "meldung": meldung}
+                    ziel_setzen(finanzziele, kategorie, ziel, meldung)
                     daten_speichern_func()
                     print(f"\n\033[32mZiel {ziel} CHF gespeichert.\033[0m")
             except ValueError:
@@ -189,8 +249,8 @@ def _finanzziel_verwalten(kategorie,
                     neues_ziel = float(timed_input("\n\033[34mNeues Ziel in CHF:\033[0m"))
                     if validiere_positiven_betrag(neues_ziel):
                         neue_meldung = timed_input("\033[34mNeue Meldung:\033[0m").strip()
-                        finanzziele[kategorie] = {"ziel": neues_ziel,
-                                                  "meldung": neue_meldung}
+                        ziel_setzen(finanzziele, kategorie,
+                                    neues_ziel, neue_meldung)
                         daten_speichern_func()
                         print(f"\n\033[32mZiel aktualisiert.\033[0m")
                 except ValueError:
@@ -198,7 +258,7 @@ def _finanzziel_verwalten(kategorie,
 
         elif auswahl == "4":
             if kategorie in finanzziele:
-                del finanzziele[kategorie]
+                ziel_entfernen(finanzziele, kategorie)
                 daten_speichern_func()
                 print(f"\n\033[32mZiel entfernt.\033[0m")
             else:
@@ -0,0 +1,245 @@
+"""
+Journal-Modul für Budget-Tracker
+Enthält das Änderungsprotokoll, das zwischen zwei Snapshots
+an die Journal-Datei angehängt wird
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from tracing import gemessen, bytes_zählen
+
+
+JOURNAL_DATEI = "budget_daten.journal"
+
+# Schwellwerte, ab denen das Journal in einen neuen Snapshot
+# kompaktiert wird
+KOMPAKTIERUNG_MAX_BYTES = 1024 * 1024
+KOMPAKTIERUNG_MAX_ALTER = 7 * 24 * 60 * 60
+
+# Änderungen, die seit dem letzten Speichern angefallen sind
+_offene_änderungen = []
+
+# Seit dem letzten Speichern geänderte Kategorien (id -> EintragsListe)
+# und Metadaten (Limits, Ziele, Passwort); ein Backend mit einer Datei
+# pro Kategorie schreibt nur diese neu (siehe shard_storage.py)
+_geänderte_kategorien = {}
+_metadaten_geändert = False
+
+# Schützt die Daten, solange eine Änderung ausgeführt und protokolliert
+# oder ein Snapshot im Hintergrund serialisiert wird
+änderungs_sperre = threading.RLock()
+
+
+@contextmanager
+def protokollierte_änderung(operation, **daten):
+    """
+    Führt eine Änderung unter der Änderungssperre aus und merkt sie
+    für das nächste Speichern vor. Schlägt die Änderung fehl, wird
+    nichts protokolliert.
+
+    Args:
+        operation (str): Name der Operation (z.B. "eintrag_hinzufügen")
+        **daten: JSON-kompatible Parameter der Operation
+    """
+    with änderungs_sperre:
+        yield
+        _offene_änderungen.append({"op": operation, **daten})
+
+
+def offene_änderungen_übernehmen():
+    """
+    Übernimmt alle vorgemerkten Änderungen zum Schreiben.
+
+    Returns:
+        list: Die vorgemerkten Änderungen (danach ist die Liste leer)
+    """
+    global _offene_änderungen
+
+    with änderungs_sperre:
+        änderungen = _offene_änderungen
+        _offene_änderungen = []
+        markierungen_übernehmen()
+    return änderungen
+
+
+def änderungen_zurücklegen(änderungen, markiert=None):
+    """
+    Legt übernommene Änderungen und Markierungen wieder zurück, wenn
+    das Schreiben fehlgeschlagen ist. Sie stehen vor den inzwischen
+    neu angefallenen Änderungen, damit die Reihenfolge erhalten bleibt.
+
+    Args:
+        änderungen (list): Von offene_änderungen_übernehmen übernommen
+        markiert (tuple, optional): Von markierungen_übernehmen
+                                    übernommene Markierungen
+    """
+    global _metadaten_geändert
+
+    with änderungs_sperre:
+        _offene_änderungen[:0] = änderungen
+        if markiert is not None:
+            geänderte, metadaten_geändert = markiert
+            for einträge in geänderte:
+                _geänderte_kategorien.setdefault(id(einträge), einträge)
+            _metadaten_geändert = _metadaten_geändert or metadaten_geändert
+
+
+def offene_änderungen_vorhanden():
+    """
+    Prüft, ob seit dem letzten Speichern Änderungen angefallen sind.
+
+    Returns:
+        bool: True wenn Änderungen vorgemerkt sind
+    """
+    return bool(_offene_änderungen)
+
+
+def offene_änderungen_verwerfen():
+    """Verwirft alle vorgemerkten Änderungen (z.B. nach einem Snapshot)."""
+    offene_änderungen_übernehmen()
+
+
+def kategorie_markieren(einträge):
+    """
+    Markiert die Einträge einer Kategorie als geändert. Die Markierung
+    hängt an der Liste selbst und übersteht so ein Umbenennen.
+
+    Args:
+        einträge (EintragsListe): Geänderte Einträge
+    """
+    _geänderte_kategorien[id(einträge)] = einträge
+
+
+def metadaten_markieren():
+    """Markiert Limits, Ziele oder Passwort als geändert."""
+    global _metadaten_geändert
+
+    _metadaten_geändert = True
+
+
+def markierungen_übernehmen():
+    """
+    Übernimmt die Änderungsmarkierungen zum Schreiben.
+
+    Returns:
+        tuple: (geänderte EintragsListe-Objekte,
+                True wenn Metadaten geändert wurden)
+    """
+    global _geänderte_kategorien, _metadaten_geändert
+
+    with änderungs_sperre:
+        markiert = (list(_geänderte_kategorien.values()),
+                    _metadaten_geändert)
+        _geänderte_kategorien = {}
+        _metadaten_geändert = False
+    return markiert
+
+
+@gemessen
+def journal_anhängen(stand, änderungen):
+    """
+    Hängt Änderungen an die Journal-Datei an.
+    Die Kosten hängen nur von der Anzahl Änderungen ab,
+    nicht von der Grösse des Datenbestands.
+
+    Args:
+        stand (int): Journal-Stand des zugehörigen Snapshots
+        änderungen (list): Zu schreibende Änderungen
+
+    Returns:
+        int: Anzahl geschriebener Bytes
+    """
+    if not änderungen:
+        return 0
+
+    zeilen = []
+    if not os.path.exists(JOURNAL_DATEI):
+        zeilen.append(json.dumps({"stand": stand}))
+    for änderung in änderungen:
+        zeilen.append(json.dumps(änderung, ensure_ascii=False))
+    text = "\n".join(zeilen) + "\n"
+
+    with open(JOURNAL_DATEI, "a", encoding="utf-8") as f:
+        f.write(text)
+    anzahl = len(text.encode("utf-8"))
+    bytes_zählen(anzahl)
+    return anzahl
+
+
+def journal_lesen(stand):
+    """
+    Liest die Änderungen aus der Journal-Datei.
+    Ein Journal mit anderem Stand als der Snapshot ist bereits
+    im Snapshot enthalten und wird gelöscht. Eine abgebrochene
+    letzte Zeile (z.B. nach einem Absturz) wird abgeschnitten.
+
+    Args:
+        stand (int): Journal-Stand des geladenen Snapshots
+
+    Returns:
+        list: Änderungen in der Reihenfolge ihres Auftretens
+    """
+    if not os.path.exists(JOURNAL_DATEI):
+        return []
+
+    änderungen = []
+    gültig_bis = None
+    with open(JOURNAL_DATEI, "rb") as f:
+        kopf = _zeile_lesen(f.readline())
+        if kopf is None or kopf.get("stand") != stand:
+            gültig_bis = 0
+        else:
+            position = f.tell()
+            for zeile in f:
+                änderung = _zeile_lesen(zeile)
+                if änderung is None:
+                    print("\n\033[33mWarnung: Unvollständiger "
+                          "Journal-Eintrag wird ignoriert.\033[0m")
+                    gültig_bis = position
+                    break
+                änderungen.append(änderung)
+                position += len(zeile)
+
+    if gültig_bis == 0:
+        journal_löschen()
+    elif gültig_bis is not None:
+        os.truncate(JOURNAL_DATEI, gültig_bis)
+    return änderungen
+
+
+def _zeile_lesen(zeile):
+    """Dekodiert eine vollständige Journal-Zeile oder liefert None."""
+    if not zeile.endswith(b"\n"):
+        return None
+    try:
+        return json.loads(zeile)
+    except ValueError:
+        return None
+
+
+def journal_löschen():
+    """Löscht die Journal-Datei, falls vorhanden."""
+    if os.path.exists(JOURNAL_DATEI):
+        os.remove(JOURNAL_DATEI)
+
+
+def kompaktierung_fällig(snapshot_datei):
+    """
+    Prüft, ob das Journal in einen neuen Snapshot überführt werden soll.
+
+    Args:
+        snapshot_datei (str): Pfad zur Snapshot-Datei
+
+    Returns:
+        bool: True wenn Grösse oder Alter den Schwellwert erreicht
+    """
+    if not os.path.exists(JOURNAL_DATEI):
+        return False
+    if os.path.getsize(JOURNAL_DATEI) >= KOMPAKTIERUNG_MAX_BYTES:
+        return True
+    alter = time.time() - os.path.getmtime(snapshot_datei)
+    return alter >= KOMPAKTIERUNG_MAX_ALTER
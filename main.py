@@ -3,7 +3,9 @@ Budget-Tracker Hauptprogramm (ohne Klasse),
 koordiniert alle Module und stellt das Hauptmenü bereit
 """
 
-from data_handler import daten_laden, daten_speichern
+import sys
+
+from data_handler import daten_laden, daten_speichern, HintergrundSpeicher
 from auth import passwort_login, passwort_ändern
 from category_manager import (
     anzeigen_kategorien,
@@ -12,7 +14,16 @@ from category_manager import (
     kategorie_löschen
 )
 from finance_control import finanzkontrolle
-from statistic import statistik_menü
+from cli import cli_ausführen
+from csv_import import csv_import_menü
+from data_export import export_menü
+from search_index import suche_menü
+from statistic import (
+    statistik_menü,
+    fertige_diagramme_melden,
+    hintergrund_renderings_abschließen
+)
+from tracing import span
 from utils import inaktivität_wrapper
 
 
@@ -22,10 +33,31 @@ budget_limits = {}
 finanzziele = {}
 benutzer_passwort = {}
 timed_input = None
+speicher = None
+
+# Span-Namen der Menüaktionen für das Tracing (siehe tracing.py)
+MENÜ_SPANS = {
+    "1": "menü_kategorien_anzeigen",
+    "2": "menü_kategorie_hinzufügen",
+    "3": "menü_kategorie_bearbeiten",
+    "4": "menü_kategorie_löschen",
+    "5": "menü_finanzkontrolle",
+    "6": "menü_passwort_ändern",
+    "7": "menü_statistik",
+    "8": "menü_csv_import",
+    "9": "menü_export",
+    "10": "menü_suche",
+    "11": "menü_beenden",
+}
 
 
 def daten_speichern_wrapper():
-    """Wrapper-Funktion zum Speichern aller Daten."""
+    """Wrapper-Funktion, die das Speichern im Hintergrund anfordert."""
+    speicher.anfordern()
+
+
+def _alle_daten_speichern():
+    """Speichert alle Daten (wird im Speicher-Thread ausgeführt)."""
     daten_speichern(
         budget_kategorien,
         budget_limits,
@@ -38,9 +70,10 @@ def hauptmenü():
     global budget_kategorien, budget_limits, finanzziele
     global benutzer_passwort, timed_input
 
-    timed_input = inaktivität_wrapper(120, daten_speichern_wrapper)
+    timed_input = inaktivität_wrapper(120, speicher.flush)
 
     while True:
+        fertige_diagramme_melden()
         print("\n\n\033[1mKategorien Menü\033[0m")
         print("1. Kategorien anzeigen")
         print("2. Neue Kategorie hinzufügen")
@@ -49,89 +82,123 @@ def hauptmenü():
         print("5. Finanzkontrolle")
         print("6. Passwort ändern")
         print("7. Statistik anzeigen")
-        print("8. App beenden")
-
-        auswahl = timed_input("\n\033[34mWähle eine Option (1-8):\033[0m")
-
-        if auswahl == "1":
-            anzeigen_kategorien(
-                budget_kategorien,
-                timed_input
-            )
-
-        elif auswahl == "2":
-            budget_kategorien = neue_kategorie_hinzufügen(
-                budget_kategorien,
-                timed_input
-            )
-            daten_speichern_wrapper()
-
-        elif auswahl == "3":
-            budget_kategorien = kategorie_bearbeiten(
-                budget_kategorien,
-                budget_limits,
-                timed_input
-            )
-            daten_speichern_wrapper()
-
-        elif auswahl == "4":
-            budget_kategorien = kategorie_löschen(
-                budget_kategorien,
-                timed_input
-            )
-            daten_speichern_wrapper()
-
-        elif auswahl == "5":
-            budget_limits, finanzziele = finanzkontrolle(
-                budget_kategorien,
-                budget_limits,
-                finanzziele,
-                timed_input,
-                daten_speichern_wrapper
-            )
-
-        elif auswahl == "6":
-            benutzer_passwort = passwort_ändern(
-                benutzer_passwort,
-                timed_input,
-                daten_speichern_wrapper
-            )
-
-        elif auswahl == "7":
-            statistik_menü(
-                budget_kategorien,
-                budget_limits,
-                finanzziele,
-                timed_input
-            )
-
-        elif auswahl == "8":
-            print("\n\033[32mProgramm beendet.\033[0m")
-            break
-
-        else:
-            print("\n\033[31mUngültige Eingabe:"
-                  "Bitte wähle eine Zahl zwischen 1-8.\033[0m")
+        print("8. Kontoauszug importieren (CSV)")
+        print("9. Daten exportieren (CSV/JSONL)")
+        print("10. Einträge suchen")
+        print("11. App beenden")
+
+        auswahl = timed_input("\n\033[34mWähle eine Option (1-11):\033[0m")
+
+        with span(MENÜ_SPANS.get(auswahl, "menü_ungültig")):
+            if auswahl == "1":
+                anzeigen_kategorien(
+                    budget_kategorien,
+                    timed_input
+                )
+
+            elif auswahl == "2":
+                budget_kategorien = neue_kategorie_hinzufügen(
+                    budget_kategorien,
+                    timed_input
+                )
+                daten_speichern_wrapper()
+
+            elif auswahl == "3":
+                budget_kategorien = kategorie_bearbeiten(
+                    budget_kategorien,
+                    budget_limits,
+                    timed_input
+                )
+                daten_speichern_wrapper()
+
+            elif auswahl == "4":
+                budget_kategorien = kategorie_löschen(
+                    budget_kategorien,
+                    timed_input
+                )
+                daten_speichern_wrapper()
+
+            elif auswahl == "5":
+                budget_limits, finanzziele = finanzkontrolle(
+                    budget_kategorien,
+                    budget_limits,
+                    finanzziele,
+                    timed_input,
+                    daten_speichern_wrapper
+                )
+
+            elif auswahl == "6":
+                benutzer_passwort = passwort_ändern(
+                    benutzer_passwort,
+                    timed_input,
+                    daten_speichern_wrapper
+                )
+
+            elif auswahl == "7":
+                statistik_menü(
+                    budget_kategorien,
+                    budget_limits,
+                    finanzziele,
+                    timed_input
+                )
+
+            elif auswahl == "8":
+                csv_import_menü(
+                    budget_kategorien,
+                    timed_input,
+                    daten_speichern_wrapper
+                )
+
+            elif auswahl == "9":
+                export_menü(
+                    budget_kategorien,
+                    budget_limits,
+                    timed_input
+                )
+
+            elif auswahl == "10":
+                suche_menü(
+                    budget_kategorien,
+                    timed_input
+                )
+
+            elif auswahl == "11":
+                print("\n\033[32mProgramm beendet.\033[0m")
+                break
+
+            else:
+                print("\n\033[31mUngültige Eingabe:"
+                      "Bitte wähle eine Zahl zwischen 1-11.\033[0m")
 
 
 def main():
     """Hauptfunktion des Programms."""
     global budget_kategorien, budget_limits, finanzziele, benutzer_passwort
+    global speicher
+
+    # Mit Argumenten läuft das Programm ohne Menü (siehe cli.py)
+    if len(sys.argv) > 1:
+        sys.exit(cli_ausführen(sys.argv[1:]))
 
     # Daten laden
     (budget_kategorien,
      budget_limits,
      finanzziele,
      benutzer_passwort) = daten_laden()
+    speicher = HintergrundSpeicher(_alle_daten_speichern)
 
     # Login durchführen
     passwort_login(benutzer_passwort, daten_speichern_wrapper)
 
-    # Hauptmenü starten
-    hauptmenü()
+    # Hauptmenü starten; laufende Diagramme werden auch bei einem
+    # Abbruch der Eingabe noch fertiggestellt
+    try:
+        hauptmenü()
+    finally:
+        hintergrund_renderings_abschließen()
 
-    # Beim Beenden speichern
-    daten_speichern_wrapper()
+    # Beim Beenden ausstehende Daten schreiben
+    speicher.beenden()
 
 
 if __name__ == "__main__":
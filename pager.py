@@ -0,0 +1,247 @@
+"""
+Seitenansicht-Modul für Budget-Tracker
+Zeigt die Einträge einer Kategorie seitenweise an, damit auch sehr
+lange Kategorien das Terminal nicht überfluten
+"""
+
+import sys
+from bisect import bisect_left, bisect_right, insort
+
+
+SEITEN_GRÖSSE = 20
+
+# Mindestanzahl entfernter Einträge, ab der die Positionsliste einer
+# Sortierung nach Betrag verdichtet wird (sonst ein Sechzehntel)
+MIN_VERDICHTEN = 64
+
+# Sortierungen: Kürzel -> (Bezeichnung, Standardmässig absteigend)
+SORTIERUNGEN = {
+    "d": ("Datum", False),
+    "b": ("Betrag", True),
+}
+
+BEDIENUNG = ("Enter/n = nächste, v = vorherige, s<Nr> = zu Seite, "
+             "d = nach Datum, b = nach Betrag")
+
+
+class EintragsSeiten:
+    """
+    Seitenweise Sicht auf eine EintragsListe, optional auf einen
+    Zeitraum beschränkt.
+
+    Die Einträge liegen bereits nach Datum sortiert vor; der Zeitraum
+    wird per bisect bestimmt. Eine Sortierung nach Betrag wird einmal
+    als Positionsliste berechnet; danach kostet jede Seite nur Arbeit
+    proportional zur Seitengrösse. Entfernte Einträge werden in der
+    Positionsliste wie die Lücken der EintragsListe nur vermerkt und
+    beim Nachschlagen per bisect übersprungen; verdichtet wird erst,
+    wenn sich viele angesammelt haben.
+
+    Attributes:
+        seite (int): Aktuelle Seite (0-basiert)
+        sortierung (str): Kürzel der Sortierung (siehe SORTIERUNGEN)
+        absteigend (bool): True, wenn absteigend sortiert wird
+    """
+
+    def __init__(self, einträge, zeitraum=(None, None),
+                 seiten_grösse=SEITEN_GRÖSSE):
+        self._einträge = einträge
+        self._zeitraum = zeitraum
+        self._seiten_grösse = seiten_grösse
+        # Positionsliste bei Sortierung nach Betrag (sonst None)
+        self._reihenfolge = None
+        # Position -> Index in _reihenfolge, beim ersten Entfernen
+        # aufgebaut
+        self._index_von = None
+        # Sortierte Indizes in _reihenfolge und sortierte Positionen
+        # (Stand der Positionsliste) der seither entfernten Einträge
+        self._entfernte_indizes = []
+        self._entfernte_positionen = []
+        self.seite = 0
+        self.sortierung = "d"
+        self.absteigend = False
+
+    def anzahl(self):
+        """int: Anzahl Einträge im Zeitraum."""
+        start, ende = self._einträge.bereich(*self._zeitraum)
+        return ende - start
+
+    def anzahl_seiten(self):
+        """int: Anzahl Seiten (mindestens 1)."""
+        return max(1, -(-self.anzahl() // self._seiten_grösse))
+
+    def sortieren(self, sortierung):
+        """
+        Sortiert nach Datum oder Betrag und springt auf die erste
+        Seite. Dieselbe Sortierung ein zweites Mal kehrt die
+        Richtung um.
+
+        Args:
+            sortierung (str): Kürzel aus SORTIERUNGEN
+        """
+        if sortierung == self.sortierung:
+            self.absteigend = not self.absteigend
+        else:
+            self.sortierung = sortierung
+            self.absteigend = SORTIERUNGEN[sortierung][1]
+        self.seite = 0
+        self._reihenfolge_berechnen()
+
+    def _reihenfolge_berechnen(self):
+        """Berechnet die Positionsliste der aktuellen Sortierung."""
+        self._index_von = None
+        self._entfernte_indizes = []
+        self._entfernte_positionen = []
+        if self.sortierung == "d":
+            # Nach Datum ergibt sich die Position direkt aus dem Bereich
+            self._reihenfolge = None
+            return
+        start, ende = self._einträge.bereich(*self._zeitraum)
+        _, rappen = self._einträge.spalten()
+        self._reihenfolge = sorted(range(start, ende),
+                                   key=rappen.__getitem__,
+                                   reverse=self.absteigend)
+
+    def blättern(self, seite):
+        """
+        Wechselt auf eine Seite, begrenzt auf die vorhandenen Seiten.
+
+        Args:
+            seite (int): Gewünschte Seite (0-basiert)
+        """
+        self.seite = min(max(seite, 0), self.anzahl_seiten() - 1)
+
+    def position(self, nummer):
+        """
+        Übersetzt eine Nummer der aktuellen Seite in die Position
+        des Eintrags in der Kategorie.
+
+        Args:
+            nummer (int): Nummer auf der Seite (1-basiert)
+
+        Returns:
+            int: Position in der EintragsListe (0-basiert)
+
+        Raises:
+            IndexError: Wenn die Nummer nicht auf der Seite steht
+        """
+        start, ende = self._seitenbereich()
+        if not 1 <= nummer <= ende - start:
+            raise IndexError(nummer)
+        return self._position(start + nummer - 1)
+
+    def eintrag_entfernt(self, position):
+        """
+        Passt die Sortierung an einen entfernten Eintrag an,
+        ohne neu zu sortieren. Der Eintrag wird nur vermerkt
+        (O(log k) bei k vermerkten Einträgen).
+
+        Args:
+            position (int): Position des entfernten Eintrags
+        """
+        if self._reihenfolge is not None:
+            if self._index_von is None:
+                self._index_von = {p: index for index, p
+                                   in enumerate(self._reihenfolge)}
+            position = _überspringen(position, self._entfernte_positionen)
+            insort(self._entfernte_positionen, position)
+            insort(self._entfernte_indizes, self._index_von[position])
+            if len(self._entfernte_indizes) >= max(
+                    MIN_VERDICHTEN, len(self._reihenfolge) // 16):
+                self._verdichten()
+        self.blättern(self.seite)
+
+    def _verdichten(self):
+        """Entfernt die vermerkten Einträge in einem Durchgang."""
+        entfernt = set(self._entfernte_positionen)
+        positionen = self._entfernte_positionen
+        self._reihenfolge = [p - bisect_left(positionen, p)
+                             for p in self._reihenfolge
+                             if p not in entfernt]
+        self._index_von = None
+        self._entfernte_indizes = []
+        self._entfernte_positionen = []
+
+    def eintrag_geändert(self):
+        """
+        Sortiert nach der Änderung eines Eintrags neu (Datum und
+        Betrag können sich geändert haben) und bleibt auf der
+        aktuellen Seite.
+        """
+        self._reihenfolge_berechnen()
+        self.blättern(self.seite)
+
+    def befehl_ausführen(self, eingabe):
+        """
+        Führt einen Navigations- oder Sortierbefehl aus.
+
+        Args:
+            eingabe (str): Eingabe des Benutzers (z.B. "n", "s3", "b")
+
+        Returns:
+            bool: True, wenn die Eingabe ein Seitenbefehl war
+        """
+        eingabe = eingabe.strip().lower()
+        if eingabe in ("", "n"):
+            self.blättern(self.seite + 1)
+        elif eingabe == "v":
+            self.blättern(self.seite - 1)
+        elif eingabe in SORTIERUNGEN:
+            self.sortieren(eingabe)
+        elif eingabe.startswith("s") and eingabe[1:].strip().isdigit():
+            self.blättern(int(eingabe[1:]) - 1)
+        else:
+            return False
+        return True
+
+    def anzeigen(self, ausgabe=None):
+        """
+        Gibt die aktuelle Seite mit einem einzigen Schreibaufruf aus.
+
+        Args:
+            ausgabe (file, optional): Ziel der Ausgabe (Standard: stdout)
+        """
+        start, ende = self._seitenbereich()
+        bezeichnung = SORTIERUNGEN[self.sortierung][0]
+        richtung = "absteigend" if self.absteigend else "aufsteigend"
+        zeilen = [
+            f"{'Nr':>4}  {'Datum':<15} {'Kostenart':<30} "
+            f"{'Betrag (CHF)':>15}\n",
+            "-" * 67 + "\n",
+        ]
+        for nummer, index in enumerate(range(start, ende), start=1):
+            eintrag = self._einträge[self._position(index)]
+            zeilen.append(f"{nummer:>4}. {eintrag.datum:<15} "
+                          f"{eintrag.kostenart:<30} "
+                          f"{eintrag.betrag:>15.2f}\n")
+        zeilen.append(f"\nSeite {self.seite + 1}/{self.anzahl_seiten()} "
+                      f"({self.anzahl()} Einträge, sortiert nach "
+                      f"{bezeichnung} {richtung})\n")
+        (ausgabe or sys.stdout).write("".join(zeilen))
+
+    def _seitenbereich(self):
+        """Indizes der aktuellen Seite innerhalb der Ansicht."""
+        start = self.seite * self._seiten_grösse
+        return start, min(start + self._seiten_grösse, self.anzahl())
+
+    def _position(self, index):
+        """Position des index-ten Eintrags der Ansicht in der Liste."""
+        if self._reihenfolge is None:
+            start, ende = self._einträge.bereich(*self._zeitraum)
+            return ende - 1 - index if self.absteigend else start + index
+        position = self._reihenfolge[
+            _überspringen(index, self._entfernte_indizes)]
+        return position - bisect_left(self._entfernte_positionen, position)
+
+
+def _überspringen(nummer, lücken):
+    """
+    Liefert den Index des nummer-ten Elements (0-basiert), wenn die
+    Indizes in der sortierten Liste lücken fehlen.
+    """
+    index = nummer
+    while True:
+        nächster = nummer + bisect_right(lücken, index)
+        if nächster == index:
+            return index
+        index = nächster
@@ -0,0 +1,135 @@
+"""
+Render-Cache-Modul für Budget-Tracker
+Enthält einen Cache für Statistik-Diagramme, der über einen
+Fingerabdruck der Eingabedaten bereits gerenderte PNGs wiederverwendet
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+
+
+CACHE_VERZEICHNIS = ".diagramm_cache"
+MANIFEST_DATEI = os.path.join(CACHE_VERZEICHNIS, "manifest.json")
+
+# Bei Änderungen an den Plot-Funktionen erhöhen, damit alte
+# Renderings nicht mehr verwendet werden
+RENDER_VERSION = 1
+
+# Anzahl Renderings, die pro Diagramm aufbewahrt werden
+MAX_PRO_DIAGRAMM = 8
+
+
+def fingerabdruck(dateiname, *eingaben):
+    """
+    Berechnet einen Inhalts-Hash über die Eingaben eines Diagramms.
+
+    Args:
+        dateiname (str): Name der Ausgabedatei
+        *eingaben: JSON-kompatible Eingabedaten des Diagramms
+
+    Returns:
+        str: Hexadezimaler SHA-256-Fingerabdruck
+    """
+    text = json.dumps([RENDER_VERSION, dateiname, eingaben],
+                      ensure_ascii=False, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def aus_cache_holen(dateiname, schlüssel):
+    """
+    Stellt ein bereits gerendertes Diagramm als Ausgabedatei bereit.
+
+    Args:
+        dateiname (str): Name der Ausgabedatei
+        schlüssel (str): Fingerabdruck der Eingabedaten
+
+    Returns:
+        bool: True wenn das Diagramm aus dem Cache stammt
+    """
+    manifest = _manifest_laden()
+    eintrag = manifest["renderings"].get(schlüssel)
+    cache_pfad = _cache_pfad(schlüssel)
+    if eintrag is None or not os.path.exists(cache_pfad):
+        return False
+
+    if (manifest["aktuell"].get(dateiname) != schlüssel
+            or not os.path.exists(dateiname)):
+        shutil.copyfile(cache_pfad, dateiname)
+    eintrag["zuletzt"] = time.time()
+    manifest["aktuell"][dateiname] = schlüssel
+    _manifest_speichern(manifest)
+    return True
+
+
+def rendering_pfad(schlüssel):
+    """
+    Liefert den Pfad, unter dem ein Rendering im Cache liegt.
+    Plot-Funktionen schreiben ihr PNG direkt dorthin.
+
+    Args:
+        schlüssel (str): Fingerabdruck der Eingabedaten
+
+    Returns:
+        str: Pfad der PNG-Datei im Cache-Verzeichnis
+    """
+    os.makedirs(CACHE_VERZEICHNIS, exist_ok=True)
+    return _cache_pfad(schlüssel)
+
+
+def rendering_übernehmen(dateiname, schlüssel, ausgeben=True):
+    """
+    Nimmt ein frisch gerendertes Diagramm in den Cache auf, stellt es
+    als Ausgabedatei bereit und entfernt veraltete Renderings
+    desselben Diagramms.
+
+    Args:
+        dateiname (str): Name der Ausgabedatei
+        schlüssel (str): Fingerabdruck der Eingabedaten
+        ausgeben (bool): False, wenn das Rendering inzwischen überholt
+                         ist und nur im Cache abgelegt werden soll
+    """
+    manifest = _manifest_laden()
+    manifest["renderings"][schlüssel] = {"datei": dateiname,
+                                         "zuletzt": time.time()}
+    if ausgeben:
+        shutil.copyfile(_cache_pfad(schlüssel), dateiname)
+        manifest["aktuell"][dateiname] = schlüssel
+    _veraltete_entfernen(manifest, dateiname)
+    _manifest_speichern(manifest)
+
+
+def _veraltete_entfernen(manifest, dateiname):
+    """Behält pro Diagramm nur die zuletzt verwendeten Renderings."""
+    renderings = sorted(
+        (r["zuletzt"], s) for s, r in manifest["renderings"].items()
+        if r["datei"] == dateiname)
+    for _, schlüssel in renderings[:-MAX_PRO_DIAGRAMM]:
+        del manifest["renderings"][schlüssel]
+        if os.path.exists(_cache_pfad(schlüssel)):
+            os.remove(_cache_pfad(schlüssel))
+
+
+def _cache_pfad(schlüssel):
+    return os.path.join(CACHE_VERZEICHNIS, f"{schlüssel}.png")
+
+
+def _manifest_laden():
+    try:
+        with open(MANIFEST_DATEI, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    manifest.setdefault("renderings", {})
+    manifest.setdefault("aktuell", {})
+    return manifest
+
+
+def _manifest_speichern(manifest):
+    os.makedirs(CACHE_VERZEICHNIS, exist_ok=True)
+    temp_pfad = MANIFEST_DATEI + ".tmp"
+    with open(temp_pfad, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=4)
+    os.replace(temp_pfad, MANIFEST_DATEI)
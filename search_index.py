@@ -0,0 +1,339 @@
+"""
+Such-Modul für Budget-Tracker
+Enthält einen invertierten Index über die Kostenarten aller Kategorien
+und das Such-Menü
+"""
+
+import heapq
+import re
+import time
+import unicodedata
+from itertools import compress, islice
+
+from entry_model import (betrag_als_rappen, kostenart_code,
+                         kostenart_tabelle, tag_als_datum)
+
+
+# Anzahl Treffer, die in der Suche einzeln aufgeführt werden
+MAX_TREFFER_ANZEIGE = 20
+
+_WORT_MUSTER = re.compile(r"\w+")
+
+# Index der geladenen Daten; wird bei der ersten Suche aufgebaut und
+# danach von den Operationen in category_manager nachgeführt
+_index = None
+
+
+def normalisieren(text):
+    """
+    Normalisiert Text für die Suche: Kleinschreibung und Umlaute
+    ohne Punkte (z.B. "Bücher" -> "bucher").
+
+    Args:
+        text (str): Zu normalisierender Text
+
+    Returns:
+        str: Normalisierter Text
+    """
+    zerlegt = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(z for z in zerlegt if not unicodedata.combining(z))
+
+
+def wörter(text):
+    """
+    Zerlegt Text in normalisierte Suchwörter.
+
+    Args:
+        text (str): Kostenart oder Suchanfrage
+
+    Returns:
+        list: Normalisierte Wörter (z.B. "Netflix Abo" -> netflix, abo)
+    """
+    return _WORT_MUSTER.findall(normalisieren(text))
+
+
+class _Gruppe:
+    """Anzahl und Summe (in Rappen) einer Kostenart in einer Kategorie."""
+
+    __slots__ = ("anzahl", "summe")
+
+    def __init__(self):
+        self.anzahl = 0
+        self.summe = 0
+
+
+class SuchIndex:
+    """
+    Invertierter Index von Wörtern und Wortanfängen der Kostenarten
+    auf die Einträge aller Kategorien.
+
+    Da es viel weniger verschiedene Kostenarten als Einträge gibt,
+    zeigen Wörter und Präfixe auf Kostenart-Codes (siehe
+    entry_model.kostenart_code); erst diese führen pro Kategorie eine
+    Gruppe mit Anzahl und laufender Summe. Anzahlen und Summen einer
+    Suche kosten damit nur Arbeit proportional zur Anzahl passender
+    Kostenarten, nicht zur Anzahl Einträge. Die Treffer selbst werden
+    erst beim Durchlaufen aus den Code-Spalten der Kategorien gelesen.
+
+    Attributes:
+        budget_kategorien (dict): Die indexierten Kategorien
+    """
+
+    def __init__(self, budget_kategorien):
+        self.budget_kategorien = budget_kategorien
+        self._präfixe = {}          # Präfix -> Wörter
+        self._codes = {}            # Wort -> Kostenart-Codes
+        self._gruppen = {}          # Code -> {Kategorie: _Gruppe}
+        self._pro_kategorie = {}    # Kategorie -> Kostenart-Codes
+        for kategorie, einträge in budget_kategorien.items():
+            self._pro_kategorie[kategorie] = set()
+            _, rappen = einträge.spalten()
+            for code, betrag in zip(einträge.code_spalte(), rappen):
+                self._hinzufügen(kategorie, code, betrag)
+
+    def eintrag_hinzufügen(self, kategorie, eintrag):
+        """Nimmt einen Eintrag in den Index auf."""
+        self._hinzufügen(kategorie, kostenart_code(eintrag.kostenart),
+                         betrag_als_rappen(eintrag.betrag))
+
+    def eintrag_entfernen(self, kategorie, eintrag):
+        """Entfernt einen Eintrag aus dem Index."""
+        code = kostenart_code(eintrag.kostenart)
+        gruppen = self._gruppen[code]
+        gruppe = gruppen[kategorie]
+        gruppe.anzahl -= 1
+        gruppe.summe -= betrag_als_rappen(eintrag.betrag)
+        if not gruppe.anzahl:
+            del gruppen[kategorie]
+            self._pro_kategorie[kategorie].discard(code)
+            if not gruppen:
+                del self._gruppen[code]
+                self._code_entfernen(code)
+
+    def kategorie_umbenennen(self, alter_name, neuer_name):
+        """Überträgt alle Gruppen einer Kategorie auf den neuen Namen."""
+        codes = self._pro_kategorie.pop(alter_name, set())
+        for code in codes:
+            gruppen = self._gruppen[code]
+            gruppen[neuer_name] = gruppen.pop(alter_name)
+        self._pro_kategorie[neuer_name] = codes
+
+    def kategorie_entfernen(self, kategorie):
+        """Entfernt alle Einträge einer Kategorie aus dem Index."""
+        for code in self._pro_kategorie.pop(kategorie, set()):
+            gruppen = self._gruppen[code]
+            del gruppen[kategorie]
+            if not gruppen:
+                del self._gruppen[code]
+                self._code_entfernen(code)
+
+    def suchen(self, anfrage):
+        """
+        Sucht Einträge, deren Kostenart alle Suchbegriffe enthält.
+        Jeder Begriff passt auf Wörter, die mit ihm beginnen
+        ("netf" findet "Netflix Abo").
+
+        Args:
+            anfrage (str): Ein oder mehrere Suchbegriffe
+
+        Returns:
+            dict: {"begriffe": [(Begriff, Anzahl, Summe)],
+                   "kategorien": {Kategorie: (Anzahl, Summe)},
+                   "anzahl": int, "summe": float,
+                   "treffer": Iterator über (Kategorie, Eintrag),
+                              die neuesten zuerst}
+        """
+        begriffe = []
+        gemeinsam = None
+        for begriff in wörter(anfrage):
+            codes = set()
+            for wort in self._präfixe.get(begriff, ()):
+                codes |= self._codes[wort]
+            anzahl, summe = self._summieren(codes)
+            begriffe.append((begriff, anzahl, summe))
+            gemeinsam = codes if gemeinsam is None else gemeinsam & codes
+        tabelle = kostenart_tabelle()
+        gemeinsam = sorted(gemeinsam or (), key=tabelle.__getitem__)
+
+        kategorien = {}
+        for code in gemeinsam:
+            for kategorie, gruppe in self._gruppen[code].items():
+                anzahl, summe = kategorien.get(kategorie, (0, 0))
+                kategorien[kategorie] = (anzahl + gruppe.anzahl,
+                                         summe + gruppe.summe)
+        kategorien = {kategorie: (anzahl, summe / 100)
+                      for kategorie, (anzahl, summe) in kategorien.items()}
+        anzahl, summe = self._summieren(gemeinsam)
+        return {
+            "begriffe": begriffe,
+            "kategorien": kategorien,
+            "anzahl": anzahl,
+            "summe": summe,
+            "treffer": self._treffer(gemeinsam),
+        }
+
+    def _hinzufügen(self, kategorie, code, rappen):
+        gruppen = self._gruppen.get(code)
+        if gruppen is None:
+            gruppen = self._gruppen[code] = {}
+            self._code_aufnehmen(code)
+        gruppe = gruppen.get(kategorie)
+        if gruppe is None:
+            gruppe = gruppen[kategorie] = _Gruppe()
+            self._pro_kategorie.setdefault(kategorie, set()).add(code)
+        gruppe.anzahl += 1
+        gruppe.summe += rappen
+
+    def _summieren(self, codes):
+        anzahl = 0
+        summe = 0
+        for code in codes:
+            for gruppe in self._gruppen[code].values():
+                anzahl += gruppe.anzahl
+                summe += gruppe.summe
+        return anzahl, summe / 100
+
+    def _treffer(self, codes):
+        """
+        Treffer aller Kategorien, die neuesten zuerst. Die Kategorien
+        liefern ihre Treffer bereits absteigend nach Datum; heapq.merge
+        fügt sie zusammen, ohne mehr als einen Treffer pro Kategorie
+        im Voraus zu lesen.
+        """
+        codes = set(codes)
+        return heapq.merge(
+            *(self._kategorie_treffer(kategorie, codes)
+              for kategorie, gesucht in self._pro_kategorie.items()
+              if not gesucht.isdisjoint(codes)),
+            key=lambda treffer: treffer[1].tag, reverse=True)
+
+    def _kategorie_treffer(self, kategorie, codes):
+        """Treffer einer Kategorie, die neuesten zuerst."""
+        einträge = self.budget_kategorien[kategorie]
+        spalte = einträge.code_spalte()
+        positionen = range(len(spalte) - 1, -1, -1)
+        for position in compress(positionen, map(
+                codes.__contains__, reversed(spalte))):
+            yield kategorie, einträge[position]
+
+    def _code_aufnehmen(self, code):
+        for wort in wörter(kostenart_tabelle()[code]):
+            self._codes.setdefault(wort, set()).add(code)
+            for länge in range(1, len(wort) + 1):
+                self._präfixe.setdefault(wort[:länge], set()).add(wort)
+
+    def _code_entfernen(self, code):
+        for wort in wörter(kostenart_tabelle()[code]):
+            codes = self._codes.get(wort)
+            if codes is None:
+                continue
+            codes.discard(code)
+            if codes:
+                continue
+            del self._codes[wort]
+            for länge in range(1, len(wort) + 1):
+                präfix = wort[:länge]
+                self._präfixe[präfix].discard(wort)
+                if not self._präfixe[präfix]:
+                    del self._präfixe[präfix]
+
+
+def such_index(budget_kategorien):
+    """
+    Liefert den Index der Kategorien und baut ihn beim ersten Aufruf
+    (oder für andere Daten) neu auf.
+
+    Args:
+        budget_kategorien (dict): Dictionary mit allen Kategorien
+
+    Returns:
+        SuchIndex: Der nachgeführte Index
+    """
+    global _index
+
+    if _index is None or _index.budget_kategorien is not budget_kategorien:
+        _index = SuchIndex(budget_kategorien)
+    return _index
+
+
+def _aktiver_index(budget_kategorien):
+    """Index dieser Kategorien, falls bereits aufgebaut, sonst None."""
+    if _index is not None and _index.budget_kategorien is budget_kategorien:
+        return _index
+    return None
+
+
+def index_eintrag_hinzugefügt(budget_kategorien, kategorie, eintrag):
+    """Führt den Index nach dem Hinzufügen eines Eintrags nach."""
+    index = _aktiver_index(budget_kategorien)
+    if index is not None:
+        index.eintrag_hinzufügen(kategorie, eintrag)
+
+
+def index_eintrag_entfernt(budget_kategorien, kategorie, eintrag):
+    """Führt den Index nach dem Entfernen eines Eintrags nach."""
+    index = _aktiver_index(budget_kategorien)
+    if index is not None:
+        index.eintrag_entfernen(kategorie, eintrag)
+
+
+def index_kategorie_umbenannt(budget_kategorien, alter_name, neuer_name):
+    """Führt den Index nach dem Umbenennen einer Kategorie nach."""
+    index = _aktiver_index(budget_kategorien)
+    if index is not None:
+        index.kategorie_umbenennen(alter_name, neuer_name)
+
+
+def index_kategorie_entfernt(budget_kategorien, kategorie):
+    """Führt den Index nach dem Löschen einer Kategorie nach."""
+    index = _aktiver_index(budget_kategorien)
+    if index is not None:
+        index.kategorie_entfernen(kategorie)
+
+
+def suche_menü(budget_kategorien, timed_input):
+    """
+    Sucht Einträge nach Kostenart über alle Kategorien und zeigt
+    Summen pro Suchbegriff und Kategorie sowie die ersten Treffer.
+
+    Args:
+        budget_kategorien (dict): Dictionary mit allen Kategorien
+        timed_input (callable): Input-Funktion mit Timeout
+    """
+    index = such_index(budget_kategorien)
+    while True:
+        anfrage = timed_input(
+            "\n\033[34mSuchbegriff für die Kostenart (z.B. 'Netflix', "
+            "0 = Zurück):\033[0m").strip()
+        if anfrage == "0":
+            return
+        if not wörter(anfrage):
+            print("\n\033[31mBitte einen Suchbegriff eingeben.\033[0m")
+            continue
+
+        start = time.perf_counter()
+        ergebnis = index.suchen(anfrage)
+        treffer = list(islice(ergebnis["treffer"], MAX_TREFFER_ANZEIGE))
+        dauer_ms = (time.perf_counter() - start) * 1000
+
+        print(f"\n\033[1m{ergebnis['anzahl']} Treffer, "
+              f"{ergebnis['summe']:.2f} CHF ({dauer_ms:.2f} ms)\033[0m")
+        if len(ergebnis["begriffe"]) > 1:
+            for begriff, anzahl, summe in ergebnis["begriffe"]:
+                print(f"  '{begriff}': {anzahl} Einträge, {summe:.2f} CHF")
+        if not ergebnis["anzahl"]:
+            continue
+
+        print(f"\n{'Kategorie':<20} {'Einträge':>10} {'Summe (CHF)':>15}")
+        print("-" * 47)
+        for kategorie, (anzahl, summe) in ergebnis["kategorien"].items():
+            print(f"{kategorie:<20} {anzahl:>10} {summe:>15.2f}")
+
+        print(f"\n{'Kategorie':<20} {'Datum':<12} {'Kostenart':<30} "
+              f"{'Betrag (CHF)':>12}")
+        print("-" * 77)
+        for kategorie, eintrag in treffer:
+            print(f"{kategorie:<20} {tag_als_datum(eintrag.tag):<12} "
+                  f"{eintrag.kostenart:<30} {eintrag.betrag:>12.2f}")
+        if ergebnis["anzahl"] > len(treffer):
+            print(f"... und {ergebnis['anzahl'] - len(treffer)} weitere")
@@ -0,0 +1,579 @@
+"""
+Server-Modul für Budget-Tracker
+Stellt die Budgetdaten als lokale HTTP/JSON-Schnittstelle bereit
+(Aufruf: python main.py serve)
+"""
+
+import json
+import math
+import secrets
+import signal
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from category_manager import (eintrag_hinzufügen, eintrag_löschen,
+                              eintrag_ändern)
+from credentials import standard_passwort_hash, verifiziere_passwort
+from data_handler import daten_speichern, HintergrundSpeicher
+from entry_model import datum_als_tag, eintrag_erstellen, tag_als_datum
+from finance_control import (limit_setzen, limit_entfernen,
+                             ziel_setzen, ziel_entfernen)
+from journal import änderungs_sperre
+from statistic import (monats_summen_pro_kategorie_mit_limits,
+                       finanzziel_statistik_daten)
+from utils import (validiere_datum, betrag_fehler,
+                   KOSTENART_MUSTER, MAX_BUDGET_LIMIT)
+
+
+STANDARD_HOST = "127.0.0.1"
+STANDARD_PORT = 8765
+
+# Gültigkeit eines Tokens nach dem Login in Sekunden
+TOKEN_GÜLTIGKEIT = 8 * 60 * 60
+
+# Maximale Anzahl Einträge pro Seite bei GET .../eintraege
+MAX_PRO_SEITE = 1000
+
+MAX_ANFRAGE_BYTES = 64 * 1024
+
+# Maximale Anzahl zwischengespeicherter GET-Antworten
+MAX_ANTWORTEN = 128
+
+
+class AnfrageFehler(Exception):
+    """Fehlerhafte Anfrage; wird als JSON mit HTTP-Status beantwortet."""
+
+    def __init__(self, status, meldung):
+        super().__init__(meldung)
+        self.status = status
+
+
+class LeseSchreibSperre:
+    """
+    Sperre mit beliebig vielen gleichzeitigen Lesern und einem
+    exklusiven Schreiber. Wartende Schreiber haben Vorrang, damit
+    Änderungen bei vielen Lesern nicht verhungern.
+    """
+
+    def __init__(self):
+        self._bedingung = threading.Condition()
+        self._leser = 0
+        self._schreiber_wartet = 0
+        self._schreibt = False
+
+    def lesen(self):
+        """Kontextmanager für einen Lesezugriff."""
+        return _Zugriff(self._lesen_beginnen, self._lesen_beenden)
+
+    def schreiben(self):
+        """Kontextmanager für einen exklusiven Schreibzugriff."""
+        return _Zugriff(self._schreiben_beginnen, self._schreiben_beenden)
+
+    def _lesen_beginnen(self):
+        with self._bedingung:
+            self._bedingung.wait_for(
+                lambda: not self._schreibt and not self._schreiber_wartet)
+            self._leser += 1
+
+    def _lesen_beenden(self):
+        with self._bedingung:
+            self._leser -= 1
+            if not self._leser:
+                self._bedingung.notify_all()
+
+    def _schreiben_beginnen(self):
+        with self._bedingung:
+            self._schreiber_wartet += 1
+            self._bedingung.wait_for(
+                lambda: not self._schreibt and not self._leser)
+            self._schreiber_wartet -= 1
+            self._schreibt = True
+
+    def _schreiben_beenden(self):
+        with self._bedingung:
+            self._schreibt = False
+            self._bedingung.notify_all()
+
+
+class _Zugriff:
+    __slots__ = ("_beginnen", "_beenden")
+
+    def __init__(self, beginnen, beenden):
+        self._beginnen = beginnen
+        self._beenden = beenden
+
+    def __enter__(self):
+        self._beginnen()
+
+    def __exit__(self, *fehler):
+        self._beenden()
+
+
+class BudgetDienst:
+    """
+    Hält die Daten im Speicher und führt Anfragen aus.
+
+    Lesende Anfragen laufen parallel in den Threads des HTTP-Servers
+    und halten die Lesesperre nur während der Berechnung. Alle
+    Änderungen laufen nacheinander in einem einzigen Schreiber-Thread
+    über dieselben Funktionen wie im Menü und werden vom
+    HintergrundSpeicher gespeichert. Ein Snapshot, der im Hintergrund
+    serialisiert wird, hält nur die Änderungssperre und blockiert
+    daher keine Leser. Antworten auf GET-Anfragen werden pro
+    Datenstand zwischengespeichert.
+
+    Args:
+        daten (tuple): (budget_kategorien, budget_limits, finanzziele,
+                        benutzer_passwort)
+    """
+
+    def __init__(self, daten):
+        self.daten = daten
+        self._sperre = LeseSchreibSperre()
+        self._schreiber = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="Schreiber")
+        self._speicher = HintergrundSpeicher(
+            lambda: daten_speichern(*self.daten))
+        self._tokens = {}
+        self._stand = 0
+        self._antworten = OrderedDict()
+        self._antworten_sperre = threading.Lock()
+
+    # --- Anmeldung ---------------------------------------------------
+
+    def anmelden(self, passwort):
+        """
+        Prüft das Passwort mit bcrypt und stellt ein Token aus.
+
+        Args:
+            passwort (str): Passwort des Benutzers
+
+        Returns:
+            dict: {"token", "gültig_bis"}
+
+        Raises:
+            AnfrageFehler: Bei falschem Passwort (401)
+        """
+        hashed_passwort = (self.daten[3].get("passwort")
+                           or standard_passwort_hash())
+        if not isinstance(passwort, str) or not verifiziere_passwort(
+                passwort, hashed_passwort):
+            raise AnfrageFehler(401, "Falsches Passwort.")
+        token = secrets.token_urlsafe(32)
+        gültig_bis = time.time() + TOKEN_GÜLTIGKEIT
+        self._tokens[token] = gültig_bis
+        return {"token": token, "gültig_bis": int(gültig_bis)}
+
+    def token_prüfen(self, token):
+        """
+        Raises:
+            AnfrageFehler: Wenn das Token fehlt oder abgelaufen ist (401)
+        """
+        gültig_bis = self._tokens.get(token)
+        if gültig_bis is None or gültig_bis < time.time():
+            self._tokens.pop(token, None)
+            raise AnfrageFehler(401, "Anmeldung erforderlich.")
+
+    # --- Lesen -------------------------------------------------------
+
+    def lesen(self, schlüssel, berechnen):
+        """
+        Liefert die Antwort einer lesenden Anfrage; gleiche Anfragen
+        auf demselben Datenstand werden nur einmal berechnet. Es werden
+        höchstens MAX_ANTWORTEN Antworten gehalten (zuletzt benutzte
+        zuerst), jede Änderung leert den Zwischenspeicher.
+
+        Args:
+            schlüssel (tuple): Normalisierte Anfrage (siehe _lesend)
+            berechnen (callable): Berechnet das Ergebnis (unter Lesesperre)
+
+        Returns:
+            bytes: JSON-Antwort
+        """
+        stand = self._stand
+        with self._antworten_sperre:
+            zwischengespeichert = self._antworten.get(schlüssel)
+            if zwischengespeichert is not None \
+                    and zwischengespeichert[0] == stand:
+                self._antworten.move_to_end(schlüssel)
+                return zwischengespeichert[1]
+        with self._sperre.lesen():
+            stand = self._stand
+            ergebnis = berechnen()
+        antwort = _json_bytes(ergebnis)
+        with self._antworten_sperre:
+            if stand == self._stand:
+                self._antworten[schlüssel] = (stand, antwort)
+                self._antworten.move_to_end(schlüssel)
+                if len(self._antworten) > MAX_ANTWORTEN:
+                    self._antworten.popitem(last=False)
+        return antwort
+
+    def kategorien(self):
+        budget_kategorien, budget_limits, finanzziele, _ = self.daten
+        return [{
+            "name": kategorie,
+            "anzahl": len(einträge),
+            "gesamt": round(einträge.gesamt, 2),
+            "limit": budget_limits.get(kategorie),
+            "ziel": finanzziele.get(kategorie, {}).get("ziel"),
+        } for kategorie, einträge in budget_kategorien.items()]
+
+    def einträge(self, kategorie, von=None, bis=None, seite=1,
+                 pro_seite=100):
+        einträge = self._kategorie(kategorie)
+        zeitraum = (_tag_lesen(von), _tag_lesen(bis))
+        start, ende = einträge.bereich(*zeitraum)
+        erste = start + (seite - 1) * pro_seite
+        letzte = min(erste + pro_seite, ende)
+        return {
+            "kategorie": kategorie,
+            "anzahl": ende - start,
+            "summe": round(einträge.zeitraum_summe(*zeitraum), 2),
+            "seite": seite,
+            "einträge": [{
+                "id": eintrag.id,
+                "position": position,
+                "datum": tag_als_datum(eintrag.tag),
+                "kostenart": eintrag.kostenart,
+                "betrag": eintrag.betrag,
+            } for position, eintrag in zip(
+                range(erste, letzte), einträge[erste:letzte])],
+        }
+
+    def monats_statistik(self, von=None, bis=None):
+        budget_kategorien, budget_limits, _, _ = self.daten
+        # Ohne Zeitraum genügen die laufend geführten Monatssummen
+        zeitraum = (_tag_lesen(von), _tag_lesen(bis)) if von or bis else None
+        return monats_summen_pro_kategorie_mit_limits(
+            budget_kategorien, budget_limits, zeitraum=zeitraum)
+
+    def ziel_statistik(self):
+        budget_kategorien, _, finanzziele, _ = self.daten
+        return finanzziel_statistik_daten(budget_kategorien, finanzziele)
+
+    # --- Schreiben ---------------------------------------------------
+
+    def schreiben(self, änderung, *args):
+        """
+        Führt eine Änderung im Schreiber-Thread aus und wartet auf
+        das Ergebnis. Gespeichert wird im Hintergrund.
+
+        Args:
+            änderung (callable): Methode, die die Daten ändert
+            *args: Argumente der Änderung
+
+        Returns:
+            bytes: JSON-Antwort
+        """
+        return _json_bytes(
+            self._schreiber.submit(self._ausführen, änderung, *args)
+            .result())
+
+    def _ausführen(self, änderung, *args):
+        # Erst die Änderungssperre (ein laufender Snapshot hält sie),
+        # dann die Schreibsperre, damit Leser nur kurz warten
+        with änderungs_sperre, self._sperre.schreiben():
+            ergebnis = änderung(*args)
+            self._stand += 1
+            with self._antworten_sperre:
+                self._antworten.clear()
+        self._speicher.anfordern()
+        return ergebnis
+
+    def eintrag_hinzufügen(self, kategorie, daten):
+        budget_kategorien = self.daten[0]
+        self._kategorie(kategorie)
+        eintrag = _eintrag_lesen(daten)
+        position = eintrag_hinzufügen(budget_kategorien, kategorie, eintrag)
+        return {"id": eintrag.id, "position": position,
+                **self._monats_limit(kategorie, eintrag)}
+
+    def eintrag_ändern(self, kategorie, eintrag_id, daten):
+        budget_kategorien = self.daten[0]
+        einträge = self._kategorie(kategorie)
+        try:
+            alter = einträge.nach_id(eintrag_id)
+        except KeyError:
+            raise AnfrageFehler(404, "Eintrag existiert nicht.") from None
+        # Fehlende Felder behalten ihren bisherigen Wert
+        eintrag = _eintrag_lesen(daten, alter)
+        eintrag_ändern(budget_kategorien, kategorie, eintrag_id, eintrag)
+        return {"id": eintrag_id, "alt": str(alter), "neu": str(eintrag),
+                **self._monats_limit(kategorie, eintrag)}
+
+    def eintrag_löschen(self, kategorie, eintrag_id):
+        budget_kategorien = self.daten[0]
+        self._kategorie(kategorie)
+        try:
+            eintrag = eintrag_löschen(budget_kategorien, kategorie,
+                                      eintrag_id)
+        except KeyError:
+            raise AnfrageFehler(404, "Eintrag existiert nicht.") from None
+        return {"id": eintrag_id, "entfernt": str(eintrag)}
+
+    def _monats_limit(self, kategorie, eintrag):
+        """Monatssumme des Eintrags und ob sie das Limit übersteigt."""
+        limit = self.daten[1].get(kategorie)
+        monats_summe = self.daten[0][kategorie].monats_summe(eintrag.monat)
+        return {
+            "monats_summe": round(monats_summe, 2),
+            "limit_überschritten": limit is not None and monats_summe > limit,
+        }
+
+    def limit_setzen(self, kategorie, daten):
+        self._kategorie(kategorie)
+        limit = _betrag_lesen(daten.get("limit"))
+        if betrag_fehler(limit, MAX_BUDGET_LIMIT) is not None:
+            raise AnfrageFehler(400, "Das Limit muss zwischen 0 und "
+                                f"{MAX_BUDGET_LIMIT:.2f} CHF liegen.")
+        limit_setzen(self.daten[1], kategorie, limit)
+        return {"kategorie": kategorie, "limit": limit}
+
+    def limit_entfernen(self, kategorie):
+        if kategorie not in self.daten[1]:
+            raise AnfrageFehler(404, "Kein Limit gesetzt.")
+        limit_entfernen(self.daten[1], kategorie)
+        return {"kategorie": kategorie}
+
+    def ziel_setzen(self, kategorie, daten):
+        self._kategorie(kategorie)
+        ziel = _betrag_lesen(daten.get("ziel"))
+        meldung = daten.get("meldung", "")
+        fehler = betrag_fehler(ziel)
+        if fehler is not None:
+            raise AnfrageFehler(400, fehler)
+        if not isinstance(meldung, str):
+            raise AnfrageFehler(400, "Ungültige Meldung.")
+        ziel_setzen(self.daten[2], kategorie, ziel, meldung)
+        return {"kategorie": kategorie, "ziel": ziel, "meldung": meldung}
+
+    def ziel_entfernen(self, kategorie):
+        if kategorie not in self.daten[2]:
+            raise AnfrageFehler(404, "Kein Ziel gesetzt.")
+        ziel_entfernen(self.daten[2], kategorie)
+        return {"kategorie": kategorie}
+
+    def beenden(self):
+        """Wartet auf laufende Änderungen und speichert alles."""
+        self._schreiber.shutdown(wait=True)
+        self._speicher.beenden()
+
+    def _kategorie(self, kategorie):
+        einträge = self.daten[0].get(kategorie)
+        if einträge is None:
+            raise AnfrageFehler(404, f"Kategorie '{kategorie}' existiert "
+                                "nicht.")
+        return einträge
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Leitet HTTP-Anfragen an den BudgetDienst weiter."""
+
+    server_version = "BudgetTracker"
+    protocol_version = "HTTP/1.1"
+    dienst = None
+
+    def do_GET(self):
+        self._bearbeiten("GET")
+
+    def do_POST(self):
+        self._bearbeiten("POST")
+
+    def do_PUT(self):
+        self._bearbeiten("PUT")
+
+    def do_DELETE(self):
+        self._bearbeiten("DELETE")
+
+    def log_message(self, format, *args):
+        # Zugriffe nicht einzeln ausgeben
+        pass
+
+    def _bearbeiten(self, methode):
+        try:
+            antwort = self._antwort(methode)
+            status = 200
+        except AnfrageFehler as e:
+            antwort = _json_bytes({"fehler": str(e)})
+            status = e.status
+        except Exception as e:
+            antwort = _json_bytes({"fehler": f"Interner Fehler: {e}"})
+            status = 500
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(antwort)))
+        self.end_headers()
+        self.wfile.write(antwort)
+
+    def _antwort(self, methode):
+        url = urlsplit(self.path)
+        teile = [unquote(t) for t in url.path.strip("/").split("/")]
+        if teile[:1] != ["api"]:
+            raise AnfrageFehler(404, "Unbekannter Pfad.")
+        teile = teile[1:]
+        daten = self._daten_lesen() if methode in ("POST", "PUT") else {}
+        dienst = self.dienst
+
+        if methode == "POST" and teile == ["login"]:
+            return _json_bytes(dienst.anmelden(daten.get("passwort")))
+
+        token = self.headers.get("Authorization", "")
+        dienst.token_prüfen(token.removeprefix("Bearer ").strip())
+
+        if methode == "GET":
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            return dienst.lesen(*self._lesend(dienst, teile, query))
+
+        if teile[:1] == ["kategorien"] and len(teile) >= 3 \
+                and teile[2] == "eintraege":
+            if methode == "POST" and len(teile) == 3:
+                return dienst.schreiben(dienst.eintrag_hinzufügen,
+                                        teile[1], daten)
+            if methode == "PUT" and len(teile) == 4:
+                return dienst.schreiben(dienst.eintrag_ändern, teile[1],
+                                        _ganzzahl(teile[3], "ID"), daten)
+            if methode == "DELETE" and len(teile) == 4:
+                return dienst.schreiben(dienst.eintrag_löschen, teile[1],
+                                        _ganzzahl(teile[3], "ID"))
+        elif teile[:1] == ["limits"] and len(teile) == 2:
+            if methode == "PUT":
+                return dienst.schreiben(dienst.limit_setzen, teile[1], daten)
+            if methode == "DELETE":
+                return dienst.schreiben(dienst.limit_entfernen, teile[1])
+        elif teile[:1] == ["ziele"] and len(teile) == 2:
+            if methode == "PUT":
+                return dienst.schreiben(dienst.ziel_setzen, teile[1], daten)
+            if methode == "DELETE":
+                return dienst.schreiben(dienst.ziel_entfernen, teile[1])
+        raise AnfrageFehler(404, "Unbekannter Pfad.")
+
+    @staticmethod
+    def _lesend(dienst, teile, query):
+        """
+        Wählt die Berechnung einer GET-Anfrage aus.
+
+        Returns:
+            tuple: (schlüssel, berechnen); der Schlüssel enthält nur den
+                   Pfad und die bekannten Parameter, unbekannte
+                   Query-Parameter erzeugen keine eigenen Einträge im
+                   Zwischenspeicher
+        """
+        if teile == ["kategorien"]:
+            return ("kategorien",), dienst.kategorien
+        if teile[:1] == ["kategorien"] and teile[2:] == ["eintraege"]:
+            seite = _ganzzahl(query.get("seite", "1"), "Seite")
+            pro_seite = _ganzzahl(query.get("pro_seite", "100"), "pro_seite")
+            if seite < 1 or not 1 <= pro_seite <= MAX_PRO_SEITE:
+                raise AnfrageFehler(400, "Ungültige Seite.")
+            von, bis = query.get("von"), query.get("bis")
+            return (("eintraege", teile[1], von, bis, seite, pro_seite),
+                    lambda: dienst.einträge(teile[1], von, bis, seite,
+                                            pro_seite))
+        if teile == ["limits"]:
+            return ("limits",), lambda: dict(dienst.daten[1])
+        if teile == ["ziele"]:
+            return ("ziele",), lambda: dict(dienst.daten[2])
+        if teile == ["statistik", "monate"]:
+            von, bis = query.get("von"), query.get("bis")
+            return (("statistik_monate", von, bis),
+                    lambda: dienst.monats_statistik(von, bis))
+        if teile == ["statistik", "ziele"]:
+            return ("statistik_ziele",), dienst.ziel_statistik
+        raise AnfrageFehler(404, "Unbekannter Pfad.")
+
+    def _daten_lesen(self):
+        länge = _ganzzahl(self.headers.get("Content-Length", "0"),
+                          "Content-Length")
+        if länge > MAX_ANFRAGE_BYTES:
+            raise AnfrageFehler(413, "Anfrage zu gross.")
+        try:
+            daten = json.loads(self.rfile.read(länge) or b"{}")
+        except ValueError:
+            raise AnfrageFehler(400, "Ungültiges JSON.") from None
+        if not isinstance(daten, dict):
+            raise AnfrageFehler(400, "JSON-Objekt erwartet.")
+        return daten
+
+
+def _json_bytes(daten):
+    return json.dumps(daten, ensure_ascii=False).encode("utf-8")
+
+
+def _ganzzahl(text, name):
+    try:
+        return int(text)
+    except (TypeError, ValueError):
+        raise AnfrageFehler(400, f"Ungültige Zahl für {name}.") from None
+
+
+def _betrag_lesen(wert):
+    if isinstance(wert, bool) or not isinstance(wert, (int, float)) \
+            or not math.isfinite(wert):
+        raise AnfrageFehler(400, "Ungültiger Betrag.")
+    return float(wert)
+
+
+def _eintrag_lesen(daten, alter=None):
+    """
+    Prüft Datum, Kostenart und Betrag einer Anfrage. Mit einem
+    bisherigen Eintrag dürfen Felder fehlen und behalten dann
+    dessen Wert.
+    """
+    if alter is not None:
+        daten = {"datum": alter.datum, "kostenart": alter.kostenart,
+                 "betrag": alter.betrag, **daten}
+    datum = daten.get("datum")
+    kostenart = daten.get("kostenart")
+    betrag = _betrag_lesen(daten.get("betrag"))
+    if not isinstance(datum, str) or not validiere_datum(datum):
+        raise AnfrageFehler(400, "Ungültiges Datum (Format DD.MM.YYYY).")
+    if (not isinstance(kostenart, str)
+            or not KOSTENART_MUSTER.match(kostenart)):
+        raise AnfrageFehler(400, "Ungültige Kostenart (nur Buchstaben).")
+    fehler = betrag_fehler(betrag)
+    if fehler is not None:
+        raise AnfrageFehler(400, fehler)
+    return eintrag_erstellen(datum, kostenart, betrag)
+
+
+def _tag_lesen(datum):
+    if not datum:
+        return None
+    if not validiere_datum(datum):
+        raise AnfrageFehler(400, f"Ungültiges Datum '{datum}' "
+                            "(Format DD.MM.YYYY).")
+    return datum_als_tag(datum)
+
+
+def server_starten(daten, host=STANDARD_HOST, port=STANDARD_PORT):
+    """
+    Startet den HTTP-Server und blockiert bis Ctrl+C. Beim Beenden
+    werden laufende Änderungen abgeschlossen und gespeichert.
+
+    Args:
+        daten (tuple): (budget_kategorien, budget_limits, finanzziele,
+                        benutzer_passwort)
+        host (str): Adresse, an die der Server gebunden wird
+        port (int): Port des Servers
+    """
+    dienst = BudgetDienst(daten)
+    handler = type("Handler", (_Handler,), {"dienst": dienst})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    # SIGTERM (z.B. von einem Dienstverwalter) beendet wie Ctrl+C geordnet
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    print(f"Budget-Server läuft auf http://{host}:{server.server_port}/api "
+          "(Ctrl+C zum Beenden)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        dienst.beenden()
+        print("Budget-Server beendet.")
@@ -0,0 +1,255 @@
+"""
+Verzeichnis-Speichermodul für Budget-Tracker
+Enthält ein Speicher-Backend mit einer Datei pro Kategorie, einer
+Metadaten-Datei und einem Manifest, das beide atomar zusammenhält
+"""
+
+import json
+import os
+
+from entry_model import (VerzögerteEintragsListe, einträge_aus_texten,
+                         eintrag_als_text)
+from journal import (änderungs_sperre, markierungen_übernehmen,
+                     offene_änderungen_vorhanden,
+                     offene_änderungen_verwerfen,
+                     offene_änderungen_übernehmen, änderungen_zurücklegen)
+from tracing import gemessen, span
+from utils import atomar_schreiben
+
+
+MANIFEST_DATEI = "manifest.json"
+# Kategorie-Dateien enthalten {"nächste_id", "ids", "einträge"} und
+# gegebenenfalls "unlesbar"
+MANIFEST_FORMAT = 2
+
+# Datei jeder geladenen oder geschriebenen Kategorie
+# (id(EintragsListe) -> (EintragsListe, Dateiname))
+_dateien = {}
+_metadaten_datei = None
+_nächste_nummer = 1
+
+
+class _ShardQuelle:
+    """Quelle einer VerzögerteEintragsListe: die Datei einer Kategorie."""
+
+    __slots__ = ("kategorie", "pfad")
+
+    def __init__(self, kategorie, pfad):
+        self.kategorie = kategorie
+        self.pfad = pfad
+
+    def __call__(self):
+        with open(self.pfad, "rb") as f:
+            inhalt = f.read()
+        with span("kategorie_nachladen", bytes=len(inhalt)):
+            daten = json.loads(inhalt)
+            einträge = einträge_aus_texten(self.kategorie,
+                                           daten["einträge"], daten["ids"],
+                                           daten["nächste_id"])
+            einträge.unlesbar.extend(daten.get("unlesbar", ()))
+            return einträge
+
+
+def verzeichnis_vorhanden(verzeichnis):
+    """
+    Prüft, ob im Verzeichnis bereits Daten gespeichert sind.
+
+    Args:
+        verzeichnis (str): Datenverzeichnis
+
+    Returns:
+        bool: True wenn ein Manifest existiert
+    """
+    return os.path.exists(os.path.join(verzeichnis, MANIFEST_DATEI))
+
+
+@gemessen
+def verzeichnis_laden(verzeichnis):
+    """
+    Lädt Manifest und Metadaten. Die Einträge jeder Kategorie werden
+    erst beim ersten Zugriff aus ihrer Datei gelesen.
+
+    Args:
+        verzeichnis (str): Datenverzeichnis
+
+    Returns:
+        tuple: (budget_kategorien, budget_limits, finanzziele,
+                benutzer_passwort)
+    """
+    global _metadaten_datei, _nächste_nummer
+
+    with open(os.path.join(verzeichnis, MANIFEST_DATEI), "r",
+              encoding="utf-8") as f:
+        manifest = json.load(f)
+    with open(os.path.join(verzeichnis, manifest["metadaten"]), "r",
+              encoding="utf-8") as f:
+        metadaten = json.load(f)
+
+    _dateien.clear()
+    budget_kategorien = {}
+    for kategorie, datei in manifest["kategorien"].items():
+        einträge = VerzögerteEintragsListe(
+            _ShardQuelle(kategorie, os.path.join(verzeichnis, datei)))
+        budget_kategorien[kategorie] = einträge
+        _dateien[id(einträge)] = (einträge, datei)
+    _metadaten_datei = manifest["metadaten"]
+    _nächste_nummer = manifest["nächste_nummer"]
+    offene_änderungen_verwerfen()
+
+    return (budget_kategorien,
+            metadaten.get("budget_limits", {}),
+            metadaten.get("finanzziele", {}),
+            metadaten.get("benutzer_passwort", {}))
+
+
+def verzeichnis_importieren(verzeichnis,
+                            budget_kategorien,
+                            budget_limits,
+                            finanzziele,
+                            benutzer_passwort):
+    """
+    Schreibt alle Daten in ein neues Datenverzeichnis
+    (z.B. beim Umstieg von der JSON-Datei).
+
+    Args:
+        verzeichnis (str): Datenverzeichnis
+        budget_kategorien (dict): Budget-Kategorien mit Eintrag-Objekten
+        budget_limits (dict): Budget-Limits pro Kategorie
+        finanzziele (dict): Finanzziele pro Kategorie
+        benutzer_passwort (dict): Gehashtes Benutzer-Passwort
+    """
+    global _metadaten_datei
+
+    os.makedirs(verzeichnis, exist_ok=True)
+    _dateien.clear()
+    _metadaten_datei = None
+    with änderungs_sperre:
+        plan = _planen(budget_kategorien, budget_limits, finanzziele,
+                       benutzer_passwort, list(budget_kategorien.values()),
+                       True)
+    _ausführen(verzeichnis, plan)
+
+
+@gemessen
+def verzeichnis_speichern(verzeichnis,
+                          budget_kategorien,
+                          budget_limits,
+                          finanzziele,
+                          benutzer_passwort):
+    """
+    Schreibt nur die seit dem letzten Speichern markierten Kategorien
+    und Metadaten neu (siehe journal.kategorie_markieren). Neue
+    Dateien erhalten neue Namen; erst das atomar ersetzte Manifest
+    macht sie gültig. Umbenennen und Löschen von Kategorien ändern
+    daher nur das Manifest, und ein Absturz hinterlässt immer einen
+    vollständigen alten oder neuen Stand. Nicht mehr verwendete
+    Dateien werden danach gelöscht. Schlägt das Schreiben fehl,
+    bleiben die Änderungen für den nächsten Versuch vorgemerkt.
+
+    Args:
+        verzeichnis (str): Datenverzeichnis
+        budget_kategorien (dict): Budget-Kategorien mit Eintrag-Objekten
+        budget_limits (dict): Budget-Limits pro Kategorie
+        finanzziele (dict): Finanzziele pro Kategorie
+        benutzer_passwort (dict): Gehashtes Benutzer-Passwort
+    """
+    with änderungs_sperre:
+        if not offene_änderungen_vorhanden():
+            return
+        markiert = markierungen_übernehmen()
+        änderungen = offene_änderungen_übernehmen()
+        try:
+            plan = _planen(budget_kategorien, budget_limits, finanzziele,
+                           benutzer_passwort, *markiert)
+        except Exception:
+            änderungen_zurücklegen(änderungen, markiert)
+            raise
+    try:
+        _ausführen(verzeichnis, plan)
+    except Exception:
+        änderungen_zurücklegen(änderungen, markiert)
+        raise
+
+
+def _planen(budget_kategorien, budget_limits, finanzziele,
+            benutzer_passwort, geänderte, metadaten_geändert):
+    """
+    Serialisiert unter der Änderungssperre alles, was neu geschrieben
+    werden muss, und vergibt dafür neue Dateinamen.
+
+    Returns:
+        tuple: (zu schreibende [(Datei, Bytes)], Manifest als Bytes,
+                neue Zuordnung id -> (EintragsListe, Datei),
+                Metadaten-Datei)
+    """
+    global _nächste_nummer
+
+    geänderte_ids = {id(einträge) for einträge in geänderte}
+    schreiben = []
+    zuordnung = {}
+    manifest_kategorien = {}
+    for kategorie, einträge in budget_kategorien.items():
+        bekannt = _dateien.get(id(einträge))
+        if bekannt is not None and id(einträge) not in geänderte_ids:
+            datei = bekannt[1]
+        else:
+            datei = f"kategorie-{_nächste_nummer}.json"
+            _nächste_nummer += 1
+            daten = {
+                "nächste_id": einträge.nächste_id,
+                "ids": einträge.id_spalte().tolist(),
+                "einträge": [eintrag_als_text(e) for e in einträge],
+            }
+            # Nicht lesbare Zeilen haben keine ID und stehen getrennt
+            if einträge.unlesbar:
+                daten["unlesbar"] = einträge.unlesbar
+            schreiben.append((datei, _json_bytes(daten)))
+        zuordnung[id(einträge)] = (einträge, datei)
+        manifest_kategorien[kategorie] = datei
+
+    metadaten_datei = _metadaten_datei
+    if metadaten_geändert or metadaten_datei is None:
+        metadaten_datei = f"metadaten-{_nächste_nummer}.json"
+        _nächste_nummer += 1
+        schreiben.append((metadaten_datei, _json_bytes({
+            "budget_limits": budget_limits,
+            "finanzziele": finanzziele,
+            "benutzer_passwort": benutzer_passwort,
+        })))
+
+    manifest = _json_bytes({
+        "format": MANIFEST_FORMAT,
+        "nächste_nummer": _nächste_nummer,
+        "metadaten": metadaten_datei,
+        "kategorien": manifest_kategorien,
+    })
+    return schreiben, manifest, zuordnung, metadaten_datei
+
+
+def _ausführen(verzeichnis, plan):
+    """Schreibt die neuen Dateien, danach das Manifest, und räumt auf."""
+    global _metadaten_datei
+
+    schreiben, manifest, zuordnung, metadaten_datei = plan
+    for datei, inhalt in schreiben:
+        atomar_schreiben(os.path.join(verzeichnis, datei), inhalt)
+    atomar_schreiben(os.path.join(verzeichnis, MANIFEST_DATEI), manifest)
+
+    # Ungeladene Kategorien lesen weiter aus ihrer Datei; gelöscht
+    # wird nur, was im neuen Manifest nicht mehr vorkommt
+    verwendet = {datei for _, datei in zuordnung.values()}
+    verwendet.add(metadaten_datei)
+    veraltet = {datei for _, datei in _dateien.values()}
+    veraltet.add(_metadaten_datei)
+    _dateien.clear()
+    _dateien.update(zuordnung)
+    _metadaten_datei = metadaten_datei
+    for datei in veraltet - verwendet - {None}:
+        try:
+            os.remove(os.path.join(verzeichnis, datei))
+        except FileNotFoundError:
+            pass
+
+
+def _json_bytes(daten):
+    return json.dumps(daten, indent=4, ensure_ascii=False).encode("utf-8")
@@ -0,0 +1,274 @@
+"""
+SQLite-Speichermodul für Budget-Tracker
+Enthält ein alternatives Speicher-Backend auf Basis von sqlite3
+"""
+
+import sqlite3
+from contextlib import closing
+from datetime import date
+from functools import lru_cache
+
+from entry_model import Eintrag, EintragsListe, eintrag_aus_text
+
+
+# eintraege.nr ist die stabile ID des Eintrags in seiner Kategorie
+# (Eintrag.id), kategorien.naechste_nr die nächste freie
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS kategorien (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    position INTEGER NOT NULL,
+    naechste_nr INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS eintraege (
+    id INTEGER PRIMARY KEY,
+    kategorie_id INTEGER NOT NULL
+        REFERENCES kategorien(id) ON DELETE CASCADE,
+    nr INTEGER NOT NULL,
+    datum TEXT NOT NULL,
+    kostenart TEXT NOT NULL,
+    betrag REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS eintraege_kategorie_nr
+    ON eintraege (kategorie_id, nr);
+CREATE INDEX IF NOT EXISTS eintraege_kategorie_datum
+    ON eintraege (kategorie_id, datum);
+CREATE TABLE IF NOT EXISTS unlesbare_eintraege (
+    id INTEGER PRIMARY KEY,
+    kategorie_id INTEGER NOT NULL
+        REFERENCES kategorien(id) ON DELETE CASCADE,
+    text TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS limits (
+    kategorie TEXT PRIMARY KEY,
+    betrag REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ziele (
+    kategorie TEXT PRIMARY KEY,
+    ziel REAL NOT NULL,
+    meldung TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS zugangsdaten (
+    schluessel TEXT PRIMARY KEY,
+    wert TEXT NOT NULL
+);
+"""
+
+_NÄCHSTE_POSITION = "(SELECT COALESCE(MAX(position), 0) + 1 FROM kategorien)"
+_KATEGORIE_ID = "(SELECT id FROM kategorien WHERE name = ?)"
+
+
+@lru_cache(maxsize=None)
+def _tag_als_iso(tag):
+    return date.fromordinal(tag).isoformat()
+
+
+@lru_cache(maxsize=None)
+def _iso_als_tag(datum):
+    return date.fromisoformat(datum).toordinal()
+
+
+def _verbinden(pfad):
+    """Öffnet die Datenbank und legt fehlende Tabellen an."""
+    verbindung = sqlite3.connect(pfad)
+    verbindung.execute("PRAGMA foreign_keys = ON")
+    verbindung.executescript(SCHEMA)
+    return verbindung
+
+
+def _nummern_vergeben(verbindung, kategorie, anzahl):
+    """
+    Reserviert anzahl Eintrags-IDs in einer Kategorie, in derselben
+    Reihenfolge wie EintragsListe.einfügen.
+
+    Returns:
+        tuple: (kategorie_id, erste vergebene ID)
+    """
+    kategorie_id, erste_nr = verbindung.execute(
+        "SELECT id, naechste_nr FROM kategorien WHERE name = ?",
+        (kategorie,)).fetchone()
+    verbindung.execute(
+        "UPDATE kategorien SET naechste_nr = naechste_nr + ? WHERE id = ?",
+        (anzahl, kategorie_id))
+    return kategorie_id, erste_nr
+
+
+def sqlite_importieren(pfad,
+                       budget_kategorien,
+                       budget_limits,
+                       finanzziele,
+                       benutzer_passwort):
+    """
+    Überträgt einen kompletten Datenbestand in die Datenbank
+    (z.B. beim ersten Start aus budget_daten.json).
+
+    Args:
+        pfad (str): Pfad zur Datenbank-Datei
+        budget_kategorien (dict): Budget-Kategorien mit Eintrag-Objekten
+        budget_limits (dict): Budget-Limits pro Kategorie
+        finanzziele (dict): Finanzziele pro Kategorie
+        benutzer_passwort (dict): Gehashtes Benutzer-Passwort
+    """
+    with closing(_verbinden(pfad)) as verbindung, verbindung:
+        for position, (kategorie, einträge) in enumerate(
+                budget_kategorien.items(), start=1):
+            kategorie_id = verbindung.execute(
+                "INSERT INTO kategorien (name, position, naechste_nr) "
+                "VALUES (?, ?, ?)",
+                (kategorie, position, einträge.nächste_id)).lastrowid
+            verbindung.executemany(
+                "INSERT INTO eintraege (kategorie_id, nr, datum, "
+                "kostenart, betrag) VALUES (?, ?, ?, ?, ?)",
+                ((kategorie_id, e.id, _tag_als_iso(e.tag), e.kostenart,
+                  e.betrag) for e in einträge))
+            verbindung.executemany(
+                "INSERT INTO unlesbare_eintraege (kategorie_id, text) "
+                "VALUES (?, ?)",
+                ((kategorie_id, text) for text in einträge.unlesbar))
+        verbindung.executemany(
+            "INSERT INTO limits (kategorie, betrag) VALUES (?, ?)",
+            budget_limits.items())
+        verbindung.executemany(
+            "INSERT INTO ziele (kategorie, ziel, meldung) VALUES (?, ?, ?)",
+            ((k, z["ziel"], z.get("meldung", ""))
+             for k, z in finanzziele.items()))
+        verbindung.executemany(
+            "INSERT INTO zugangsdaten (schluessel, wert) VALUES (?, ?)",
+            benutzer_passwort.items())
+
+
+def sqlite_laden(pfad):
+    """
+    Lädt den kompletten Datenbestand aus der Datenbank.
+
+    Args:
+        pfad (str): Pfad zur Datenbank-Datei
+
+    Returns:
+        tuple: (budget_kategorien, budget_limits, finanzziele,
+                benutzer_passwort)
+    """
+    with closing(_verbinden(pfad)) as verbindung:
+        kategorien = verbindung.execute(
+            "SELECT id, name, naechste_nr FROM kategorien "
+            "ORDER BY position").fetchall()
+        einträge = {kategorie_id: [] for kategorie_id, _, _ in kategorien}
+        for kategorie_id, nr, datum, kostenart, betrag in verbindung.execute(
+                "SELECT kategorie_id, nr, datum, kostenart, betrag "
+                "FROM eintraege ORDER BY kategorie_id, datum, id"):
+            einträge[kategorie_id].append(
+                Eintrag(_iso_als_tag(datum), kostenart, betrag, nr))
+        budget_kategorien = {
+            name: EintragsListe.aus_einträgen(einträge[kategorie_id],
+                                              naechste_nr)
+            for kategorie_id, name, naechste_nr in kategorien}
+        namen = {kategorie_id: name for kategorie_id, name, _ in kategorien}
+        for kategorie_id, text in verbindung.execute(
+                "SELECT kategorie_id, text FROM unlesbare_eintraege "
+                "ORDER BY id"):
+            budget_kategorien[namen[kategorie_id]].unlesbar.append(text)
+
+        budget_limits = dict(verbindung.execute(
+            "SELECT kategorie, betrag FROM limits"))
+        finanzziele = {
+            kategorie: {"ziel": ziel, "meldung": meldung}
+            for kategorie, ziel, meldung in verbindung.execute(
+                "SELECT kategorie, ziel, meldung FROM ziele")}
+        benutzer_passwort = dict(verbindung.execute(
+            "SELECT schluessel, wert FROM zugangsdaten"))
+
+    return budget_kategorien, budget_limits, finanzziele, benutzer_passwort
+
+
+def sqlite_änderungen_anwenden(pfad, änderungen):
+    """
+    Schreibt protokollierte Änderungen als einzelne Zeilen-Operationen
+    in einer Transaktion in die Datenbank.
+
+    Args:
+        pfad (str): Pfad zur Datenbank-Datei
+        änderungen (list): Änderungen aus dem Journal-Modul
+    """
+    if not änderungen:
+        return
+    with closing(_verbinden(pfad)) as verbindung, verbindung:
+        for änderung in änderungen:
+            _änderung_ausführen(verbindung, änderung)
+
+
+def _änderung_ausführen(verbindung, änderung):
+    """Führt eine einzelne protokollierte Änderung als SQL aus."""
+    operation = änderung["op"]
+    if operation == "kategorie_anlegen":
+        verbindung.execute(
+            "INSERT INTO kategorien (name, position) "
+            f"VALUES (?, {_NÄCHSTE_POSITION})", (änderung["kategorie"],))
+    elif operation == "kategorie_umbenennen":
+        verbindung.execute(
+            f"UPDATE kategorien SET name = ?, position = {_NÄCHSTE_POSITION} "
+            "WHERE name = ?", (änderung["neu"], änderung["alt"]))
+    elif operation == "kategorie_entfernen":
+        verbindung.execute("DELETE FROM kategorien WHERE name = ?",
+                           (änderung["kategorie"],))
+    elif operation in ("eintrag_hinzufügen", "einträge_hinzufügen"):
+        texte = (änderung["einträge"] if operation == "einträge_hinzufügen"
+                 else [änderung["eintrag"]])
+        kategorie_id, erste_nr = _nummern_vergeben(
+            verbindung, änderung["kategorie"], len(texte))
+        verbindung.executemany(
+            "INSERT INTO eintraege (kategorie_id, nr, datum, kostenart, "
+            "betrag) VALUES (?, ?, ?, ?, ?)",
+            ((kategorie_id, nr, _tag_als_iso(e.tag), e.kostenart, e.betrag)
+             for nr, e in enumerate(map(eintrag_aus_text, texte),
+                                    start=erste_nr)))
+    elif operation == "eintrag_löschen":
+        verbindung.execute(
+            "DELETE FROM eintraege "
+            f"WHERE kategorie_id = {_KATEGORIE_ID} AND nr = ?",
+            (änderung["kategorie"], änderung["id"]))
+    elif operation == "eintrag_ändern":
+        eintrag = eintrag_aus_text(änderung["eintrag"])
+        werte = (_tag_als_iso(eintrag.tag), eintrag.kostenart,
+                 eintrag.betrag, änderung["kategorie"], änderung["id"])
+        # Ein neues Datum gibt dem Eintrag wie beim Einfügen den Platz
+        # hinter den Einträgen seines Tages (neue Zeilen-ID)
+        verbindung.execute(
+            "INSERT OR REPLACE INTO eintraege "
+            "(id, kategorie_id, nr, datum, kostenart, betrag) "
+            "SELECT CASE WHEN datum = ?1 THEN id END, kategorie_id, nr, "
+            "?1, ?2, ?3 FROM eintraege "
+            "WHERE kategorie_id = (SELECT id FROM kategorien "
+            "WHERE name = ?4) AND nr = ?5", werte)
+    elif operation == "eintrag_entfernen":
+        position = änderung["position"]
+        reihenfolge = "ASC" if position >= 0 else "DESC"
+        versatz = position if position >= 0 else -position - 1
+        verbindung.execute(
+            "DELETE FROM eintraege WHERE id = ("
+            f"SELECT id FROM eintraege WHERE kategorie_id = {_KATEGORIE_ID} "
+            f"ORDER BY datum {reihenfolge}, id {reihenfolge} "
+            "LIMIT 1 OFFSET ?)",
+            (änderung["kategorie"], versatz))
+    elif operation == "limit_setzen":
+        verbindung.execute(
+            "INSERT OR REPLACE INTO limits (kategorie, betrag) VALUES (?, ?)",
+            (änderung["kategorie"], änderung["limit"]))
+    elif operation == "limit_entfernen":
+        verbindung.execute("DELETE FROM limits WHERE kategorie = ?",
+                           (änderung["kategorie"],))
+    elif operation == "ziel_setzen":
+        verbindung.execute(
+            "INSERT OR REPLACE INTO ziele (kategorie, ziel, meldung) "
+            "VALUES (?, ?, ?)",
+            (änderung["kategorie"], änderung["ziel"], änderung["meldung"]))
+    elif operation == "ziel_entfernen":
+        verbindung.execute("DELETE FROM ziele WHERE kategorie = ?",
+                           (änderung["kategorie"],))
+    elif operation == "passwort_setzen":
+        verbindung.execute(
+            "INSERT OR REPLACE INTO zugangsdaten (schluessel, wert) "
+            "VALUES ('passwort', ?)", (änderung["passwort"],))
+        if "kosten" in änderung:
+            verbindung.execute(
+                "INSERT OR REPLACE INTO zugangsdaten (schluessel, wert) "
+                "VALUES ('kosten', ?)", (änderung["kosten"],))
@@ -3,97 +3,187 @@ Statistik-Modul für Budget-Tracker
 Enthält Funktionen zur Datenaufbereitung und Visualisierung
 """
 
-import matplotlib.pyplot as plt
-import numpy as np
-from matplotlib.lines import Line2D
-from matplotlib.ticker import FuncFormatter
-from matplotlib.colors import to_rgba
-from datetime import datetime
-from collections import defaultdict
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from entry_model import tag_als_datum
+from utils import LazyModul, agg_backend_setzen, zeitraum_eingeben
+from render_cache import (
+    fingerabdruck,
+    aus_cache_holen,
+    rendering_pfad,
+    rendering_übernehmen
+)
+from tracing import gemessen, ereignis_aufzeichnen
 
 
-def monats_summen_pro_kategorie_mit_limits(budget_kategorien, budget_limits):
+# NumPy und matplotlib werden erst bei der ersten Statistik geladen
+np = LazyModul("numpy")
+plt = LazyModul("matplotlib.pyplot", vorbereitung=agg_backend_setzen)
+lines = LazyModul("matplotlib.lines", vorbereitung=agg_backend_setzen)
+ticker = LazyModul("matplotlib.ticker", vorbereitung=agg_backend_setzen)
+colors = LazyModul("matplotlib.colors", vorbereitung=agg_backend_setzen)
+
+MONATS_DIAGRAMM = 'monats_summen_diagramm.png'
+ZIEL_DIAGRAMM = 'finanzziele_diagramm.png'
+
+
+# Prozess-Pool für Diagramme, wird beim ersten Hintergrund-Rendering
+# gestartet ("spawn", damit Worker keinen Zustand des Menüs erben)
+_render_pool = None
+_MAX_RENDER_PROZESSE = 2
+
+# Laufende Hintergrund-Renderings: (future, dateiname, schlüssel)
+_laufende_renderings = []
+
+# Zuletzt angeforderter Fingerabdruck pro Ausgabedatei
+_angeforderte_renderings = {}
+
+# Tages-Ordinalzahl von 1970-01-01 (Nullpunkt von datetime64)
+_EPOCHE_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _spalten_aufbauen(budget_kategorien, kategorien, zeitraum=None):
+    """
+    Lädt die Einträge der gewählten Kategorien in Spalten-Arrays.
+
+    Args:
+        budget_kategorien (dict): Kategorien mit Einträgen
+        kategorien (list): Kategorien in der gewünschten Reihenfolge
+        zeitraum (tuple, optional): (erster_tag, letzter_tag); da die
+            Spalten nach Datum sortiert sind, wird nur der per bisect
+            gefundene Bereich übernommen
+
+    Returns:
+        tuple: (codes, daten, rappen) mit Kategorie-Codes (int64),
+               Daten (datetime64[D]) und Beträgen in Rappen (int64)
+    """
+    spalten = [budget_kategorien[k].spalten() for k in kategorien]
+    if zeitraum is not None:
+        bereiche = [budget_kategorien[k].bereich(*zeitraum)
+                    for k in kategorien]
+        spalten = [(t[start:ende], b[start:ende])
+                   for (t, b), (start, ende) in zip(spalten, bereiche)]
+    anzahlen = [len(tage) for tage, _ in spalten]
+    codes = np.repeat(np.arange(len(kategorien)), anzahlen)
+    tage = np.concatenate(
+        [np.frombuffer(t, dtype=np.int32) for t, _ in spalten]
+        or [np.empty(0, dtype=np.int32)])
+    rappen = np.concatenate(
+        [np.frombuffer(r, dtype=np.int64) for _, r in spalten]
+        or [np.empty(0, dtype=np.int64)])
+    daten = (tage - _EPOCHE_ORDINAL).astype("datetime64[D]")
+    return codes, daten, rappen
+
+
+def _monats_matrix(codes, daten, rappen, anzahl_kategorien):
+    """
+    Summiert die Beträge pro (Kategorie, Monat) mit einem einzigen
+    np.bincount über einen kombinierten Index. Summiert wird in
+    Rappen, die als float64 bis 2**53 exakt bleiben.
+
+    Returns:
+        tuple: (monate, summen, belegt) mit allen Monaten vom ersten
+               bis zum letzten Eintrag (datetime64[M]), der Summenmatrix
+               und einer Maske der Monate, die Einträge enthalten
+    """
+    monats_nummern = daten.astype("datetime64[M]").astype(np.int64)
+    erster = monats_nummern.min() if len(monats_nummern) else 0
+    anzahl_monate = (monats_nummern.max() - erster + 1
+                     if len(monats_nummern) else 0)
+    monats_index = monats_nummern - erster
+    monate = np.arange(erster, erster + anzahl_monate).astype(
+        "datetime64[M]")
+    zellen = anzahl_kategorien * len(monate)
+    schlüssel = codes * len(monate) + monats_index
+    summen = np.bincount(schlüssel, weights=rappen, minlength=zellen) / 100
+    belegt = np.bincount(schlüssel, minlength=zellen) > 0
+    form = (anzahl_kategorien, len(monate))
+    return monate, summen.reshape(form), belegt.reshape(form)
+
+
+def _farben_klassifizieren(werte, limit):
+    """Ordnet Monatswerten vektorisiert Farben gemäss Limit zu."""
+    if limit is None:
+        return ["blue"] * len(werte)
+    return np.where(werte <= limit, "green", "red").tolist()
+
+
+@gemessen
+def monats_summen_pro_kategorie_mit_limits(budget_kategorien,
+                                           budget_limits,
+                                           vorberechnet=None,
+                                           zeitraum=None):
     """
     Berechnet pro Kategorie die Monatssummen und ordnet Farbcodes
-    anhand gesetzter Budgetlimiten zu.
+    anhand gesetzter Budgetlimiten zu. Die Aggregation läuft
+    spaltenweise mit NumPy über alle Einträge auf einmal.
+
+    Args:
+        budget_kategorien (dict): Kategorien mit Einträgen
+        budget_limits (dict): Budget-Limits pro Kategorie
+        vorberechnet (dict, optional): Bereits aggregierte Monatssummen
+            pro Kategorie (z.B. aus EintragsListe.monats_summen), dann werden
+            die Einträge nicht erneut durchlaufen
+        zeitraum (tuple, optional): (erster_tag, letzter_tag), um nur
+            Einträge dieses Zeitraums zu berücksichtigen
 
     Returns:
         dict: Dictionary mit Monats-Statistiken pro Kategorie
     """
+    kategorien = list(budget_kategorien.keys())
     ergebnis = {}
 
-    for kategorie, eintraege in budget_kategorien.items():
-        monats_summen = defaultdict(float)
-
-        for e in eintraege:
-            teile = e.split(" - ")
-            if len(teile) != 3:
-                continue
-
-            datum_str = teile[0].strip()
-            betrag_str = teile[2].replace("CHF", "").strip()
-
-            try:
-                datum = datetime.strptime(datum_str, "%d.%m.%Y")
-                monat = datum.strftime("%Y-%m")
-                betrag = float(betrag_str)
-                monats_summen[monat] += betrag
-            except Exception:
-                continue
-
-        monate = sorted(monats_summen.keys())
-        werte = [monats_summen[m] for m in monate]
+    if vorberechnet is None:
+        monate, summen, belegt = _monats_matrix(
+            *_spalten_aufbauen(budget_kategorien, kategorien, zeitraum),
+            len(kategorien))
+        monats_texte = np.datetime_as_string(monate, unit="M")
+
+    for i, kategorie in enumerate(kategorien):
+        if vorberechnet is not None:
+            monats_summen = vorberechnet.get(kategorie, {})
+            monate_kategorie = sorted(monats_summen.keys())
+            werte = np.array([monats_summen[m] for m in monate_kategorie],
+                             dtype=np.float64)
+        else:
+            monate_kategorie = monats_texte[belegt[i]].tolist()
+            werte = summen[i][belegt[i]]
 
         limit = budget_limits.get(kategorie)
-        farben = []
-
-        for betrag in werte:
-            if limit is None:
-                farben.append("blue")
-            elif betrag <= limit:
-                farben.append("green")
-            else:
-                farben.append("red")
 
         ergebnis[kategorie] = {
-            "monate": monate,
-            "werte": werte,
-            "farben": farben,
+            "monate": monate_kategorie,
+            "werte": werte.tolist(),
+            "farben": _farben_klassifizieren(werte, limit),
             "limit": limit
         }
 
     return ergebnis
 
 
+@gemessen
 def finanzziel_statistik_daten(budget_kategorien, finanzziele):
     """
     Bereitet Statistik-Daten für Finanzziele pro Kategorie vor.
+    Die Gesamtausgaben werden mit einem np.bincount über die
+    Kategorie-Codes berechnet.
 
     Returns:
         dict: Dictionary mit Finanzziel-Statistiken
     """
-    ergebnis = {}
-
-    for kategorie, ziel_info in finanzziele.items():
-        if kategorie not in budget_kategorien:
-            continue
-
-        ziel = ziel_info.get("ziel")
-        if ziel is None:
-            continue
+    kategorien = [k for k, ziel_info in finanzziele.items()
+                  if k in budget_kategorien
+                  and ziel_info.get("ziel") is not None]
+    codes, _, rappen = _spalten_aufbauen(budget_kategorien, kategorien)
+    gesamt = (np.bincount(codes, weights=rappen,
+                          minlength=len(kategorien)) / 100).tolist()
 
-        gesamt_ausgaben = 0.0
-        for eintrag in budget_kategorien[kategorie]:
-            teile = eintrag.split(" - ")
-            if len(teile) != 3:
-                continue
+    ergebnis = {}
 
-            betrag_str = teile[2].replace("CHF", "").strip()
-            try:
-                betrag = float(betrag_str)
-                gesamt_ausgaben += betrag
-            except ValueError:
-                continue
+    for kategorie, gesamt_ausgaben in zip(kategorien, gesamt):
+        ziel = finanzziele[kategorie]["ziel"]
 
         differenz = ziel - gesamt_ausgaben
         erreicht = gesamt_ausgaben >= ziel
@@ -110,14 +200,95 @@ def finanzziel_statistik_daten(budget_kategorien, finanzziele):
     return ergebnis
 
 
-def plot_monats_summen_pro_kategorie(kategorien_daten, budget_limits=None):
-    """Zeichnet monatliche Summen pro Kategorie."""
-    kategorien = list(kategorien_daten.keys())
+@gemessen
+def zeitraum_statistik_daten(budget_kategorien, erster_tag, letzter_tag):
+    """
+    Berechnet pro Kategorie Anzahl und Summe der Ausgaben in einem
+    Zeitraum sowie die Summe des gleich langen Zeitraums davor.
+    Über die Präfixsummen der Kategorien kostet jede Summe O(log n).
 
-    if not kategorien:
+    Args:
+        budget_kategorien (dict): Kategorien mit Einträgen
+        erster_tag (int | None): Erster Tag (inklusive)
+        letzter_tag (int | None): Letzter Tag (inklusive)
+
+    Returns:
+        dict: Kategorie -> {"anzahl", "summe", "vorperiode"}; vorperiode
+              ist None, wenn der Zeitraum nicht beidseitig begrenzt ist
+    """
+    vorperiode = None
+    if erster_tag is not None and letzter_tag is not None:
+        länge = letzter_tag - erster_tag + 1
+        vorperiode = (erster_tag - länge, erster_tag - 1)
+
+    ergebnis = {}
+    for kategorie, einträge in budget_kategorien.items():
+        start, ende = einträge.bereich(erster_tag, letzter_tag)
+        ergebnis[kategorie] = {
+            "anzahl": ende - start,
+            "summe": einträge.zeitraum_summe(erster_tag, letzter_tag),
+            "vorperiode": (einträge.zeitraum_summe(*vorperiode)
+                           if vorperiode else None)
+        }
+    return ergebnis
+
+
+def zeitraum_statistik_ausgeben(daten, erster_tag, letzter_tag):
+    """Gibt die Ausgaben pro Kategorie im Zeitraum als Tabelle aus."""
+    von = tag_als_datum(erster_tag) if erster_tag is not None else "Beginn"
+    bis = tag_als_datum(letzter_tag) if letzter_tag is not None else "heute"
+    print(f"\n\033[1mAusgaben von {von} bis {bis}\033[0m")
+    print(f"{'Kategorie':<20} {'Einträge':>10} {'Summe (CHF)':>15} "
+          f"{'Vorperiode':>15} {'Veränderung':>12}")
+    print("-" * 76)
+    for kategorie, werte in daten.items():
+        vorperiode = werte["vorperiode"]
+        if vorperiode is None:
+            spalten = f"{'-':>15} {'-':>12}"
+        elif vorperiode:
+            veränderung = (werte["summe"] - vorperiode) / vorperiode * 100
+            spalten = f"{vorperiode:>15.2f} {veränderung:>+11.1f}%"
+        else:
+            spalten = f"{vorperiode:>15.2f} {'-':>12}"
+        print(f"{kategorie:<20} {werte['anzahl']:>10} "
+              f"{werte['summe']:>15.2f} {spalten}")
+
+
+@gemessen
+def plot_monats_summen_pro_kategorie(kategorien_daten, budget_limits=None):
+    """
+    Zeichnet monatliche Summen pro Kategorie.
+    Ein Rendering mit identischen Eingaben wird aus dem Cache übernommen.
+    """
+    if not kategorien_daten:
         print("\n\033[33mKeine Kategorien-Daten zum Plotten.\033[0m")
         return
 
+    schlüssel = fingerabdruck(MONATS_DIAGRAMM, kategorien_daten, budget_limits)
+    if not aus_cache_holen(MONATS_DIAGRAMM, schlüssel):
+        monats_diagramm_zeichnen(kategorien_daten,
+                                 budget_limits,
+                                 rendering_pfad(schlüssel))
+        rendering_übernehmen(MONATS_DIAGRAMM, schlüssel)
+    print("\n\033[32mDiagramm gespeichert als "
+          f"'{MONATS_DIAGRAMM}'\033[0m")
+
+
+@gemessen
+def monats_diagramm_zeichnen(kategorien_daten, budget_limits, pfad):
+    """
+    Rendert das Diagramm der Monatssummen in eine PNG-Datei.
+    Läuft auch in Worker-Prozessen und erhält deshalb nur die
+    vorberechneten Daten.
+
+    Args:
+        kategorien_daten (dict): Ergebnis von
+            monats_summen_pro_kategorie_mit_limits
+        budget_limits (dict | None): Budget-Limits pro Kategorie
+        pfad (str): Zieldatei des Renderings
+    """
+    kategorien = list(kategorien_daten.keys())
+
     prev_values = []
     curr_values = []
     farben = []
@@ -235,52 +406,52 @@ def plot_monats_summen_pro_kategorie(kategorien_daten, budget_limits=None):
 
     def format_thousands(x, p):
         return f"{int(x):,}".replace(",", "'")
-    ax.yaxis.set_major_formatter(FuncFormatter(format_thousands))
+    ax.yaxis.set_major_formatter(ticker.FuncFormatter(format_thousands))
 
     legend_elements = [
-        Line2D([0], [0],
-               color='w',
-               marker='s',
-               markeredgecolor='black',
-               markerfacecolor='lightgray',
-               markersize=10,
-               label='Vormonat',
-               alpha=0.6),
-        Line2D([0], [0],
-               color='w',
-               marker='s',
-               markeredgecolor='black',
-               markerfacecolor='green',
-               markersize=10,
-               label='Innerhalb Limit',
-               alpha=0.7),
-        Line2D([0], [0],
-               color='w',
-               marker='s',
-               markeredgecolor='black',
-               markerfacecolor='red',
-               markersize=10,
-               label='Limit überschritten',
-               alpha=0.7),
-        Line2D([0], [0],
-               color='w',
-               marker='s',
-               markeredgecolor='black',
-               markerfacecolor='blue',
-               markersize=10,
-               label='Kein Limit gesetzt',
-               alpha=0.7),
+        lines.Line2D([0], [0],
+                     color='w',
+                     marker='s',
+                     markeredgecolor='black',
+                     markerfacecolor='lightgray',
+                     markersize=10,
+                     label='Vormonat',
+                     alpha=0.6),
+        lines.Line2D([0], [0],
+                     color='w',
+                     marker='s',
+                     markeredgecolor='black',
+                     markerfacecolor='green',
+                     markersize=10,
+                     label='Innerhalb Limit',
+                     alpha=0.7),
+        lines.Line2D([0], [0],
+                     color='w',
+                     marker='s',
+                     markeredgecolor='black',
+                     markerfacecolor='red',
+                     markersize=10,
+                     label='Limit überschritten',
+                     alpha=0.7),
+        lines.Line2D([0], [0],
+                     color='w',
+                     marker='s',
+                     markeredgecolor='black',
+                     markerfacecolor='blue',
+                     markersize=10,
+                     label='Kein Limit gesetzt',
+                     alpha=0.7),
     ]
     if budget_limits:
         legend_elements.append(
-            Line2D([0], [0],
-                   color='w',
-                   marker='s',
-                   markeredgecolor='black',
-                   markerfacecolor='#D2691E',
-                   markersize=10,
-                   label='Budgetlimit',
-                   alpha=0.8))
+            lines.Line2D([0], [0],
+                         color='w',
+                         marker='s',
+                         markeredgecolor='black',
+                         markerfacecolor='#D2691E',
+                         markersize=10,
+                         label='Budgetlimit',
+                         alpha=0.8))
 
     ax.legend(
         handles=legend_elements,
@@ -289,22 +460,42 @@ def plot_monats_summen_pro_kategorie(kategorien_daten, budget_limits=None):
         ncol=20)
 
     plt.tight_layout()
-    plt.savefig('monats_summen_diagramm.png',
+    plt.savefig(pfad,
                 dpi=100,
                 bbox_inches='tight')
-    print("\n\033[32mDiagramm gespeichert als "
-          "'monats_summen_diagramm.png'\033[0m")
     plt.close()
 
 
+@gemessen
 def plot_finanzziele(finanzziel_daten):
-    """Zeichnet ein Balkendiagramm für Finanzziele."""
-    kategorien = list(finanzziel_daten.keys())
-
-    if not kategorien:
+    """
+    Zeichnet ein Balkendiagramm für Finanzziele.
+    Ein Rendering mit identischen Eingaben wird aus dem Cache übernommen.
+    """
+    if not finanzziel_daten:
         print("Keine Finanzziel-Daten zum Plotten.")
         return
 
+    schlüssel = fingerabdruck(ZIEL_DIAGRAMM, finanzziel_daten)
+    if not aus_cache_holen(ZIEL_DIAGRAMM, schlüssel):
+        ziel_diagramm_zeichnen(finanzziel_daten, rendering_pfad(schlüssel))
+        rendering_übernehmen(ZIEL_DIAGRAMM, schlüssel)
+    print(f"\n\033[32mDiagramm gespeichert als '{ZIEL_DIAGRAMM}'\033[0m")
+
+
+@gemessen
+def ziel_diagramm_zeichnen(finanzziel_daten, pfad):
+    """
+    Rendert das Finanzziel-Diagramm in eine PNG-Datei.
+    Läuft auch in Worker-Prozessen und erhält deshalb nur die
+    vorberechneten Daten.
+
+    Args:
+        finanzziel_daten (dict): Ergebnis von finanzziel_statistik_daten
+        pfad (str): Zieldatei des Renderings
+    """
+    kategorien = list(finanzziel_daten.keys())
+
     ziele = []
     ausgaben = []
     farben = []
@@ -370,28 +561,28 @@ def plot_finanzziele(finanzziel_daten):
 
     def format_thousands(x, p):
         return f"{int(x):,}".replace(",", "'")
-    ax.yaxis.set_major_formatter(FuncFormatter(format_thousands))
+    ax.yaxis.set_major_formatter(ticker.FuncFormatter(format_thousands))
 
     legend_elements = [
         plt.Line2D([0], [0],
                    color='w',
                    marker='s',
                    markeredgecolor='black',
-                   markerfacecolor=to_rgba('lightblue', 0.6),
+                   markerfacecolor=colors.to_rgba('lightblue', 0.6),
                    markersize=10,
                    label='Finanzziel'),
         plt.Line2D([0], [0],
                    color='w',
                    marker='s',
                    markeredgecolor='black',
-                   markerfacecolor=to_rgba('green', 0.7),
+                   markerfacecolor=colors.to_rgba('green', 0.7),
                    markersize=10,
                    label='Ziel erreicht'),
         plt.Line2D([0], [0],
                    color='w',
                    marker='s',
                    markeredgecolor='black',
-                   markerfacecolor=to_rgba('red', 0.7),
+                   markerfacecolor=colors.to_rgba('red', 0.7),
                    markersize=10,
                    label='Ziel nicht erreicht'),
     ]
@@ -401,19 +592,91 @@ def plot_finanzziele(finanzziel_daten):
               ncol=20)
 
     plt.tight_layout()
-    plt.savefig('finanzziele_diagramm.png',
+    plt.savefig(pfad,
                 dpi=100, bbox_inches='tight')
-    print(
-        "\n\033[32mDiagramm gespeichert als 'finanzziele_diagramm.png'\033[0m")
     plt.close()
 
 
+def diagramm_im_hintergrund(dateiname, zeichnen_func, *daten):
+    """
+    Übergibt ein Diagramm an den Prozess-Pool und kehrt sofort zurück.
+    Ein Rendering mit identischen Eingaben wird direkt aus dem Cache
+    übernommen. Die Fertigmeldung erfolgt über
+    fertige_diagramme_melden().
+
+    Args:
+        dateiname (str): Name der Ausgabedatei
+        zeichnen_func (callable): Modulweite Zeichenfunktion, die mit
+                                  *daten und dem Zielpfad aufgerufen wird
+        *daten: Vorberechnete, picklebare Daten des Diagramms
+    """
+    global _render_pool
+
+    schlüssel = fingerabdruck(dateiname, *daten)
+    _angeforderte_renderings[dateiname] = schlüssel
+    if aus_cache_holen(dateiname, schlüssel):
+        print(f"\n\033[32mDiagramm gespeichert als '{dateiname}'\033[0m")
+        return
+
+    if _render_pool is None:
+        _render_pool = ProcessPoolExecutor(
+            max_workers=_MAX_RENDER_PROZESSE,
+            mp_context=multiprocessing.get_context("spawn"))
+    start = time.perf_counter_ns()
+    future = _render_pool.submit(zeichnen_func, *daten,
+                                 rendering_pfad(schlüssel))
+    future.add_done_callback(lambda _: ereignis_aufzeichnen(
+        "diagramm_im_hintergrund", start, time.perf_counter_ns(),
+        datei=dateiname))
+    _laufende_renderings.append((future, dateiname, schlüssel))
+    print(f"\n\033[34mDiagramm '{dateiname}' wird im Hintergrund "
+          "erstellt.\033[0m")
+
+
+def fertige_diagramme_melden():
+    """
+    Übernimmt abgeschlossene Hintergrund-Renderings und meldet sie.
+    Ein Rendering, das inzwischen durch eine neuere Anforderung
+    desselben Diagramms überholt wurde, landet nur im Cache.
+    """
+    for rendering in list(_laufende_renderings):
+        future, dateiname, schlüssel = rendering
+        if not future.done():
+            continue
+        _laufende_renderings.remove(rendering)
+
+        fehler = future.exception()
+        if fehler is not None:
+            print(f"\n\033[31mFehler beim Erstellen von '{dateiname}': "
+                  f"{fehler}\033[0m")
+            continue
+
+        aktuell = _angeforderte_renderings.get(dateiname) == schlüssel
+        rendering_übernehmen(dateiname, schlüssel, ausgeben=aktuell)
+        if aktuell:
+            print(f"\n\033[32mDiagramm gespeichert als "
+                  f"'{dateiname}'\033[0m")
+
+
+def hintergrund_renderings_abschließen():
+    """Wartet auf laufende Renderings und beendet den Prozess-Pool."""
+    global _render_pool
+
+    if _render_pool is None:
+        return
+    _render_pool.shutdown(wait=True)
+    _render_pool = None
+    fertige_diagramme_melden()
+
+
 def statistik_menü(budget_kategorien, budget_limits, finanzziele, timed_input):
     """Zeigt ein Untermenü für Statistik-Funktionen an."""
     while True:
+        fertige_diagramme_melden()
         print("\n\033[1mStatistik-Menü\033[0m")
         print("1. Statistik nach Kategorie (Budgetlimiten)")
         print("2. Statistik Finanzziele")
+        print("3. Ausgaben im Zeitraum (mit Vorperiode)")
 
         auswahl = timed_input(
             "\n\033[34mGib die Nummer der gewünschten Statistik-Funktion ein "
@@ -424,8 +687,9 @@ def statistik_menü(budget_kategorien, budget_limits, finanzziele, timed_input):
             return
 
         elif auswahl == "1":
+            zeitraum = zeitraum_eingeben(timed_input)
             kategorien_daten = monats_summen_pro_kategorie_mit_limits(
-                budget_kategorien, budget_limits)
+                budget_kategorien, budget_limits, zeitraum=zeitraum)
 
             kategorien = list(kategorien_daten.keys())
             if not kategorien:
@@ -434,11 +698,10 @@ def statistik_menü(budget_kategorien, budget_limits, finanzziele, timed_input):
                     "\n\033[33mDrücke Enter, um zurückzukehren.\033[0m")
                 continue
 
-            plot_monats_summen_pro_kategorie(kategorien_daten, budget_limits)
-            _ = timed_input(
-                "\n\033[34mStatistik-Daten für Budgetlimiten "
-                "wurden vorbereitet. Drücke Enter, um zurückzukehren.\033[0m"
-            )
+            diagramm_im_hintergrund(MONATS_DIAGRAMM,
+                                    monats_diagramm_zeichnen,
+                                    kategorien_daten,
+                                    budget_limits)
 
         elif auswahl == "2":
             finanzziel_daten = finanzziel_statistik_daten(budget_kategorien,
@@ -450,11 +713,15 @@ def statistik_menü(budget_kategorien, budget_limits, finanzziele, timed_input):
                     "\n\033[34mDrücke Enter, um zurückzukehren.\033[0m")
                 continue
 
-            plot_finanzziele(finanzziel_daten)
-            _ = timed_input(
-                "\n\033[34mStatistik-Daten für Finanzziele wurden vorbereitet. "
-                "Drücke Enter, um zurückzukehren.\033[0m"
-            )
+            diagramm_im_hintergrund(ZIEL_DIAGRAMM,
+                                    ziel_diagramm_zeichnen,
+                                    finanzziel_daten)
+
+        elif auswahl == "3":
+            zeitraum = zeitraum_eingeben(timed_input)
+            zeitraum_statistik_ausgeben(
+                zeitraum_statistik_daten(budget_kategorien, *zeitraum),
+                *zeitraum)
 
         else:
             print("\n\033[31mAchtung: Ungültige Nummer!\033[0m")
@@ -0,0 +1,4 @@
+"""
+Tests für Budget-Tracker
+(Aufruf: python -m unittest aus dem Projektverzeichnis)
+"""
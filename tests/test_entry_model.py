@@ -0,0 +1,257 @@
+"""
+Tests für die EintragsListe
+Vergleicht Einfügen, Löschen, Ändern und Zeitraum-Summen mit einer
+gewöhnlichen Liste als Referenz
+"""
+
+import random
+import unittest
+from bisect import bisect_right
+from datetime import date
+
+from entry_model import (Eintrag, EintragsListe, VerzögerteEintragsListe,
+                         tag_als_monat)
+
+
+ERSTER_TAG = date(2024, 1, 1).toordinal()
+KOSTENARTEN = ["Brot", "Milch", "Miete", "Kino", "Zug"]
+
+
+class Referenz:
+    """
+    Einträge als gewöhnliche Liste von (Tag, Kostenart, Rappen, ID),
+    nach Datum sortiert; neue Einträge stehen hinter denen ihres Tages.
+    """
+
+    def __init__(self):
+        self.zeilen = []
+        self.nächste_id = 1
+
+    def einfügen(self, eintrag):
+        zeile = (eintrag.tag, eintrag.kostenart,
+                 round(eintrag.betrag * 100), self.nächste_id)
+        self.nächste_id += 1
+        self._einsetzen(zeile)
+
+    def _einsetzen(self, zeile):
+        tage = [z[0] for z in self.zeilen]
+        self.zeilen.insert(bisect_right(tage, zeile[0]), zeile)
+
+    def position(self, eintrag_id):
+        for position, zeile in enumerate(self.zeilen):
+            if zeile[3] == eintrag_id:
+                return position
+        raise KeyError(eintrag_id)
+
+    def ändern(self, eintrag_id, eintrag):
+        position = self.position(eintrag_id)
+        zeile = (eintrag.tag, eintrag.kostenart,
+                 round(eintrag.betrag * 100), eintrag_id)
+        # Bleibt die Sortierung erhalten, ändert sich die Position nicht
+        vorher = self.zeilen[position - 1][0] if position else None
+        nachher = (self.zeilen[position + 1][0]
+                   if position + 1 < len(self.zeilen) else None)
+        if (eintrag.tag == self.zeilen[position][0]
+                or ((vorher is None or vorher <= eintrag.tag)
+                    and (nachher is None or eintrag.tag < nachher))):
+            self.zeilen[position] = zeile
+        else:
+            del self.zeilen[position]
+            self._einsetzen(zeile)
+
+    def summe(self, erster_tag=None, letzter_tag=None):
+        return sum(z[2] for z in self.zeilen
+                   if (erster_tag is None or z[0] >= erster_tag)
+                   and (letzter_tag is None or z[0] <= letzter_tag))
+
+    def monats_summen(self, erster_tag=None, letzter_tag=None):
+        summen = {}
+        for tag, _, rappen, _ in self.zeilen:
+            if ((erster_tag is None or tag >= erster_tag)
+                    and (letzter_tag is None or tag <= letzter_tag)):
+                monat = tag_als_monat(tag)
+                summen[monat] = summen.get(monat, 0) + rappen
+        return {monat: summen[monat] / 100 for monat in sorted(summen)}
+
+
+def zufälliger_eintrag(zufall):
+    return Eintrag(ERSTER_TAG + zufall.randrange(400),
+                   zufall.choice(KOSTENARTEN),
+                   zufall.randrange(0, 100000) / 100)
+
+
+def als_zeilen(einträge):
+    return [(e.tag, e.kostenart, round(e.betrag * 100), e.id)
+            for e in einträge]
+
+
+class EintragsListeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.zufall = random.Random(25)
+        self.einträge = EintragsListe()
+        self.referenz = Referenz()
+
+    def assertGleich(self):
+        """Vergleicht Inhalt, Summen und ID-Index mit der Referenz."""
+        self.assertEqual(als_zeilen(self.einträge), self.referenz.zeilen)
+        self.assertEqual(len(self.einträge), len(self.referenz.zeilen))
+        self.assertEqual(round(self.einträge.gesamt * 100),
+                         self.referenz.summe())
+        self.assertEqual(self.einträge.monats_summen(),
+                         self.referenz.monats_summen())
+        self.assertEqual(self.einträge.nächste_id, self.referenz.nächste_id)
+        for tag, kostenart, rappen, eintrag_id in self.referenz.zeilen:
+            eintrag = self.einträge.nach_id(eintrag_id)
+            self.assertEqual((eintrag.tag, eintrag.kostenart),
+                             (tag, kostenart))
+
+    def test_einfügen_und_erweitern(self):
+        for _ in range(200):
+            eintrag = zufälliger_eintrag(self.zufall)
+            self.einträge.einfügen(eintrag)
+            self.referenz.einfügen(eintrag)
+        neue = [zufälliger_eintrag(self.zufall) for _ in range(300)]
+        self.einträge.erweitern(neue)
+        for eintrag in neue:
+            self.referenz.einfügen(eintrag)
+        self.assertGleich()
+
+    def test_gemischte_änderungen(self):
+        for _ in range(2000):
+            aktion = self.zufall.random()
+            zeilen = self.referenz.zeilen
+            if aktion < 0.4 or not zeilen:
+                eintrag = zufälliger_eintrag(self.zufall)
+                self.einträge.einfügen(eintrag)
+                self.referenz.einfügen(eintrag)
+            elif aktion < 0.5:
+                neue = [zufälliger_eintrag(self.zufall)
+                        for _ in range(self.zufall.randrange(1, 20))]
+                self.einträge.erweitern(neue)
+                for eintrag in neue:
+                    self.referenz.einfügen(eintrag)
+            elif aktion < 0.6:
+                position = self.zufall.randrange(len(zeilen))
+                entfernt = self.einträge.entfernen(position)
+                self.assertEqual(entfernt.id, zeilen.pop(position)[3])
+            elif aktion < 0.8:
+                eintrag_id = self.zufall.choice(zeilen)[3]
+                self.einträge.löschen(eintrag_id)
+                del zeilen[self.referenz.position(eintrag_id)]
+            else:
+                eintrag_id = self.zufall.choice(zeilen)[3]
+                eintrag = zufälliger_eintrag(self.zufall)
+                if self.zufall.random() < 0.5:
+                    # Gleicher Tag: bleibt an seiner Position
+                    eintrag.tag = zeilen[
+                        self.referenz.position(eintrag_id)][0]
+                self.einträge.ändern(eintrag_id, eintrag)
+                self.referenz.ändern(eintrag_id, eintrag)
+        self.assertGleich()
+
+    def test_zeitraum_summen(self):
+        neue = [zufälliger_eintrag(self.zufall) for _ in range(500)]
+        self.einträge.erweitern(neue)
+        for eintrag in neue:
+            self.referenz.einfügen(eintrag)
+        for runde in range(200):
+            erster = ERSTER_TAG + self.zufall.randrange(-10, 410)
+            letzter = erster + self.zufall.randrange(-5, 120)
+            self.assertEqual(
+                round(self.einträge.zeitraum_summe(erster, letzter) * 100),
+                self.referenz.summe(erster, letzter))
+            self.assertEqual(
+                self.einträge.monats_summen(erster, letzter),
+                self.referenz.monats_summen(erster, letzter))
+            start, ende = self.einträge.bereich(erster, letzter)
+            self.assertEqual(
+                ende - start,
+                sum(1 for z in self.referenz.zeilen
+                    if erster <= z[0] <= letzter))
+            # Änderungen dazwischen kürzen die Präfixsummen
+            if runde % 10 == 0:
+                position = self.zufall.randrange(len(self.referenz.zeilen))
+                self.einträge.entfernen(position)
+                del self.referenz.zeilen[position]
+
+    def test_gelöschte_ids(self):
+        neue = [zufälliger_eintrag(self.zufall) for _ in range(50)]
+        self.einträge.erweitern(neue)
+        for eintrag in neue:
+            self.referenz.einfügen(eintrag)
+        gelöscht = self.zufall.sample(range(1, 51), 20)
+        for eintrag_id in gelöscht:
+            self.einträge.löschen(eintrag_id)
+            del self.referenz.zeilen[self.referenz.position(eintrag_id)]
+            with self.assertRaises(KeyError):
+                self.einträge.nach_id(eintrag_id)
+        # Die Summen stimmen schon vor dem Verdichten
+        self.assertEqual(round(self.einträge.gesamt * 100),
+                         self.referenz.summe())
+        self.assertGleich()
+        # Gelöschte IDs werden nicht wieder vergeben
+        eintrag = zufälliger_eintrag(self.zufall)
+        self.einträge.einfügen(eintrag)
+        self.assertEqual(eintrag.id, 51)
+        with self.assertRaises(KeyError):
+            self.einträge.löschen(gelöscht[0])
+
+    def test_ungültiger_betrag_ändert_nichts(self):
+        neue = [zufälliger_eintrag(self.zufall) for _ in range(20)]
+        self.einträge.erweitern(neue)
+        for eintrag in neue:
+            self.referenz.einfügen(eintrag)
+        zu_gross = Eintrag(ERSTER_TAG, "Brot", 1e20)
+        with self.assertRaises(ValueError):
+            self.einträge.einfügen(zu_gross)
+        with self.assertRaises(ValueError):
+            self.einträge.erweitern([zufälliger_eintrag(self.zufall),
+                                     Eintrag(ERSTER_TAG, "Brot",
+                                             float("inf"))])
+        with self.assertRaises(ValueError):
+            self.einträge.ändern(3, zu_gross)
+        self.assertGleich()
+
+
+class VerzögerteEintragsListeTest(unittest.TestCase):
+
+    def test_lädt_beim_ersten_zugriff(self):
+        aufrufe = []
+
+        def quelle():
+            aufrufe.append(1)
+            return [Eintrag(ERSTER_TAG + 1, "Milch", 1.8),
+                    Eintrag(ERSTER_TAG, "Brot", 2.5)]
+
+        einträge = VerzögerteEintragsListe(quelle)
+        self.assertEqual(aufrufe, [])
+        self.assertEqual(len(einträge), 2)
+        self.assertIs(type(einträge), EintragsListe)
+        self.assertEqual([e.kostenart for e in einträge], ["Brot", "Milch"])
+        self.assertEqual(einträge.gesamt, 4.3)
+        self.assertEqual(aufrufe, [1])
+
+    def test_übernimmt_fertige_liste(self):
+        fertig = EintragsListe([Eintrag(ERSTER_TAG, "Brot", 2.5)])
+        einträge = VerzögerteEintragsListe(lambda: fertig)
+        self.assertEqual(als_zeilen(einträge), als_zeilen(fertig))
+        self.assertEqual(einträge.nächste_id, 2)
+
+    def test_lesefehler_lässt_liste_ungeladen(self):
+        versuche = []
+
+        def quelle():
+            versuche.append(1)
+            if len(versuche) == 1:
+                raise OSError("nicht lesbar")
+            return [Eintrag(ERSTER_TAG, "Brot", 2.5)]
+
+        einträge = VerzögerteEintragsListe(quelle)
+        with self.assertRaises(OSError):
+            len(einträge)
+        self.assertEqual(len(einträge), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
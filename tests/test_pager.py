@@ -0,0 +1,124 @@
+"""
+Tests für die Seitenansicht
+Prüft die Seiten nach dem Löschen einzelner Einträge gegen eine neu
+sortierte Referenz
+"""
+
+import random
+import unittest
+from datetime import date
+
+from entry_model import Eintrag, EintragsListe
+from pager import EintragsSeiten, MIN_VERDICHTEN, _überspringen
+
+
+ERSTER_TAG = date(2025, 1, 1).toordinal()
+
+
+def seiten_ids(seiten, einträge):
+    """IDs aller Seiten in Anzeigereihenfolge."""
+    ids = []
+    for seite in range(seiten.anzahl_seiten()):
+        seiten.blättern(seite)
+        nummer = 1
+        while True:
+            try:
+                position = seiten.position(nummer)
+            except IndexError:
+                break
+            ids.append(einträge[position].id)
+            nummer += 1
+    return ids
+
+
+class EintragsSeitenTest(unittest.TestCase):
+
+    def setUp(self):
+        zufall = random.Random(16)
+        self.zufall = zufall
+        self.einträge = EintragsListe(
+            Eintrag(ERSTER_TAG + zufall.randrange(90), "Brot",
+                    zufall.randrange(100, 10000) / 100)
+            for _ in range(3 * MIN_VERDICHTEN))
+
+    def referenz(self, sortierung, absteigend, zeitraum=(None, None)):
+        start, ende = self.einträge.bereich(*zeitraum)
+        einträge = self.einträge[start:ende]
+        if sortierung == "b":
+            # Stabil wie die Positionsliste: bei gleichem Betrag nach Datum
+            einträge = sorted(einträge, key=lambda e: e.betrag,
+                              reverse=absteigend)
+        elif absteigend:
+            einträge.reverse()
+        return [e.id for e in einträge]
+
+    def löschen_und_prüfen(self, seiten, anzahl, zeitraum=(None, None)):
+        for runde in range(anzahl):
+            seiten.blättern(self.zufall.randrange(seiten.anzahl_seiten()))
+            start = seiten.seite * 7
+            nummer = self.zufall.randrange(
+                1, min(7, seiten.anzahl() - start) + 1)
+            position = seiten.position(nummer)
+            if runde % 2:
+                # Wie im Menü: über die ID, die Liste verdichtet später
+                self.einträge.löschen(self.einträge[position].id)
+            else:
+                self.einträge.entfernen(position)
+            seiten.eintrag_entfernt(position)
+            self.assertEqual(seiten_ids(seiten, self.einträge),
+                             self.referenz(seiten.sortierung,
+                                           seiten.absteigend, zeitraum))
+
+    def test_nach_betrag_über_verdichten_hinaus(self):
+        seiten = EintragsSeiten(self.einträge, seiten_grösse=7)
+        seiten.sortieren("b")
+        self.assertTrue(seiten.absteigend)
+        self.assertEqual(seiten_ids(seiten, self.einträge),
+                         self.referenz("b", True))
+        # Mehr als MIN_VERDICHTEN Löschungen: vermerkt, dann verdichtet
+        self.löschen_und_prüfen(seiten, MIN_VERDICHTEN + 20)
+
+    def test_nach_datum_mit_zeitraum(self):
+        zeitraum = (ERSTER_TAG + 10, ERSTER_TAG + 60)
+        seiten = EintragsSeiten(self.einträge, zeitraum, seiten_grösse=7)
+        seiten.sortieren("d")
+        self.assertTrue(seiten.absteigend)
+        self.löschen_und_prüfen(seiten, 30, zeitraum)
+
+    def test_betrag_aufsteigend_mit_zeitraum(self):
+        zeitraum = (ERSTER_TAG + 20, None)
+        seiten = EintragsSeiten(self.einträge, zeitraum, seiten_grösse=7)
+        seiten.sortieren("b")
+        seiten.sortieren("b")
+        self.assertFalse(seiten.absteigend)
+        self.löschen_und_prüfen(seiten, 40, zeitraum)
+
+    def test_letzte_seite_nach_löschen(self):
+        seiten = EintragsSeiten(self.einträge, seiten_grösse=7)
+        seiten.sortieren("b")
+        seiten.blättern(seiten.anzahl_seiten() - 1)
+        while seiten.anzahl() % 7 != 1:
+            position = seiten.position(1)
+            self.einträge.entfernen(position)
+            seiten.eintrag_entfernt(position)
+        letzte = seiten.seite
+        position = seiten.position(1)
+        self.einträge.entfernen(position)
+        seiten.eintrag_entfernt(position)
+        # Die leere Seite verschwindet, die Ansicht springt zurück
+        self.assertEqual(seiten.seite, letzte - 1)
+
+
+class ÜberspringenTest(unittest.TestCase):
+
+    def test_gegen_aufzählung(self):
+        zufall = random.Random(7)
+        for _ in range(200):
+            lücken = sorted(zufall.sample(range(60), zufall.randrange(30)))
+            übrig = [i for i in range(60) if i not in lücken]
+            for nummer, index in enumerate(übrig):
+                self.assertEqual(_überspringen(nummer, lücken), index)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+"""
+Tests für das Speichern und Laden
+Schreibt Änderungen über Journal und binären Snapshot und prüft, dass
+nach dem erneuten Laden derselbe Stand vorliegt
+"""
+
+import base64
+import json
+import os
+import tempfile
+import unittest
+from datetime import date
+from unittest import mock
+
+import data_handler
+from category_manager import (kategorie_anlegen, kategorie_umbenennen,
+                              eintrag_hinzufügen, einträge_hinzufügen,
+                              eintrag_löschen, eintrag_ändern)
+from data_handler import daten_laden, daten_speichern, snapshot_schreiben
+from entry_model import Eintrag
+from finance_control import limit_setzen, ziel_setzen
+from journal import JOURNAL_DATEI, offene_änderungen_verwerfen
+
+
+# Sieht für daten_laden wie ein bcrypt-Hash aus, damit beim Laden
+# nicht gehasht wird
+PASSWORT = base64.b64encode(b"$2b$10$" + b"x" * 53).decode()
+
+# budget_daten.json im ursprünglichen Format: Kategorien als Textzeilen
+# in Erfassungsreihenfolge
+URSPRÜNGLICHE_DATEN = {
+    "budget_kategorien": {
+        "Lebensmittel": [
+            "05.01.2025 - Nudeln - 2.50 CHF",
+            "02.01.2025 - Milch - 1.80 CHF",
+            "kaputte Zeile",
+            "20.02.2025 - Brot - 3.20 CHF",
+        ],
+        "Freizeit": ["11.01.2025 - Kino - 18.00 CHF"],
+        "Transport": [],
+    },
+    "budget_limits": {"Lebensmittel": 200.0},
+    "finanzziele": {},
+    "benutzer_passwort": {"passwort": PASSWORT},
+}
+
+
+def tag(datum):
+    return date.fromisoformat(datum).toordinal()
+
+
+def zustand(daten):
+    """Vergleichbarer Stand; lädt dabei alle Kategorien."""
+    budget_kategorien, budget_limits, finanzziele, benutzer_passwort = daten
+    return ({kategorie: ([(e.tag, e.kostenart, e.betrag, e.id)
+                          for e in einträge],
+                         einträge.nächste_id,
+                         list(einträge.unlesbar))
+             for kategorie, einträge in budget_kategorien.items()},
+            budget_limits,
+            finanzziele,
+            benutzer_passwort)
+
+
+class SpeichernTest(unittest.TestCase):
+
+    def setUp(self):
+        verzeichnis = tempfile.TemporaryDirectory()
+        self.addCleanup(verzeichnis.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(verzeichnis.name)
+
+        for name, wert in (("SPEICHER_BACKEND", "json"),
+                           ("_journal_stand", 0),
+                           ("_snapshot_nötig", False)):
+            patcher = mock.patch.object(data_handler, name, wert)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        offene_änderungen_verwerfen()
+        self.addCleanup(offene_änderungen_verwerfen)
+
+        with open(data_handler.DATEN_DATEI, "w", encoding="utf-8") as f:
+            json.dump(URSPRÜNGLICHE_DATEN, f, indent=4, ensure_ascii=False)
+
+    def test_ursprüngliche_json_datei(self):
+        budget_kategorien, budget_limits, _, benutzer_passwort = daten_laden()
+        lebensmittel = budget_kategorien["Lebensmittel"]
+        # Nach Datum sortiert, IDs in Erfassungsreihenfolge
+        self.assertEqual(
+            [(e.kostenart, e.id) for e in lebensmittel],
+            [("Milch", 2), ("Nudeln", 1), ("Brot", 3)])
+        self.assertEqual(lebensmittel.unlesbar, ["kaputte Zeile"])
+        self.assertEqual(lebensmittel.gesamt, 7.5)
+        self.assertEqual(len(budget_kategorien["Transport"]), 0)
+        self.assertEqual(budget_limits, {"Lebensmittel": 200.0})
+        self.assertEqual(benutzer_passwort["passwort"], PASSWORT)
+
+    def _ändern(self, daten):
+        budget_kategorien, budget_limits, finanzziele, _ = daten
+        eintrag_hinzufügen(budget_kategorien, "Lebensmittel",
+                           Eintrag(tag("2025-01-02"), "Butter", 3.7))
+        einträge_hinzufügen(budget_kategorien, "Freizeit",
+                            [Eintrag(tag("2025-03-01"), "Konzert", 45.0),
+                             Eintrag(tag("2024-12-24"), "Buch", 22.9)])
+        eintrag_löschen(budget_kategorien, "Lebensmittel", 1)
+        eintrag_ändern(budget_kategorien, "Lebensmittel", 3,
+                       Eintrag(tag("2024-12-31"), "Brot", 4.1))
+        kategorie_anlegen(budget_kategorien, "Ferien")
+        eintrag_hinzufügen(budget_kategorien, "Ferien",
+                           Eintrag(tag("2025-07-14"), "Hotel", 480.0))
+        kategorie_umbenennen(budget_kategorien, "Transport", "Verkehr")
+        limit_setzen(budget_limits, "Freizeit", 150.0)
+        ziel_setzen(finanzziele, "Ferien", 1000.0, "Ferienkasse voll")
+
+    def test_journal_und_snapshot(self):
+        daten = daten_laden()
+        # Nach der JSON-Datei wird zuerst ein binärer Snapshot geschrieben
+        daten_speichern(*daten)
+        self.assertTrue(os.path.exists(data_handler.BINÄR_DATEI))
+        self.assertFalse(os.path.exists(JOURNAL_DATEI))
+
+        self._ändern(daten)
+        daten_speichern(*daten)
+        self.assertTrue(os.path.exists(JOURNAL_DATEI))
+        erwartet = zustand(daten)
+
+        # Snapshot und Journal ergeben denselben Stand
+        neu = daten_laden()
+        self.assertEqual(zustand(neu), erwartet)
+
+        # Ein neuer Snapshot übernimmt ungeladene Kategorien spaltenweise
+        neu = daten_laden()
+        self.assertEqual(len(neu[0]["Ferien"]), 1)
+        snapshot_schreiben(*neu)
+        self.assertFalse(os.path.exists(JOURNAL_DATEI))
+        self.assertEqual(zustand(daten_laden()), erwartet)
+        self.assertEqual(zustand(neu), erwartet)
+
+    def test_neue_ids_nach_dem_laden(self):
+        daten = daten_laden()
+        daten_speichern(*daten)
+        eintrag_löschen(daten[0], "Lebensmittel", 3)
+        daten_speichern(*daten)
+
+        neu = daten_laden()
+        eintrag = Eintrag(tag("2025-02-01"), "Reis", 2.2)
+        eintrag_hinzufügen(neu[0], "Lebensmittel", eintrag)
+        # Die ID des gelöschten Eintrags wird nicht wieder vergeben
+        self.assertEqual(eintrag.id, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
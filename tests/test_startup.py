@@ -0,0 +1,32 @@
+"""
+Regressionstest für die Startzeit von main.py
+Nutzt die Messung aus benchmarks.startup (python -X importtime in
+einem frischen Interpreter)
+"""
+
+import unittest
+
+from benchmarks.startup import (startzeit_prüfen, STARTZEIT_BUDGET_MS,
+                                VERZÖGERTE_MODULE)
+
+
+class StartzeitTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.ergebnis = startzeit_prüfen()
+
+    def test_keine_statistik_module_beim_start(self):
+        # verfrüht_geladen: Module aus VERZÖGERTE_MODULE in sys.modules
+        self.assertEqual(self.ergebnis["verfrüht_geladen"], [],
+                         f"{', '.join(VERZÖGERTE_MODULE)} dürfen erst "
+                         f"für Statistiken geladen werden")
+
+    def test_importzeit_im_budget(self):
+        importzeit_ms = self.ergebnis["importzeit_ms"]
+        self.assertIsNotNone(importzeit_ms)
+        self.assertLessEqual(importzeit_ms, STARTZEIT_BUDGET_MS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+"""
+Tracing-Modul für Budget-Tracker
+Misst Menüaktionen, Laden/Speichern, Passwortprüfung und Statistiken
+als Spans und schreibt sie im Chrome-Trace-Format (chrome://tracing,
+Perfetto). Aktiv nur mit gesetzter Umgebungsvariable BUDGET_TRACE
+"""
+
+import atexit
+import functools
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+
+# Zieldatei des Traces; ohne Angabe ist das Tracing ausgeschaltet
+TRACE_DATEI = os.environ.get("BUDGET_TRACE", "")
+AKTIV = bool(TRACE_DATEI)
+
+_start_ns = time.perf_counter_ns()
+_ereignisse = []
+_offene_spans = threading.local()
+
+# Wird bei ausgeschaltetem Tracing statt eines Spans zurückgegeben
+_KEIN_SPAN = nullcontext()
+
+
+def span(name, **argumente):
+    """
+    Misst einen Codeabschnitt als Span.
+
+    Args:
+        name (str): Name des Spans (z.B. "daten_laden")
+        **argumente: Zusätzliche Angaben für den Trace
+
+    Returns:
+        Kontextmanager; ohne Tracing ein wiederverwendeter No-Op
+    """
+    if not AKTIV:
+        return _KEIN_SPAN
+    return _span(name, argumente)
+
+
+@contextmanager
+def _span(name, argumente):
+    stapel = _stapel()
+    stapel.append(argumente)
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        ende = time.perf_counter_ns()
+        stapel.pop()
+        _aufzeichnen(name, start, ende, argumente)
+
+
+def gemessen(funktion):
+    """
+    Dekorator, der jeden Aufruf einer Funktion als Span misst.
+    Ohne Tracing wird die Funktion unverändert zurückgegeben.
+
+    Args:
+        funktion (callable): Zu messende Funktion
+
+    Returns:
+        callable: Gemessene Funktion
+    """
+    if not AKTIV:
+        return funktion
+
+    @functools.wraps(funktion)
+    def wrapper(*args, **kwargs):
+        with _span(funktion.__name__, {}):
+            return funktion(*args, **kwargs)
+    return wrapper
+
+
+def bytes_zählen(anzahl):
+    """
+    Rechnet geschriebene Bytes dem innersten offenen Span zu.
+
+    Args:
+        anzahl (int): Anzahl geschriebener Bytes
+    """
+    if not AKTIV:
+        return
+    stapel = _stapel()
+    if stapel:
+        stapel[-1]["bytes"] = stapel[-1].get("bytes", 0) + anzahl
+
+
+def ereignis_aufzeichnen(name, start_ns, ende_ns, **argumente):
+    """
+    Zeichnet einen Span mit bekannten Start- und Endzeiten auf
+    (z.B. ein Rendering, das in einem anderen Prozess lief).
+
+    Args:
+        name (str): Name des Spans
+        start_ns (int): Start gemäss time.perf_counter_ns()
+        ende_ns (int): Ende gemäss time.perf_counter_ns()
+        **argumente: Zusätzliche Angaben für den Trace
+    """
+    if AKTIV:
+        _aufzeichnen(name, start_ns, ende_ns, argumente)
+
+
+def zusammenfassung():
+    """
+    Fasst alle Spans nach Namen zusammen.
+
+    Returns:
+        dict: Name -> {"aufrufe", "gesamt_ms", "max_ms", "bytes"}
+    """
+    ergebnis = {}
+    for ereignis in list(_ereignisse):
+        eintrag = ergebnis.setdefault(
+            ereignis["name"],
+            {"aufrufe": 0, "gesamt_ms": 0.0, "max_ms": 0.0, "bytes": 0})
+        dauer_ms = ereignis["dur"] / 1000
+        eintrag["aufrufe"] += 1
+        eintrag["gesamt_ms"] += dauer_ms
+        eintrag["max_ms"] = max(eintrag["max_ms"], dauer_ms)
+        eintrag["bytes"] += ereignis["args"].get("bytes", 0)
+    return ergebnis
+
+
+def trace_abschließen():
+    """
+    Schreibt die Trace-Datei und gibt die Zusammenfassung auf stderr
+    aus. Wird beim Programmende automatisch aufgerufen.
+    """
+    # Nur der Hauptprozess schreibt den Trace (nicht die Render-Worker)
+    if (not AKTIV or not _ereignisse
+            or multiprocessing.parent_process() is not None):
+        return
+    with open(TRACE_DATEI, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": _ereignisse, "displayTimeUnit": "ms"}, f,
+                  ensure_ascii=False)
+
+    print(f"\nTrace gespeichert als '{TRACE_DATEI}'", file=sys.stderr)
+    print(f"{'Span':<40} {'Aufrufe':>8} {'Gesamt ms':>11} "
+          f"{'Mittel ms':>10} {'Max ms':>10} {'Bytes':>12}", file=sys.stderr)
+    for name, werte in sorted(zusammenfassung().items(),
+                              key=lambda e: -e[1]["gesamt_ms"]):
+        print(f"{name:<40} {werte['aufrufe']:>8} "
+              f"{werte['gesamt_ms']:>11.2f} "
+              f"{werte['gesamt_ms'] / werte['aufrufe']:>10.2f} "
+              f"{werte['max_ms']:>10.2f} {werte['bytes']:>12}",
+              file=sys.stderr)
+
+
+def _stapel():
+    stapel = getattr(_offene_spans, "stapel", None)
+    if stapel is None:
+        stapel = _offene_spans.stapel = []
+    return stapel
+
+
+def _aufzeichnen(name, start_ns, ende_ns, argumente):
+    _ereignisse.append({
+        "name": name,
+        "ph": "X",
+        "ts": (start_ns - _start_ns) / 1000,
+        "dur": (ende_ns - start_ns) / 1000,
+        "pid": os.getpid(),
+        "tid": threading.get_ident(),
+        "args": argumente,
+    })
+
+
+if AKTIV:
+    atexit.register(trace_abschließen)
@@ -5,12 +5,24 @@ Enthält Validierungs- und Utility-Funktionen
 
 import threading
 import os
+import importlib
+import math
+import re
+import signal
+import tempfile
+import time
 from datetime import datetime
 
+from entry_model import datum_als_tag, MAX_BETRAG
+from tracing import bytes_zählen
+
 
 # Maximale Budgetlimite für Studenten
 MAX_BUDGET_LIMIT = 2000.0
 
+# Erlaubte Zeichen einer Kostenart (nur Buchstaben)
+KOSTENART_MUSTER = re.compile(r'^[A-Za-zÄÖÜäöüß]+$')
+
 
 def validiere_datum(datum_str):
     """
@@ -29,10 +41,33 @@ def validiere_datum(datum_str):
         return False
 
 
+def betrag_fehler(betrag, max_wert=None):
+    """
+    Prüft, ob ein Betrag endlich, positiv (>=0) und höchstens
+    max_wert bzw. MAX_BETRAG ist.
+
+    Args:
+        betrag (float): Zu prüfender Betrag
+        max_wert (float, optional): Maximaler erlaubter Wert
+
+    Returns:
+        str | None: Fehlermeldung oder None, wenn der Betrag gültig ist
+    """
+    if not math.isfinite(betrag):
+        return "Ungültiger Betrag!"
+    if betrag < 0:
+        return "Der Betrag darf nicht negativ sein!"
+    if max_wert is None or max_wert > MAX_BETRAG:
+        max_wert = MAX_BETRAG
+    if betrag > max_wert:
+        return f"Der Betrag darf maximal {max_wert:.2f} CHF betragen!"
+    return None
+
+
 def validiere_positiven_betrag(betrag, max_wert=None):
     """
-    Validiert ob ein Betrag positiv (>=0) und
-    optional unter einem Maximum liegt.
+    Validiert ob ein Betrag positiv (>=0) und unter einem Maximum
+    liegt (ohne Angabe MAX_BETRAG), und meldet sonst den Fehler.
 
     Args:
         betrag (float): Zu validierender Betrag
@@ -41,56 +76,266 @@ def validiere_positiven_betrag(betrag, max_wert=None):
     Returns:
         bool: True wenn Betrag gültig ist, sonst False
     """
-    if betrag < 0:
-        print("\n\033[31mFehler: Der Betrag darf nicht negativ sein!\033[0m")
-        return False
-    if max_wert is not None and betrag > max_wert:
-        print(
-            f"\n\033[31mFehler: Der Betrag darf maximal "
-            f"{max_wert:.2f} CHF betragen!\033[0m")
+    fehler = betrag_fehler(betrag, max_wert)
+    if fehler is not None:
+        print(f"\n\033[31mFehler: {fehler}\033[0m")
         return False
     return True
 
 
-def inaktivität_wrapper(timeout, daten_speichern_func):
+def zeitraum_eingeben(timed_input):
     """
-    Erstellt eine Wrapper-Funktion für input() mit
-    automatischem Logout bei Inaktivität.
+    Fragt einen optionalen Zeitraum ab. Eine leere Eingabe lässt
+    die jeweilige Grenze offen.
 
     Args:
-        timeout (int): Zeit in Sekunden bis zum automatischen Logout
-        daten_speichern_func (callable): Funktion zum Speichern der Daten
+        timed_input (callable): Input-Funktion mit Timeout
 
     Returns:
-        function: Wrapper-Funktion die input() mit Timer kombiniert
+        tuple: (erster_tag, letzter_tag) als Tages-Ordinalzahlen oder None
     """
+    while True:
+        grenzen = []
+        for frage in ("Von", "Bis"):
+            datum = timed_input(
+                f"\033[34m{frage} Datum (DD.MM.YYYY, Enter = offen):"
+                "\033[0m").strip()
+            if datum and not validiere_datum(datum):
+                print("\n\033[31mUngültiges Datum! Bitte verwende das "
+                      "Format DD.MM.YYYY (z.B. 01.02.2025)\033[0m")
+                break
+            grenzen.append(datum_als_tag(datum) if datum else None)
+        else:
+            erster_tag, letzter_tag = grenzen
+            if (erster_tag is not None and letzter_tag is not None
+                    and erster_tag > letzter_tag):
+                print("\n\033[31mDas Von-Datum liegt nach dem "
+                      "Bis-Datum.\033[0m")
+                continue
+            return erster_tag, letzter_tag
 
-    def logout():
-        print("\n\n\033[31mDu wurdest wegen Inaktivität ausgeloggt! \033[0m")
-        daten_speichern_func()
-        os._exit(0)
 
-    def timed_input_func(prompt):
-        timer = threading.Timer(timeout, logout)
-        timer.start()
+class _Abgelaufen(BaseException):
+    """Bricht eine blockierende Eingabe nach Ablauf der Frist ab."""
+
+
+class Sitzung:
+    """
+    Überwacht die Inaktivität einer Sitzung mit einem einzigen,
+    langlebigen Watchdog-Thread und einer rücksetzbaren Frist
+    (time.monotonic).
+
+    Läuft die Frist während einer blockierenden Eingabe ab, bricht
+    der Watchdog die Eingabe im Hauptthread per Signal ab; gespeichert
+    und beendet wird dann geordnet im Hauptthread, nie mitten in einer
+    Änderung. Eine nicht blockierende Eingabe meldet Aktivität mit
+    aktivität() und ruft zwischendurch abgelaufen_prüfen() auf.
+    Muss im Hauptthread erstellt werden.
+
+    Args:
+        timeout (float): Zeit in Sekunden bis zum automatischen Logout
+        daten_speichern_func (callable): Funktion zum Speichern der Daten,
+            kehrt erst zurück, wenn alles geschrieben ist
+    """
+
+    def __init__(self, timeout, daten_speichern_func):
+        self._timeout = timeout
+        self._daten_speichern_func = daten_speichern_func
+        self._bedingung = threading.Condition()
+        self._frist = time.monotonic() + timeout
+        self._blockiert = False
+        self._abgelaufen = False
+        self._beendet = False
+        self._hauptthread = threading.main_thread().ident
+        # Ohne pthread_kill (Windows) lässt sich input() nicht
+        # unterbrechen; der Watchdog speichert dann selbst, während
+        # der Hauptthread auf die Eingabe wartet
+        self._signal = (getattr(signal, "SIGUSR1", None)
+                        if hasattr(signal, "pthread_kill") else None)
+        if self._signal is not None:
+            signal.signal(self._signal, self._signal_empfangen)
+        self._thread = threading.Thread(target=self._überwachen,
+                                        name="Inaktivitäts-Watchdog",
+                                        daemon=True)
+        self._thread.start()
+
+    def eingabe(self, prompt):
+        """
+        input() mit automatischem Logout bei Inaktivität.
+
+        Args:
+            prompt (str): Eingabeaufforderung
+
+        Returns:
+            str: Eingabe des Benutzers
+        """
+        try:
+            return self._blockierend_einlesen(prompt)
+        except _Abgelaufen:
+            self._blockierung_beenden()
+            self._abmelden()
+
+    def aktivität(self):
+        """Setzt die Frist zurück (für nicht blockierende Eingaben)."""
+        with self._bedingung:
+            self._frist = time.monotonic() + self._timeout
+            self._bedingung.notify_all()
+
+    def restzeit(self):
+        """float: Sekunden bis zum automatischen Logout."""
+        return max(0.0, self._frist - time.monotonic())
+
+    def abgelaufen_prüfen(self):
+        """
+        Meldet ab und beendet das Programm, wenn die Frist abgelaufen
+        ist. Für nicht blockierende Eingaben, die ihre Schleife im
+        Hauptthread selbst steuern.
+        """
+        if self.restzeit() <= 0:
+            self._abmelden()
+
+    def beenden(self):
+        """Beendet den Watchdog-Thread."""
+        with self._bedingung:
+            self._beendet = True
+            self._bedingung.notify_all()
+        self._thread.join()
+
+    def _blockierend_einlesen(self, prompt):
+        with self._bedingung:
+            self._frist = time.monotonic() + self._timeout
+            self._blockiert = True
+            self._bedingung.notify_all()
         try:
             eingabe = input(prompt)
-            timer.cancel()
-            return eingabe
 
         except (KeyboardInterrupt, EOFError):
-            timer.cancel()
+            if self._blockierung_beenden():
+                self._abmelden()
             print("\n\nEingabe abgebrochen (Ctrl+C/EOF).")
-            daten_speichern_func()
+            self._daten_speichern_func()
             raise SystemExit(0)
 
         except Exception as e:
-            timer.cancel()
+            if self._blockierung_beenden():
+                self._abmelden()
             print(f"\n\nUnerwarteter Fehler bei der Eingabe: {e}")
-            daten_speichern_func()
+            self._daten_speichern_func()
             raise SystemExit(1)
-        
-    return timed_input_func
+
+        # Auch wenn die Eingabe gerade noch vor dem Signal ankam,
+        # gilt die abgelaufene Frist
+        if self._blockierung_beenden():
+            self._abmelden()
+        return eingabe
+
+    def _blockierung_beenden(self):
+        """Beendet die blockierende Eingabe; True, wenn abgelaufen."""
+        with self._bedingung:
+            self._blockiert = False
+            return self._abgelaufen
+
+    def _signal_empfangen(self, signum, frame):
+        # Nur eine noch laufende Eingabe abbrechen; sonst übernimmt
+        # eingabe() die Abmeldung selbst
+        if self._blockiert:
+            raise _Abgelaufen
+
+    def _überwachen(self):
+        with self._bedingung:
+            while not self._beendet:
+                rest = self._frist - time.monotonic()
+                if not self._blockiert or rest > 0:
+                    self._bedingung.wait(rest if self._blockiert else None)
+                    continue
+                self._abgelaufen = True
+                break
+            else:
+                return
+        if self._signal is not None:
+            signal.pthread_kill(self._hauptthread, self._signal)
+            return
+        self._abmelden_melden()
+        self._daten_speichern_func()
+        os._exit(0)
+
+    def _abmelden(self):
+        self._abmelden_melden()
+        self._daten_speichern_func()
+        raise SystemExit(0)
+
+    @staticmethod
+    def _abmelden_melden():
+        print("\n\n\033[31mDu wurdest wegen Inaktivität ausgeloggt! \033[0m")
+
+
+def inaktivität_wrapper(timeout, daten_speichern_func):
+    """
+    Erstellt eine Wrapper-Funktion für input() mit
+    automatischem Logout bei Inaktivität.
+
+    Args:
+        timeout (int): Zeit in Sekunden bis zum automatischen Logout
+        daten_speichern_func (callable): Funktion zum Speichern der Daten,
+            kehrt erst zurück, wenn alles geschrieben ist
+
+    Returns:
+        function: Wrapper-Funktion die input() mit der Sitzung überwacht
+    """
+    return Sitzung(timeout, daten_speichern_func).eingabe
+
+
+class LazyModul:
+    """
+    Platzhalter für ein Modul, das erst beim ersten Attributzugriff
+    importiert wird. So bleiben teure Bibliotheken (z.B. matplotlib)
+    aus dem Programmstart heraus, solange sie nicht gebraucht werden.
+
+    Args:
+        name (str): Vollständiger Modulname
+        vorbereitung (callable, optional): Wird vor dem Import aufgerufen
+    """
+
+    def __init__(self, name, vorbereitung=None):
+        self._name = name
+        self._vorbereitung = vorbereitung
+        self._modul = None
+
+    def __getattr__(self, attribut):
+        if self._modul is None:
+            if self._vorbereitung is not None:
+                self._vorbereitung()
+            self._modul = importlib.import_module(self._name)
+        return getattr(self._modul, attribut)
+
+
+def agg_backend_setzen():
+    """Legt matplotlib auf das Agg-Backend fest (keine GUI-Suche)."""
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def atomar_schreiben(pfad, inhalt):
+    """
+    Schreibt Bytes über eine temporäre Datei und os.replace, damit ein
+    Absturz beim Schreiben die bestehende Datei nicht beschädigt.
+
+    Args:
+        pfad (str): Zieldatei
+        inhalt (bytes): Neuer Inhalt
+    """
+    verzeichnis = os.path.dirname(os.path.abspath(pfad))
+    fd, temp_pfad = tempfile.mkstemp(dir=verzeichnis, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(inhalt)
+            f.flush()
+            os.fsync(f.fileno())
+            bytes_zählen(os.fstat(f.fileno()).st_size)
+        os.replace(temp_pfad, pfad)
+    except BaseException:
+        os.remove(temp_pfad)
+        raise
 
 
 